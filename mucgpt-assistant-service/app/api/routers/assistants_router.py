@@ -34,6 +34,7 @@ from core.owner_enrichment import (
     get_missing_owner_cache_ids,
     refresh_owner_details,
 )
+from core.tiered_cache import TieredCache
 from database.assistant_repo import AssistantRepository
 from database.database_models import AssistantTool
 from database.session import get_db_session
@@ -72,8 +73,8 @@ async def _get_verified_compliance_result(
 
     try:
         await RedisCache.init_redis()
-        cached = await RedisCache.get_object(
-            _build_compliance_cache_key(expected_prompt_hash)
+        cached = await TieredCache.get(
+            _build_compliance_cache_key(expected_prompt_hash), namespace="compliance"
         )
     except Exception:
         logger.warning(
@@ -157,7 +158,7 @@ async def createAssistant(
     db: AsyncSession = Depends(get_db_session),
     user_info: AuthenticationResult = Depends(authenticate_user),
 ):  # Create a new assistant using the repository
-    logger.info(f"Creating assistant for user {user_info.user_id}")
+    logger.info("Creating assistant for user %s", user_info.user_id)
     try:
         owner_lookup_cache: dict[str, dict[str, object]] = {}
         assistant_repo = AssistantRepository(
@@ -277,10 +278,10 @@ async def createAssistant(
             latest_version=assistant_version_response,
         )
 
-        logger.info(f"Assistant created with ID: {new_assistant.id}")
+        logger.info("Assistant created with ID: %s", new_assistant.id)
         return response
     except Exception as e:
-        logger.error(f"Error creating assistant: {e}")
+        logger.error("Error creating assistant: %s", e)
         await db.rollback()
         raise
 
@@ -313,7 +314,7 @@ async def deleteAssistant(
     db: AsyncSession = Depends(get_db_session),
     user_info: AuthenticationResult = Depends(authenticate_user),
 ):
-    logger.info(f"Deleting assistant with ID: {id} by user {user_info.user_id}")
+    logger.info("Deleting assistant with ID: %s by user %s", id, user_info.user_id)
     assistant_repo = AssistantRepository(db)
     assistant = await assistant_repo.get(id)
 
@@ -329,7 +330,7 @@ async def deleteAssistant(
         raise DeleteFailedException(id)
 
     await db.commit()
-    logger.info(f"Assistant with ID {id} successfully deleted")
+    logger.info("Assistant with ID %s successfully deleted", id)
     return {"message": f"Assistant with ID {id} successfully deleted"}
 
 
@@ -362,7 +363,7 @@ async def updateAssistant(
     db: AsyncSession = Depends(get_db_session),
     user_info: AuthenticationResult = Depends(authenticate_user),
 ) -> AssistantResponse:
-    logger.info(f"Updating assistant with ID: {id} by user {user_info.user_id}")
+    logger.info("Updating assistant with ID: %s by user %s", id, user_info.user_id)
     owner_lookup_cache: dict[str, dict[str, object]] = {}
     assistant_repo = AssistantRepository(db)
     assistant = await assistant_repo.get(id)
@@ -544,7 +545,7 @@ async def updateAssistant(
         latest_version=assistant_version_response,
     )
 
-    logger.info(f"Assistant with ID {id} updated successfully")
+    logger.info("Assistant with ID %s updated successfully", id)
     return response
 
 
@@ -593,7 +594,7 @@ async def getAllAssistants(
     db: AsyncSession = Depends(get_db_session),
     user_info: AuthenticationResult = Depends(authenticate_user),
 ):
-    logger.info(f"Fetching all accessible assistants for user {user_info.user_id}")
+    logger.info("Fetching all accessible assistants for user %s", user_info.user_id)
     owner_lookup_cache: dict[str, dict[str, object]] = {}
     assistant_repo = AssistantRepository(db)
     assistants = (
@@ -663,7 +664,9 @@ async def getAllAssistants(
             response_list.append(response)
 
     logger.info(
-        f"Returning {len(response_list)} accessible assistants for user {user_info.user_id}"
+        "Returning %s accessible assistants for user %s",
+        len(response_list),
+        user_info.user_id,
     )
     return response_list
 
@@ -689,7 +692,7 @@ async def getAssistant(
     db: AsyncSession = Depends(get_db_session),
     user_info: AuthenticationResult = Depends(authenticate_user),
 ):
-    logger.info(f"Fetching assistant with ID: {id} for user {user_info.user_id}")
+    logger.info("Fetching assistant with ID: %s for user %s", id, user_info.user_id)
     owner_lookup_cache: dict[str, dict[str, object]] = {}
     assistant_repo = AssistantRepository(db)
     assistant = await assistant_repo.get(id)
@@ -767,7 +770,7 @@ async def getAssistant(
         latest_version=assistant_version_response,
     )
 
-    logger.info(f"Returning assistant with ID: {id}")
+    logger.info("Returning assistant with ID: %s", id)
     return response
 
 
@@ -797,7 +800,10 @@ async def get_assistant_version(
     user_info: AuthenticationResult = Depends(authenticate_user),
 ):
     logger.info(
-        f"Fetching version {version} of assistant {id} for user {user_info.user_id}"
+        "Fetching version %s of assistant %s for user %s",
+        version,
+        id,
+        user_info.user_id,
     )
     owner_lookup_cache: dict[str, dict[str, object]] = {}
     assistant_repo = AssistantRepository(db)
@@ -862,5 +868,5 @@ async def get_assistant_version(
         compliance_confirmation=assistant_version.compliance_confirmation,
     )
 
-    logger.info(f"Returning version {version} of assistant {id}")
+    logger.info("Returning version %s of assistant %s", version, id)
     return response
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 
 from core.logtools import getLogger
+from core.metrics import Metrics
 
 logger = getLogger("system_router")
 
@@ -19,3 +21,17 @@ router = APIRouter()
 def health_check() -> str:
     logger.info("Health check endpoint called")
     return "OK"
+
+
+@router.get(
+    "/metrics",
+    summary="Service metrics",
+    description="Process-local service metrics in the Prometheus text exposition format. Values are not aggregated across worker processes.",
+    response_class=PlainTextResponse,
+    responses={200: {"description": "Prometheus text exposition"}},
+    tags=["System"],
+)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        Metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
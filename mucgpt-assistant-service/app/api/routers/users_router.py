@@ -135,7 +135,7 @@ async def getUserAssistants(
     user_info: AuthenticationResult = Depends(authenticate_user),
 ):
     """Get all assistants where the specified user_id is an owner."""
-    logger.info(f"Fetching assistants for user {user_info.user_id}")
+    logger.info("Fetching assistants for user %s", user_info.user_id)
     # Get all assistants where this user_id is an owner
     assistant_repo = AssistantRepository(db)
     assistants = await assistant_repo.get_assistants_by_owner(
@@ -149,7 +149,7 @@ async def getUserAssistants(
     response_list = await _build_assistant_response_list(assistants, assistant_repo)
 
     logger.info(
-        f"Returning {len(response_list)} assistants for user {user_info.user_id}"
+        "Returning %s assistants for user %s", len(response_list), user_info.user_id
     )
     return response_list
 
@@ -178,7 +178,9 @@ async def subscribe_to_assistant(
 ):
     """Subscribe to an assistant if user has access permissions."""
     logger.info(
-        f"User {user_info.user_id} attempting to subscribe to assistant {assistant_id}"
+        "User %s attempting to subscribe to assistant %s",
+        user_info.user_id,
+        assistant_id,
     )
 
     assistant_repo = AssistantRepository(db)
@@ -198,7 +200,9 @@ async def subscribe_to_assistant(
     await db.commit()
 
     logger.info(
-        f"User {user_info.user_id} successfully subscribed to assistant {assistant_id} "
+        "User %s successfully subscribed to assistant %s ",
+        user_info.user_id,
+        assistant_id,
     )
     return StatusResponse(message="Successfully subscribed to assistant")
 
@@ -222,7 +226,9 @@ async def unsubscribe_from_assistant(
 ):
     """Unsubscribe from an assistant."""
     logger.info(
-        f"User {user_info.user_id} attempting to unsubscribe from assistant {assistant_id}"
+        "User %s attempting to unsubscribe from assistant %s",
+        user_info.user_id,
+        assistant_id,
     )
 
     assistant_repo = AssistantRepository(db)
@@ -236,7 +242,9 @@ async def unsubscribe_from_assistant(
     await db.commit()
 
     logger.info(
-        f"User {user_info.user_id} successfully unsubscribed from assistant {assistant_id}"
+        "User %s successfully unsubscribed from assistant %s",
+        user_info.user_id,
+        assistant_id,
     )
     return StatusResponse(message="Successfully unsubscribed from assistant")
 
@@ -275,7 +283,7 @@ async def get_user_subscriptions(
     user_info: AuthenticationResult = Depends(authenticate_user),
 ):
     """Get all assistants the user has subscribed to."""
-    logger.info(f"Fetching subscriptions for user {user_info.user_id}")
+    logger.info("Fetching subscriptions for user %s", user_info.user_id)
 
     assistant_repo = AssistantRepository(db)
     assistants = await assistant_repo.get_user_subscriptions(
@@ -313,7 +321,9 @@ async def get_user_subscriptions(
             response_list.append(response)
 
     logger.info(
-        f"Returning {len(response_list)} subscribed assistants for user {user_info.user_id}"
+        "Returning %s subscribed assistants for user %s",
+        len(response_list),
+        user_info.user_id,
     )
     return response_list
 
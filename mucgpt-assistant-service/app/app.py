@@ -12,6 +12,14 @@ from backend import backend  # noqa
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("-d", "--development", action="store_true")
+    parser.add_argument("--port", type=int, default=8084)
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", "1")),
+        help="Number of worker processes (default: $WEB_CONCURRENCY or 1).",
+    )
     log_config_path = os.getenv("LOG_CONFIG", "logconf.yaml")
     args = parser.parse_args()
 
@@ -19,4 +27,16 @@ if __name__ == "__main__":
     log_config = load_log_config(log_config_path)
 
     host = "localhost" if args.development else "0.0.0.0"
-    uvicorn.run(backend, host=host, port=8084, log_config=log_config)
+    if args.workers > 1:
+        # Settings were validated by importing the backend. Workers are spawned
+        # and import the app themselves, each one opens its own database and
+        # Redis connections.
+        uvicorn.run(
+            "app:backend",
+            host=host,
+            port=args.port,
+            workers=args.workers,
+            log_config=log_config,
+        )
+    else:
+        uvicorn.run(backend, host=host, port=args.port, log_config=log_config)
@@ -1,7 +1,6 @@
-import time
 from contextlib import asynccontextmanager
 
-from asgi_correlation_id import CorrelationIdMiddleware, correlation_id
+from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi import FastAPI, Request
 from fastapi.exception_handlers import http_exception_handler
 from fastapi.responses import JSONResponse
@@ -18,6 +17,8 @@ from config.settings import (
 )
 from core.auth import AuthError
 from core.logtools import getLogger
+from core.request_timing import RequestTimingMiddleware
+from core.tiered_cache import TieredCache
 
 logger = getLogger("mucgpt-assistant-service")
 settings = get_settings()
@@ -28,7 +29,9 @@ async def lifespan(app: FastAPI):
     # Log current settings
     logger.info("Starting MUCGPT Assistant Service")
     logger.info("Loaded Settings:\n%s", settings.model_dump_json(indent=2))
+    TieredCache.start_listener()
     yield
+    await TieredCache.stop_listener()
 
 
 # serves static files and the api
@@ -79,26 +82,13 @@ api_app.include_router(system_router)
 api_app.include_router(department_router)
 # Add correlation ID middleware for tracking requests
 api_app.add_middleware(CorrelationIdMiddleware)
+# Added last so that it wraps (and also times) the correlation id middleware
+api_app.add_middleware(RequestTimingMiddleware, logger=logger)
 
 # Mount API
 backend.mount("/api/", api_app)
 
 
-@api_app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    # add trace information
-    if "x-request-id" in response.headers:
-        correlation_id.set(response.headers["x-request-id"])
-    logger.info(
-        "Request %s took %.3f seconds", request.url.path, time.time() - start_time
-    )
-    # remove trace information
-    correlation_id.set(None)
-    return response
-
-
 @api_app.exception_handler(Exception)
 async def handle_general_exception(request: Request, exc: Exception):
     logger.exception(
@@ -3,7 +3,14 @@ from __future__ import annotations
 from functools import lru_cache
 from pathlib import Path
 
-from pydantic import BaseModel, Field, SecretStr
+from pydantic import (
+    BaseModel,
+    Field,
+    NonNegativeInt,
+    PositiveFloat,
+    PositiveInt,
+    SecretStr,
+)
 from pydantic_settings import (
     BaseSettings,
     PydanticBaseSettingsSource,
@@ -21,6 +28,10 @@ class SSOConfig(BaseModel):
 
     ROLE: str | None = None
     ADMIN_ROLE: str | None = None
+    # Parsed tokens are reused until their exp claim, at most TOKEN_CACHE_TTL_SECONDS;
+    # 0 entries disables the cache
+    TOKEN_CACHE_MAX_ENTRIES: NonNegativeInt = 1024
+    TOKEN_CACHE_TTL_SECONDS: PositiveFloat = 300.0
 
 
 class DBConfig(BaseModel):
@@ -41,6 +52,26 @@ class RedisConfig(BaseModel):
     PORT: int = 6379
     USERNAME: str | None = None
     PASSWORD: SecretStr | None = None
+    # Cached values of at least this size are zlib compressed
+    COMPRESSION_MIN_BYTES: PositiveInt = 1024
+    # In-process cache in front of Redis for hot keys; 0 entries disables it
+    LOCAL_CACHE_MAX_ENTRIES: NonNegativeInt = 256
+    LOCAL_CACHE_TTL_SECONDS: PositiveFloat = 30.0
+    # Connection pool and socket limits; callers wait at most POOL_TIMEOUT for a free connection
+    MAX_CONNECTIONS: PositiveInt = 50
+    POOL_TIMEOUT: PositiveFloat = 1.0
+    SOCKET_CONNECT_TIMEOUT: PositiveFloat = 1.0
+    SOCKET_TIMEOUT: PositiveFloat = 1.0
+    # Retries of failed commands with equal-jitter exponential backoff
+    RETRY_ATTEMPTS: NonNegativeInt = 2
+    RETRY_BACKOFF_BASE_SECONDS: PositiveFloat = 0.05
+    RETRY_BACKOFF_CAP_SECONDS: PositiveFloat = 0.5
+    # Consecutive connection failures that open the circuit breaker and how long it stays open
+    CIRCUIT_FAILURE_THRESHOLD: PositiveInt = 3
+    CIRCUIT_RESET_SECONDS: PositiveFloat = 10.0
+    # Resolve the primary via Sentinel ("host:port" entries) instead of HOST/PORT
+    SENTINELS: list[str] = Field(default_factory=list)
+    SENTINEL_SERVICE_NAME: str = "mymaster"
 
 
 class LDAPConfig(BaseModel):
@@ -1,5 +1,10 @@
 import base64
+import hashlib
 import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 
 from fastapi import Depends, Header, HTTPException
 
@@ -14,6 +19,58 @@ ACCESS_DENIED_MESSAGE = "Sie haben noch keinen Zugang zu MUCGPT freigeschaltet.
 ROLE_PREFIX = "ROLE_"
 
 
+class ClaimsCache:
+    """Bounded LRU of authentication results keyed by the token's SHA-256.
+
+    Entries expire with the token's ``exp`` claim, at the latest after
+    ``ttl`` seconds. Cached results are shared between requests and must be
+    treated as read-only.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[float, AuthenticationResult]] = (
+            OrderedDict()
+        )
+        # Sync dependencies run in the threadpool.
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> AuthenticationResult | None:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def put(self, token: str, result: AuthenticationResult, exp: object) -> None:
+        expires_at = time.time() + self.ttl
+        if isinstance(exp, int | float):
+            expires_at = min(expires_at, exp)
+        if not self.max_entries or expires_at <= time.time():
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 class AuthenticationHelper:
     """Authenticates by parsing JWT access tokens directly."""
 
@@ -21,16 +78,14 @@ class AuthenticationHelper:
         self,
         role: str | None,
         admin_role: str | None = None,
+        claims_cache: ClaimsCache | None = None,
     ):
         self.role = role
         self.admin_role = admin_role
-
-    def _configured_roles(self) -> set[str]:
-        return {
-            role.strip()
-            for role in (self.role, self.admin_role)
-            if role and role.strip()
-        }
+        self.claims_cache = claims_cache
+        self._configured_roles = frozenset(
+            role.strip() for role in (role, admin_role) if role and role.strip()
+        )
 
     def parse_jwt_payload(self, token: str) -> dict:
         """Parse JWT token and extract payload.
@@ -67,7 +122,7 @@ class AuthenticationHelper:
             return payload_dict
 
         except (ValueError, json.JSONDecodeError) as e:
-            logger.error(f"Failed to parse JWT token: {e}")
+            logger.error("Failed to parse JWT token: %s", e)
             raise AuthError("Invalid JWT token", status_code=401)
 
     def authenticate(self, accesstoken: str) -> AuthenticationResult:
@@ -84,13 +139,18 @@ class AuthenticationHelper:
             logger.warning("Authentication failed: Missing Authorization header")
             raise AuthError("Missing Authorization header", status_code=401)
 
+        if self.claims_cache is not None:
+            cached = self.claims_cache.get(accesstoken)
+            if cached is not None:
+                return cached
+
         token_payload = self.parse_jwt_payload(accesstoken)
-        logger.debug(f"token_payload: {token_payload}")
+        logger.debug("token_payload: %s", token_payload)
 
         roles = self.getRoles(token_payload)
-        logger.debug(f"User roles: {roles}")
+        logger.debug("User roles: %s", roles)
 
-        configured_roles = self._configured_roles()
+        configured_roles = self._configured_roles
         if configured_roles and not configured_roles.intersection(roles):
             logger.warning(
                 "Authentication failed: None of the configured access roles were found in user roles"
@@ -100,13 +160,16 @@ class AuthenticationHelper:
                 status_code=403,
             )
 
-        return AuthenticationResult(
+        result = AuthenticationResult(
             user_id=self.getLHMObjectID(token_payload),
             department=self.getDepartment(token_payload),
             name=self.getName(token_payload),
             roles=roles,
             is_admin=bool(self.admin_role) and self.admin_role in roles,
         )
+        if self.claims_cache is not None:
+            self.claims_cache.put(accesstoken, result, token_payload.get("exp"))
+        return result
 
     def getRoles(self, token_payload: dict) -> list[str]:
         logger.debug("Extracting roles from token payload")
@@ -155,27 +218,46 @@ class AuthenticationHelper:
         return str(token_payload.get("lhmObjectID", "") or token_payload.get("sub", ""))
 
 
+@lru_cache(maxsize=8)
+def get_auth_helper(
+    role: str | None,
+    admin_role: str | None,
+    cache_max_entries: int,
+    cache_ttl: float,
+) -> AuthenticationHelper:
+    """Return the shared helper (and claims cache) for an SSO configuration."""
+    return AuthenticationHelper(
+        role=role,
+        admin_role=admin_role,
+        claims_cache=ClaimsCache(cache_max_entries, cache_ttl)
+        if cache_max_entries
+        else None,
+    )
+
+
 # Authentication dependency for FastAPI
 def authenticate_user(
     authorization: str = Header(...),
     sso_settings: SSOSettings = Depends(get_sso_settings),
 ) -> AuthenticationResult:
-    """Dependency to authenticate users based on access token."""  # Load configuration
-    logger.debug("Loading configuration for authentication")
-    auth_helper = AuthenticationHelper(
-        role=sso_settings.ROLE,
-        admin_role=sso_settings.ADMIN_ROLE,
+    """Dependency to authenticate users based on access token."""
+    auth_helper = get_auth_helper(
+        sso_settings.ROLE,
+        sso_settings.ADMIN_ROLE,
+        sso_settings.TOKEN_CACHE_MAX_ENTRIES,
+        sso_settings.TOKEN_CACHE_TTL_SECONDS,
     )
 
     try:
-        logger.info("Authenticating user")
         user_info = auth_helper.authenticate(authorization)
-        logger.info(
-            f"User authenticated successfully: {user_info.name} from {user_info.department}"
+        logger.debug(
+            "User authenticated successfully: %s from %s",
+            user_info.name,
+            user_info.department,
         )
         return user_info
     except AuthError as e:
-        logger.error(f"Authentication failed: {e.error}")
+        logger.error("Authentication failed: %s", e.error)
         raise HTTPException(status_code=e.status_code, detail=e.error)
     except Exception as e:
         logger.error("Authentication failed", exc_info=e)
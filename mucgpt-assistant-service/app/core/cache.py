@@ -1,39 +1,168 @@
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
-import cloudpickle
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.retry import Retry
+from redis.asyncio.sentinel import Sentinel
+from redis.backoff import EqualJitterBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
-from config.settings import get_redis_settings
+from config.settings import RedisConfig, get_redis_settings
+from core.cache_codec import CacheDecodeError, decode, encode
+from core.logtools import getLogger
+
+logger = getLogger("mucgpt-assistant-service")
+
+
+class CacheUnavailableError(RuntimeError):
+    """Raised without contacting Redis while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops calling Redis after repeated connection failures.
+
+    Once ``failure_threshold`` consecutive calls failed the breaker opens and
+    calls fail immediately. After ``reset_seconds`` a single probe is let
+    through; its success closes the breaker, its failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return (
+            self._opened_at is not None
+            and time.monotonic() - self._opened_at < self.reset_seconds
+        )
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self.is_open:
+            return False
+        # Half-open: restart the timer so that only this call probes Redis.
+        self._opened_at = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is None:
+            if self._failures < self.failure_threshold:
+                return
+            logger.warning(
+                "Redis failed %d times in a row; skipping it for %.0f s",
+                self._failures,
+                self.reset_seconds,
+            )
+        self._opened_at = time.monotonic()
+
+
+def _parse_sentinel(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return (host, int(port)) if host else (address, 26379)
+
+
+def _create_client(settings: RedisConfig) -> Redis:
+    password = settings.PASSWORD
+    connection_kwargs: dict[str, Any] = {
+        "username": settings.USERNAME,
+        "password": password.get_secret_value() if password else None,
+        "socket_connect_timeout": settings.SOCKET_CONNECT_TIMEOUT,
+        "socket_timeout": settings.SOCKET_TIMEOUT,
+        "retry": Retry(
+            EqualJitterBackoff(
+                cap=settings.RETRY_BACKOFF_CAP_SECONDS,
+                base=settings.RETRY_BACKOFF_BASE_SECONDS,
+            ),
+            settings.RETRY_ATTEMPTS,
+        ),
+    }
+    if settings.SENTINELS:
+        sentinel = Sentinel(
+            [_parse_sentinel(address) for address in settings.SENTINELS],
+            sentinel_kwargs={
+                "socket_connect_timeout": settings.SOCKET_CONNECT_TIMEOUT,
+                "socket_timeout": settings.SOCKET_TIMEOUT,
+            },
+            **connection_kwargs,
+        )
+        return sentinel.master_for(
+            settings.SENTINEL_SERVICE_NAME,
+            max_connections=settings.MAX_CONNECTIONS,
+        )
+    pool = BlockingConnectionPool(
+        host=settings.HOST,
+        port=settings.PORT,
+        max_connections=settings.MAX_CONNECTIONS,
+        timeout=settings.POOL_TIMEOUT,
+        **connection_kwargs,
+    )
+    return Redis.from_pool(pool)
 
 
 class RedisCache:
     _redis_settings = get_redis_settings()
     _redis_client: Redis | None = None
+    _breaker = CircuitBreaker(
+        _redis_settings.CIRCUIT_FAILURE_THRESHOLD,
+        _redis_settings.CIRCUIT_RESET_SECONDS,
+    )
+    # Errors that mean Redis is unreachable; callers may fall back to an uncached path.
+    UNAVAILABLE_ERRORS = (
+        CacheUnavailableError,
+        RedisConnectionError,
+        RedisTimeoutError,
+    )
 
     @staticmethod
     async def init_redis():
         if RedisCache._redis_client is None:
-            password = RedisCache._redis_settings.PASSWORD
-            client = Redis(
-                host=RedisCache._redis_settings.HOST,
-                port=RedisCache._redis_settings.PORT,
-                username=RedisCache._redis_settings.USERNAME,
-                password=password.get_secret_value() if password else None,
-            )
+            if not RedisCache._breaker.allow():
+                raise CacheUnavailableError("Redis circuit breaker is open")
+            client = _create_client(RedisCache._redis_settings)
             try:
                 await client.ping()
             except Exception as e:
-                await client.close()
+                RedisCache._breaker.record_failure()
+                await client.aclose()
                 raise e
             else:
+                RedisCache._breaker.record_success()
                 RedisCache._redis_client = client
 
     @staticmethod
     async def get_redis() -> Redis:
         if RedisCache._redis_client is None:
             raise RuntimeError("Redis client not initialized")
+        if RedisCache._breaker.is_open:
+            raise CacheUnavailableError("Redis circuit breaker is open")
         return RedisCache._redis_client
 
+    @staticmethod
+    @asynccontextmanager
+    async def _connection() -> AsyncIterator[Redis]:
+        """Yield the client and feed connection failures into the circuit breaker."""
+        redis: Redis = await RedisCache.get_redis()
+        if not RedisCache._breaker.allow():
+            raise CacheUnavailableError("Redis circuit breaker is open")
+        try:
+            yield redis
+        except (RedisConnectionError, RedisTimeoutError):
+            RedisCache._breaker.record_failure()
+            raise
+        RedisCache._breaker.record_success()
+
     @staticmethod
     async def set_object(key: str, obj: Any, ttl: int | None = None) -> None:
         """
@@ -41,21 +170,27 @@ class RedisCache:
         :param key: Key to store the object under.
         :param obj: The object to store.
         :param ttl: The time after the object is removed from the cache in s (default: never).
+        :raises CacheUnavailableError: Without contacting Redis while it is considered down.
         """
-        dump = cloudpickle.dumps(obj)
-        redis: Redis = await RedisCache.get_redis()
-        await redis.set(name=key, value=dump, ex=ttl)
+        dump = encode(obj, RedisCache._redis_settings.COMPRESSION_MIN_BYTES)
+        async with RedisCache._connection() as redis:
+            await redis.set(name=key, value=dump, ex=ttl)
 
     @staticmethod
     async def get_object(key: str) -> Any | None:
         """
         Get an object form the cache.
         :param key: The key the object is stored under.
-        :return: The decoded object or None if key doesn't exist.
+        :return: The decoded object or None if key doesn't exist or was written
+            in an incompatible format.
+        :raises CacheUnavailableError: Without contacting Redis while it is considered down.
         """
-        redis: Redis = await RedisCache.get_redis()
-        dump: bytes = await redis.get(name=key)
+        async with RedisCache._connection() as redis:
+            dump: bytes = await redis.get(name=key)
         if dump is None:
             return None
-        obj = cloudpickle.loads(dump)
-        return obj
+        try:
+            return decode(dump)
+        except CacheDecodeError:
+            logger.debug("Ignoring incompatible cache entry %s", key)
+            return None
@@ -0,0 +1,99 @@
+"""Binary codec for values stored by ``RedisCache``.
+
+Layout: ``MAGIC | version | flags | body``. The body is a 4-byte big-endian
+length, a UTF-8 JSON document and the raw ``bytes`` values the document
+refers to, each prefixed with its length, so binary data is stored without
+base64 overhead. Bodies of at least ``compression_min_bytes`` are zlib
+compressed when that makes them smaller.
+
+Entries that were written by another codec version (or by the previous
+cloudpickle serialization) fail to decode with ``CacheDecodeError`` and are
+treated as cache misses.
+"""
+
+import json
+import struct
+import zlib
+from enum import Enum
+from typing import Any
+
+MAGIC = b"MCG"
+CODEC_VERSION = 1
+FLAG_ZLIB = 0x01
+
+_HEADER = struct.Struct(">3sBB")
+_LENGTH = struct.Struct(">I")
+_BYTES_REF = "__mucgpt_bytes__"
+# Fast levels already shrink JSON ~10x; higher levels cost far more CPU.
+_COMPRESSION_LEVEL = 1
+
+
+class CacheDecodeError(ValueError):
+    """Raised when a cached value was not written by this codec version."""
+
+
+def encode(obj: Any, compression_min_bytes: int) -> bytes:
+    """Serialize ``obj`` (JSON types, ``bytes`` and enums) for storage."""
+    blobs: list[bytes] = []
+
+    def default(value: Any) -> Any:
+        if isinstance(value, bytes | bytearray | memoryview):
+            blobs.append(bytes(value))
+            return {_BYTES_REF: len(blobs) - 1}
+        if isinstance(value, Enum):
+            return value.value
+        if isinstance(value, set | frozenset):
+            return list(value)
+        raise TypeError(f"Type {type(value).__name__} is not cacheable")
+
+    document = json.dumps(
+        obj, default=default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    parts = [_LENGTH.pack(len(document)), document]
+    for blob in blobs:
+        parts.append(_LENGTH.pack(len(blob)))
+        parts.append(blob)
+    body = b"".join(parts)
+
+    flags = 0
+    if len(body) >= compression_min_bytes:
+        compressed = zlib.compress(body, level=_COMPRESSION_LEVEL)
+        # Already compressed data (e.g. parse cache entries) does not shrink.
+        if len(compressed) < len(body):
+            body = compressed
+            flags |= FLAG_ZLIB
+    return _HEADER.pack(MAGIC, CODEC_VERSION, flags) + body
+
+
+def decode(data: bytes) -> Any:
+    """Inverse of ``encode``; raises ``CacheDecodeError`` for foreign data."""
+    if len(data) < _HEADER.size:
+        raise CacheDecodeError("Cached value is too short")
+    magic, version, flags = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != CODEC_VERSION:
+        raise CacheDecodeError("Cached value has an unknown format or version")
+    body = memoryview(data)[_HEADER.size :]
+    try:
+        if flags & FLAG_ZLIB:
+            body = memoryview(zlib.decompress(body))
+        (document_length,) = _LENGTH.unpack_from(body)
+        offset = _LENGTH.size + document_length
+        document = bytes(body[_LENGTH.size : offset])
+        blobs: list[bytes] = []
+        while offset < len(body):
+            (blob_length,) = _LENGTH.unpack_from(body, offset)
+            offset += _LENGTH.size
+            blobs.append(bytes(body[offset : offset + blob_length]))
+            offset += blob_length
+
+        if not blobs:
+            return json.loads(document)
+
+        def object_hook(value: dict[str, Any]) -> Any:
+            if len(value) == 1 and _BYTES_REF in value:
+                return blobs[value[_BYTES_REF]]
+            return value
+
+        return json.loads(document, object_hook=object_hook)
+    except (zlib.error, struct.error, ValueError, IndexError) as exc:
+        raise CacheDecodeError("Cached value is corrupt") from exc
@@ -16,6 +16,7 @@ from core.organization import (
     LDAPOrganizationLoaderError,
     OrganizationNode,
 )
+from core.tiered_cache import TieredCache
 
 logger = getLogger(__name__)
 
@@ -161,7 +162,7 @@ def _load_directory_from_ldap() -> DirectoryTree:
 async def _get_cached_tree(key: str) -> _CacheEnvelope | None:
     try:
         await RedisCache.init_redis()
-        cached = await RedisCache.get_object(key)
+        cached = await TieredCache.get(key, namespace="directory_tree")
         if cached is not None:
             return cached
     except Exception:
@@ -186,7 +187,7 @@ async def _set_cached_tree(key: str, data: DirectoryTree) -> None:
             int(freshness_ttl_seconds * 1.5),
             min_stale_fallback_ttl,
         )
-        await RedisCache.set_object(key, payload, ttl=redis_ttl)
+        await TieredCache.set(key, payload, ttl=redis_ttl)
     except Exception:
         logger.warning("Failed to write directory tree to Redis cache", exc_info=True)
 
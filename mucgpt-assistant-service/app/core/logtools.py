@@ -1,6 +1,9 @@
+import copy
+import itertools
 import json
 import logging
 import logging.config
+import logging.handlers
 import threading
 import traceback
 from datetime import datetime
@@ -105,3 +108,65 @@ class JsonFormatter(logging.Formatter):
                 log_data[k] = v
 
         return json.dumps(log_data, default=str)
+
+
+class BackgroundQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to a listener thread that formats and writes them.
+
+    Configured through ``dictConfig`` with the target ``handlers``; the
+    listener is started on the first record and drained on close. Filters
+    attached to this handler (e.g. the correlation id) still run in the
+    calling thread, so context variables are captured correctly.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now, while they still hold the values of the
+        # call; JSON serialization, the traceback and I/O are left to the
+        # listener thread.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    _started = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not self._started and self.listener is not None:
+            with self.lock:
+                if not self._started:
+                    self.listener.start()
+                    self._started = True
+        super().emit(record)
+
+    def close(self) -> None:
+        with self.lock:
+            if self._started:
+                self.listener.stop()
+                self._started = False
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps every ``every``-th record per logger and message template.
+
+    Records above ``max_level`` always pass, so warnings and errors are
+    never dropped. Attach it to hot-path loggers in the log config.
+    """
+
+    def __init__(self, every: int | str = 1, max_level: int | str = logging.INFO):
+        super().__init__()
+        self.every = max(int(every), 1)
+        if isinstance(max_level, str):
+            max_level = logging.getLevelNamesMapping()[max_level.upper()]
+        self.max_level = max_level
+        self._counters: dict[tuple[str, object], itertools.count] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.every == 1 or record.levelno > self.max_level:
+            return True
+        key = (record.name, record.msg)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters.setdefault(key, itertools.count())
+        return next(counter) % self.every == 0
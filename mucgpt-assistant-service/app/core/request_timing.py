@@ -0,0 +1,77 @@
+"""Pure ASGI middleware recording per-route HTTP latencies.
+
+Unlike ``@app.middleware("http")`` it does not wrap the response in a task
+and sees every message sent to the server, so streamed (SSE) responses are
+timed until their last body chunk rather than until headers are ready.
+"""
+
+import logging
+import time
+
+from asgi_correlation_id import correlation_id
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import Metrics
+
+RESPONSE_START_METRIC = "mucgpt_http_response_start_seconds"
+FIRST_BYTE_METRIC = "mucgpt_http_first_byte_seconds"
+DURATION_METRIC = "mucgpt_http_request_duration_seconds"
+_REQUEST_ID_HEADER = b"x-request-id"
+
+
+class RequestTimingMiddleware:
+    """Records time to response start, time to first body byte and total
+    duration per route in ``Metrics`` and logs one line per request."""
+
+    def __init__(self, app: ASGIApp, logger: logging.Logger):
+        self.app = app
+        self.logger = logger
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        response_start: float | None = None
+        first_byte: float | None = None
+        status = 500
+        request_id: str | None = None
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal response_start, first_byte, status, request_id
+            if message["type"] == "http.response.start":
+                response_start = time.perf_counter() - start
+                status = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name.lower() == _REQUEST_ID_HEADER:
+                        request_id = value.decode("latin-1")
+            elif first_byte is None and message.get("body"):
+                first_byte = time.perf_counter() - start
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration = time.perf_counter() - start
+            # Templates keep the label set bounded; unmatched paths share one series.
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            labels = {"method": scope["method"], "route": route}
+            if response_start is not None:
+                Metrics.observe(RESPONSE_START_METRIC, response_start, **labels)
+            if first_byte is not None:
+                Metrics.observe(FIRST_BYTE_METRIC, first_byte, **labels)
+            Metrics.observe(DURATION_METRIC, duration, status=str(status), **labels)
+
+            if self.logger.isEnabledFor(logging.INFO):
+                # The correlation id middleware runs inside this one and has
+                # already reset its context, so restore it for the log line.
+                token = correlation_id.set(request_id)
+                self.logger.info(
+                    "Request %s took %.3f seconds (response start %.3f s, first byte %.3f s)",
+                    scope["path"],
+                    duration,
+                    duration if response_start is None else response_start,
+                    duration if first_byte is None else first_byte,
+                )
+                correlation_id.reset(token)
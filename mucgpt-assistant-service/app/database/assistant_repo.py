@@ -43,7 +43,7 @@ class AssistantRepository(Repository[Assistant]):
         Returns:
             A list of tool associations with id and config
         """
-        logger.debug(f"Getting tools from version: {getattr(version, 'id', None)}")
+        logger.debug("Getting tools from version: %s", getattr(version, "id", None))
         if not version:
             return []
         try:
@@ -62,7 +62,7 @@ class AssistantRepository(Repository[Assistant]):
         self, assistant_id: str, version: int
     ) -> AssistantVersion | None:
         logger.info(
-            f"Fetching assistant version {version} for assistant {assistant_id}"
+            "Fetching assistant version %s for assistant %s", version, assistant_id
         )
         """Gets a specific version of an assistant."""
         result = await self.session.execute(
@@ -87,7 +87,7 @@ class AssistantRepository(Repository[Assistant]):
         compliance_confirmation: bool = False,
     ) -> AssistantVersion:
         """Creates a new version for an assistant with explicit parameters."""
-        logger.info(f"Creating new version for assistant {assistant.id}")
+        logger.info("Creating new version for assistant %s", assistant.id)
         try:
             # Query for the latest version directly to avoid lazy loading
             result = await self.session.execute(
@@ -119,11 +119,11 @@ class AssistantRepository(Repository[Assistant]):
             await self.session.flush()
             await self.session.refresh(new_version)
             logger.info(
-                f"Created version {new_version.version} for assistant {assistant.id}"
+                "Created version %s for assistant %s", new_version.version, assistant.id
             )
             return new_version
         except Exception as e:
-            logger.error(f"Error creating assistant version for {assistant.id}: {e}")
+            logger.error("Error creating assistant version for %s: %s", assistant.id, e)
             await self.session.rollback()
             raise
 
@@ -138,7 +138,7 @@ class AssistantRepository(Repository[Assistant]):
         exclude_owned_by_user_id: str | None = None,
         exclude_subscribed_by_user_id: str | None = None,
     ) -> list[Assistant]:
-        logger.info(f"Fetching all assistants for department: {department}")
+        logger.info("Fetching all assistants for department: %s", department)
         """Get all assistants that are allowed for a specific department.
 
         For example an assistant has the path:
@@ -244,7 +244,9 @@ class AssistantRepository(Repository[Assistant]):
         )
 
         logger.info(
-            f"Returning {len(matching_assistants)} assistants for department: {department}"
+            "Returning %s assistants for department: %s",
+            len(matching_assistants),
+            department,
         )
         return matching_assistants
 
@@ -257,7 +259,7 @@ class AssistantRepository(Repository[Assistant]):
         offset: int = 0,
         limit: int | None = None,
     ) -> list[Assistant]:
-        logger.info(f"Fetching assistants for owner: {user_id}")
+        logger.info("Fetching assistants for owner: %s", user_id)
         """Get all assistants where the given user_id is an owner."""
         latest_version_subquery = (
             select(
@@ -302,11 +304,11 @@ class AssistantRepository(Repository[Assistant]):
 
         result = await self.session.execute(stmt)
         assistants = list(result.scalars().all())
-        logger.info(f"Returning {len(assistants)} assistants for owner: {user_id}")
+        logger.info("Returning %s assistants for owner: %s", len(assistants), user_id)
         return list(assistants)
 
     async def is_owner(self, assistant_id: str, user_id: str) -> bool:
-        logger.debug(f"Checking if {user_id} is owner of assistant {assistant_id}")
+        logger.debug("Checking if %s is owner of assistant %s", user_id, assistant_id)
         """Check if the given user_id is an owner of the specified assistant."""
         stmt = (
             select(assistant_owners)
@@ -324,7 +326,7 @@ class AssistantRepository(Repository[Assistant]):
         is_visible: bool = True,
     ) -> Assistant:
         """Create a new assistant with explicit parameters."""
-        logger.info(f"Creating assistant with owners: {owner_ids}")
+        logger.info("Creating assistant with owners: %s", owner_ids)
         try:
             # Generate a UUID version 4 (random) for the assistant
             assistant_id = str(uuid.uuid4())  # Using version 4 (random) UUID
@@ -367,10 +369,10 @@ class AssistantRepository(Repository[Assistant]):
 
             await self.session.flush()
             await self.session.refresh(assistant)
-            logger.info(f"Created assistant with ID: {assistant.id}")
+            logger.info("Created assistant with ID: %s", assistant.id)
             return assistant
         except Exception as e:
-            logger.error(f"Error creating assistant: {e}")
+            logger.error("Error creating assistant: %s", e)
             await self.session.rollback()
             raise
 
@@ -381,7 +383,7 @@ class AssistantRepository(Repository[Assistant]):
         owner_ids: list[str] | None = None,
         is_visible: bool = None,
     ) -> Assistant | None:
-        logger.info(f"Updating assistant {assistant_id}")
+        logger.info("Updating assistant %s", assistant_id)
         """Update an assistant with explicit parameters."""
         try:
             assistant = await self.get(assistant_id)
@@ -427,16 +429,16 @@ class AssistantRepository(Repository[Assistant]):
                 assistant.updated_at = datetime.now()
                 await self.session.flush()
                 await self.session.refresh(assistant)
-                logger.info(f"Updated assistant {assistant_id}")
+                logger.info("Updated assistant %s", assistant_id)
                 return assistant
             return None
         except Exception as e:
-            logger.error(f"Error updating assistant {assistant_id}: {e}")
+            logger.error("Error updating assistant %s: %s", assistant_id, e)
             await self.session.rollback()
             raise
 
     async def get_with_owners(self, assistant_id: str) -> Assistant | None:
-        logger.debug(f"Fetching assistant with owners for assistant {assistant_id}")
+        logger.debug("Fetching assistant with owners for assistant %s", assistant_id)
         """Get assistant with eagerly loaded owners."""
         result = await self.session.execute(
             select(Assistant)
@@ -446,7 +448,7 @@ class AssistantRepository(Repository[Assistant]):
         return result.scalars().first()
 
     async def get_owners_count(self, assistant_id: str) -> int:
-        logger.debug(f"Getting owners count for assistant {assistant_id}")
+        logger.debug("Getting owners count for assistant %s", assistant_id)
         """Get the count of owners for an assistant."""
         result = await self.session.execute(
             select(func.count(assistant_owners.c.user_id)).where(
@@ -456,7 +458,7 @@ class AssistantRepository(Repository[Assistant]):
         return result.scalar() or 0
 
     async def get_latest_version(self, assistant_id: str) -> AssistantVersion | None:
-        logger.info(f"Fetching latest version for assistant {assistant_id}")
+        logger.info("Fetching latest version for assistant %s", assistant_id)
         """Get the latest version for an assistant safely without lazy loading."""
         try:
             result = await self.session.execute(
@@ -469,7 +471,7 @@ class AssistantRepository(Repository[Assistant]):
             return result.scalars().first()
         except Exception as e:
             logger.error(
-                f"Error fetching latest version for assistant {assistant_id}: {e}"
+                "Error fetching latest version for assistant %s: %s", assistant_id, e
             )
             await self.session.rollback()
             raise
@@ -477,7 +479,7 @@ class AssistantRepository(Repository[Assistant]):
     async def is_user_subscribed(self, assistant_id: str, user_id: str) -> bool:
         """Check if a user is subscribed to an assistant."""
         logger.debug(
-            f"Checking if user {user_id} is subscribed to assistant {assistant_id}"
+            "Checking if user %s is subscribed to assistant %s", user_id, assistant_id
         )
 
         result = await self.session.execute(
@@ -494,7 +496,7 @@ class AssistantRepository(Repository[Assistant]):
     ) -> Subscription:
         """Create a subscription for a user to an assistant."""
         logger.info(
-            f"Creating subscription for user {user_id} to assistant {assistant_id}"
+            "Creating subscription for user %s to assistant %s", user_id, assistant_id
         )
 
         try:
@@ -514,18 +516,20 @@ class AssistantRepository(Repository[Assistant]):
             )
 
             logger.info(
-                f"Created subscription for user {user_id} to assistant {assistant_id}"
+                "Created subscription for user %s to assistant %s",
+                user_id,
+                assistant_id,
             )
             return subscription
         except Exception as e:
-            logger.error(f"Error creating subscription: {e}")
+            logger.error("Error creating subscription: %s", e)
             await self.session.rollback()
             raise
 
     async def remove_subscription(self, assistant_id: str, user_id: str) -> bool:
         """Remove a user's subscription to an assistant."""
         logger.info(
-            f"Removing subscription for user {user_id} from assistant {assistant_id}"
+            "Removing subscription for user %s from assistant %s", user_id, assistant_id
         )
 
         try:
@@ -539,7 +543,9 @@ class AssistantRepository(Repository[Assistant]):
 
             if not subscription:
                 logger.info(
-                    f"No subscription found for user {user_id} to assistant {assistant_id}"
+                    "No subscription found for user %s to assistant %s",
+                    user_id,
+                    assistant_id,
                 )
                 return False
 
@@ -565,11 +571,14 @@ class AssistantRepository(Repository[Assistant]):
                 )
 
             logger.info(
-                f"Removed {rows_deleted} subscription(s) for user {user_id} from assistant {assistant_id}"
+                "Removed %s subscription(s) for user %s from assistant %s",
+                rows_deleted,
+                user_id,
+                assistant_id,
             )
             return rows_deleted > 0
         except Exception as e:
-            logger.error(f"Error removing subscription: {e}")
+            logger.error("Error removing subscription: %s", e)
             await self.session.rollback()
             raise
 
@@ -583,7 +592,7 @@ class AssistantRepository(Repository[Assistant]):
         limit: int | None = None,
     ) -> list[Assistant]:
         """Get all assistants a user has subscribed to."""
-        logger.info(f"Fetching subscriptions for user {user_id}")
+        logger.info("Fetching subscriptions for user %s", user_id)
 
         try:
             latest_version_subquery = (
@@ -631,10 +640,10 @@ class AssistantRepository(Repository[Assistant]):
             result = await self.session.execute(stmt)
 
             assistants = list(result.scalars().all())
-            logger.info(f"Found {len(assistants)} subscriptions for user {user_id}")
+            logger.info("Found %s subscriptions for user %s", len(assistants), user_id)
             return assistants
         except Exception as e:
-            logger.error(f"Error fetching user subscriptions: {e}")
+            logger.error("Error fetching user subscriptions: %s", e)
             await self.session.rollback()
             raise
 
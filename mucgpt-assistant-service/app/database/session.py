@@ -20,23 +20,23 @@ def create_database_url(settings: Settings) -> URL:
     """Create database URL from settings using direct parameters (safer for special characters)."""
     db = settings.DB
     logger.info("Creating database URL with settings")
-    logger.debug(f"DB_HOST: {db.HOST}")
-    logger.debug(f"DB_PORT: {db.PORT}")
-    logger.debug(f"DB_NAME: {db.NAME}")
-    logger.debug(f"DB_USER: {db.USER}")
-    logger.debug(f"DB_PASSWORD: {'***MASKED***' if db.PASSWORD else 'NOT SET'}")
+    logger.debug("DB_HOST: %s", db.HOST)
+    logger.debug("DB_PORT: %s", db.PORT)
+    logger.debug("DB_NAME: %s", db.NAME)
+    logger.debug("DB_USER: %s", db.USER)
+    logger.debug("DB_PASSWORD: %s", "***MASKED***" if db.PASSWORD else "NOT SET")
 
     # Log password length for debugging (without revealing content)
     password_str = db.PASSWORD.get_secret_value() if db.PASSWORD else None
     if password_str:
-        logger.debug(f"Password length: {len(password_str)} characters")
+        logger.debug("Password length: %s characters", len(password_str))
 
         # Check for problematic characters that can cause URL parsing issues
         problematic_chars = ["'", "#", "@", "/", "\\", "?", "&", "%", ":", ";"]
         found_chars = [char for char in problematic_chars if char in password_str]
         if found_chars:
             logger.warning(
-                f"Password contains URL-problematic characters: {found_chars}"
+                "Password contains URL-problematic characters: %s", found_chars
             )
             logger.warning(
                 "Using direct parameter passing to avoid URL encoding issues"
@@ -59,7 +59,7 @@ def create_database_url(settings: Settings) -> URL:
     url_without_password = url.set(
         password="***MASKED***" if password_str else "NOT_SET"
     )
-    logger.info(f"Database URL created: {url_without_password}")
+    logger.info("Database URL created: %s", url_without_password)
 
     return url
 
@@ -70,7 +70,10 @@ def get_engine_and_factory(database_url: str):
     """Create and cache the SQLAlchemy engine and session factory."""
     logger.info("Creating SQLAlchemy engine and session factory")
     logger.debug(
-        f"Database URL (masked): {database_url.replace(database_url.split('://')[1].split('@')[0], '***MASKED***')}"
+        "Database URL (masked): %s",
+        database_url.replace(
+            database_url.split("://")[1].split("@")[0], "***MASKED***"
+        ),
     )
 
     try:
@@ -87,7 +90,7 @@ def get_engine_and_factory(database_url: str):
         logger.info("Successfully created engine and session factory")
         return engine, factory
     except Exception as e:
-        logger.error(f"Failed to create engine and session factory: {e}")
+        logger.error("Failed to create engine and session factory: %s", e)
         raise
 
 
@@ -108,9 +111,9 @@ def get_engine_and_factory_direct(settings: Settings):
 
     logger.info("Creating SQLAlchemy engine with direct connection parameters")
     logger.debug(
-        f"Connecting to: {settings.DB.HOST}:{settings.DB.PORT}/{settings.DB.NAME}"
+        "Connecting to: %s:%s/%s", settings.DB.HOST, settings.DB.PORT, settings.DB.NAME
     )
-    logger.debug(f"User: {settings.DB.USER}")
+    logger.debug("User: %s", settings.DB.USER)
 
     try:
         # Create engine with connection arguments instead of URL string
@@ -127,7 +130,7 @@ def get_engine_and_factory_direct(settings: Settings):
         }
         if settings.DB.SCHEMA:
             connect_args["server_settings"] = {"search_path": settings.DB.SCHEMA}
-            logger.info(f"Using PostgreSQL schema (search_path): {settings.DB.SCHEMA}")
+            logger.info("Using PostgreSQL schema (search_path): %s", settings.DB.SCHEMA)
 
         engine = create_async_engine(
             "postgresql+asyncpg://",  # Just the driver, parameters passed separately
@@ -150,7 +153,7 @@ def get_engine_and_factory_direct(settings: Settings):
         return engine, factory
     except Exception as e:
         logger.error(
-            f"Failed to create engine and session factory with direct parameters: {e}"
+            "Failed to create engine and session factory with direct parameters: %s", e
         )
         raise
 
@@ -172,13 +175,13 @@ async def get_db_session(
                 yield session
                 logger.debug("Database session yielded successfully")
             except exc.SQLAlchemyError as e:
-                logger.error(f"SQLAlchemy error in session: {type(e).__name__}: {e}")
+                logger.error("SQLAlchemy error in session: %s: %s", type(e).__name__, e)
                 await session.rollback()
                 logger.error("Session rolled back due to SQLAlchemy error")
                 raise
             except Exception as e:
                 logger.error(
-                    f"Unexpected error in database session: {type(e).__name__}: {e}"
+                    "Unexpected error in database session: %s: %s", type(e).__name__, e
                 )
                 await session.rollback()
                 logger.error("Session rolled back due to unexpected error")
@@ -190,7 +193,7 @@ async def get_db_session(
 
     except exc.SQLAlchemyError as e:
         logger.error(
-            f"SQLAlchemy error during session creation: {type(e).__name__}: {e}"
+            "SQLAlchemy error during session creation: %s: %s", type(e).__name__, e
         )
 
         error_msg = str(e).lower()
@@ -236,7 +239,7 @@ async def get_db_session(
         raise
     except Exception as e:
         logger.error(
-            f"Unexpected error during session creation: {type(e).__name__}: {e}"
+            "Unexpected error during session creation: %s: %s", type(e).__name__, e
         )
         raise
 
@@ -266,17 +269,21 @@ async def validate_database_connection(settings: Settings) -> bool:
 
     except exc.SQLAlchemyError as e:
         logger.error(
-            f"Database connection test failed with SQLAlchemy error: {type(e).__name__}: {e}"
+            "Database connection test failed with SQLAlchemy error: %s: %s",
+            type(e).__name__,
+            e,
         )
         if "password authentication failed" in str(e):
             logger.error("Authentication failed. Check these settings:")
-            logger.error(f"- Host: {settings.DB.HOST}:{settings.DB.PORT}")
-            logger.error(f"- Database: {settings.DB.NAME}")
-            logger.error(f"- User: {settings.DB.USER}")
+            logger.error("- Host: %s:%s", settings.DB.HOST, settings.DB.PORT)
+            logger.error("- Database: %s", settings.DB.NAME)
+            logger.error("- User: %s", settings.DB.USER)
             logger.error("- Password: Check if correct and not expired")
         return False
     except Exception as e:
         logger.error(
-            f"Database connection test failed with unexpected error: {type(e).__name__}: {e}"
+            "Database connection test failed with unexpected error: %s: %s",
+            type(e).__name__,
+            e,
         )
         return False
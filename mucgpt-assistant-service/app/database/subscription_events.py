@@ -13,7 +13,9 @@ logger = getLogger("assistant_repo")
 
 def _subscription_after_insert(mapper, connection, target):
     """Increment subscription count when a subscription is created."""
-    logger.debug(f"Incrementing subscription count for assistant {target.assistant_id}")
+    logger.debug(
+        "Incrementing subscription count for assistant %s", target.assistant_id
+    )
     connection.execute(
         text(
             "UPDATE assistants SET subscriptions_count = subscriptions_count + 1 WHERE id = :assistant_id"
@@ -32,7 +34,7 @@ def _subscription_after_update(mapper, connection, target):
     new_id = hist.added[0] if hist.added else None
 
     if old_id and old_id != new_id:
-        logger.debug(f"Decrementing subscription count for old assistant {old_id}")
+        logger.debug("Decrementing subscription count for old assistant %s", old_id)
         connection.execute(
             text(
                 "UPDATE assistants SET subscriptions_count = subscriptions_count - 1 WHERE id = :assistant_id"
@@ -41,7 +43,7 @@ def _subscription_after_update(mapper, connection, target):
         )
 
     if new_id and old_id != new_id:
-        logger.debug(f"Incrementing subscription count for new assistant {new_id}")
+        logger.debug("Incrementing subscription count for new assistant %s", new_id)
         connection.execute(
             text(
                 "UPDATE assistants SET subscriptions_count = subscriptions_count + 1 WHERE id = :assistant_id"
@@ -52,7 +54,9 @@ def _subscription_after_update(mapper, connection, target):
 
 def _subscription_after_delete(mapper, connection, target):
     """Decrement subscription count when a subscription is deleted."""
-    logger.debug(f"Decrementing subscription count for assistant {target.assistant_id}")
+    logger.debug(
+        "Decrementing subscription count for assistant %s", target.assistant_id
+    )
     connection.execute(
         text(
             "UPDATE assistants SET subscriptions_count = subscriptions_count - 1 WHERE id = :assistant_id"
@@ -0,0 +1,71 @@
+"""Measure the per-request cost of ``authenticate_user``'s token handling.
+
+Example:
+    uv run python scripts/benchmark_auth.py --roles 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from core.auth import AuthenticationHelper, ClaimsCache  # noqa: E402
+
+
+def _token(roles: int) -> str:
+    """Keycloak-style access token with a realistic number of claims."""
+    payload = {
+        "exp": int(time.time()) + 3600,
+        "iat": int(time.time()),
+        "sub": "f3b6a6c4-0d1e-4d0b-9b1a-5f8d2f6c9e11",
+        "lhmObjectID": "123456789",
+        "givenname": "Erika",
+        "name": "Erika Mustermann",
+        "preferred_username": "erika.mustermann",
+        "email": "erika.mustermann@muenchen.de",
+        "department": "RIT-ITM-KM",
+        "resource_access": {
+            "mucgpt": {"roles": ["lhm-ab-mucgpt-user"]},
+            "account": {"roles": ["manage-account", "view-profile"]},
+        },
+        "authorities": [f"ROLE_lhm-ab-group-{index}" for index in range(roles)],
+    }
+    encoded = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+    return f"Bearer eyJhbGciOiJSUzI1NiJ9.{encoded.rstrip('=')}.c2lnbmF0dXJl"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--roles", type=int, default=40)
+    parser.add_argument("--number", type=int, default=10000)
+    args = parser.parse_args()
+
+    token = _token(args.roles)
+    role = "lhm-ab-mucgpt-user"
+    cached_helper = AuthenticationHelper(
+        role=role, claims_cache=ClaimsCache(1024, ttl=300)
+    )
+    uncached_helper = AuthenticationHelper(role=role)
+    cases = {
+        "helper per request": lambda: AuthenticationHelper(role=role).authenticate(
+            token
+        ),
+        "shared helper": lambda: uncached_helper.authenticate(token),
+        "claims cache": lambda: cached_helper.authenticate(token),
+    }
+    print(f"token: {len(token)} bytes, {args.number} requests per case")
+    print(f"{'case':<20}{'us/request':>12}")
+    for name, func in cases.items():
+        seconds = min(timeit.repeat(func, number=args.number, repeat=5))
+        print(f"{name:<20}{seconds / args.number * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
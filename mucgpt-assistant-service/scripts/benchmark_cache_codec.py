@@ -0,0 +1,138 @@
+"""Compare the RedisCache codec with cloudpickle on representative payloads.
+
+Example:
+    uv run python scripts/benchmark_cache_codec.py --departments 6000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import cloudpickle
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from core.cache_codec import decode, encode  # noqa: E402
+
+
+def _directory_tree(departments: int) -> dict[str, Any]:
+    """Directory tree envelope as written by ``core.directory_cache``."""
+    roots = []
+    for referat in range(max(departments // 100, 1)):
+        children = [
+            {
+                "shortname": f"REF{referat}-ABT{index}",
+                "name": f"Abteilung {index} des Referats {referat}",
+                "children": [
+                    {
+                        "shortname": f"REF{referat}-ABT{index}-SG{team}",
+                        "name": f"Sachgebiet {team}",
+                        "children": [],
+                    }
+                    for team in range(3)
+                ],
+            }
+            for index in range(25)
+        ]
+        roots.append(
+            {
+                "shortname": f"REF{referat}",
+                "name": f"Referat {referat}",
+                "children": children,
+            }
+        )
+    return {"data": roots, "loaded_at": "2026-01-01T00:00:00+00:00"}
+
+
+def _mcp_tools(tools: int) -> dict[str, Any]:
+    """MCP tool dump as cached by the core service's ``McpLoader``."""
+    return {
+        "source": [
+            {
+                "name": f"tool_{index}",
+                "description": "Searches the knowledge base for matching documents. "
+                * 4,
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "Search query"},
+                        "limit": {"type": "integer", "default": 10},
+                    },
+                    "required": ["query"],
+                },
+            }
+            for index in range(tools)
+        ]
+    }
+
+
+def _compliance_result() -> dict[str, Any]:
+    return {
+        "overall_status": "pass",
+        "prompt_hash": "0" * 64,
+        "results": [
+            {"category": category, "verdict": "pass", "reasoning": "No indication."}
+            for category in ("migration", "public_services", "hr", "education")
+        ],
+    }
+
+
+def _measure(func: Callable[[], Any], repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--departments", type=int, default=6000)
+    parser.add_argument("--tools", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--compression-min-bytes", type=int, default=1024)
+    args = parser.parse_args()
+
+    payloads = {
+        "directory tree": _directory_tree(args.departments),
+        "mcp tools": _mcp_tools(args.tools),
+        "compliance": _compliance_result(),
+    }
+    print(
+        f"{'payload':<16}{'codec':<13}{'bytes':>12}{'encode ms':>12}{'decode ms':>12}"
+    )
+    for name, payload in payloads.items():
+        pickled = cloudpickle.dumps(payload)
+        plain = encode(payload, sys.maxsize)
+        encoded = encode(payload, args.compression_min_bytes)
+        rows = [
+            (
+                "cloudpickle",
+                len(pickled),
+                _measure(lambda: cloudpickle.dumps(payload), args.repeat),
+                _measure(lambda: cloudpickle.loads(pickled), args.repeat),
+            ),
+            (
+                "json",
+                len(plain),
+                _measure(lambda: encode(payload, sys.maxsize), args.repeat),
+                _measure(lambda: decode(plain), args.repeat),
+            ),
+            (
+                "json+zlib",
+                len(encoded),
+                _measure(
+                    lambda: encode(payload, args.compression_min_bytes), args.repeat
+                ),
+                _measure(lambda: decode(encoded), args.repeat),
+            ),
+        ]
+        for codec, size, encode_ms, decode_ms in rows:
+            print(
+                f"{name:<16}{codec:<13}{size:>12}{encode_ms:>12.3f}{decode_ms:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
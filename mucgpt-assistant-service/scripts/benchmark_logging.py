@@ -0,0 +1,77 @@
+"""Measure event-loop time spent in logging calls.
+
+Compares the JSON console handler called directly on the event loop with
+the queue handler that formats and writes on a background thread.
+
+Example:
+    uv run python scripts/benchmark_logging.py --records 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from core.logtools import BackgroundQueueHandler, JsonFormatter  # noqa: E402
+
+
+def _console(stream) -> logging.Handler:
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+async def _log_records(logger: logging.Logger, records: int) -> float:
+    """Return the seconds the event loop spent inside logging calls."""
+    spent = 0.0
+    for index in range(records):
+        start = time.perf_counter()
+        logger.info("Returning %s accessible assistants for user %s", index, "user-1")
+        spent += time.perf_counter() - start
+        if index % 100 == 0:
+            await asyncio.sleep(0)
+    return spent
+
+
+def _run(handler: logging.Handler, records: int) -> float:
+    logger = logging.getLogger(f"benchmark-{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    try:
+        return asyncio.run(_log_records(logger, records))
+    finally:
+        handler.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20000)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w", encoding="utf-8") as stream:
+        direct = _run(_console(stream), args.records)
+
+        queue_handler = BackgroundQueueHandler(queue.SimpleQueue())
+        queue_handler.listener = logging.handlers.QueueListener(
+            queue_handler.queue, _console(stream), respect_handler_level=True
+        )
+        queued = _run(queue_handler, args.records)
+
+    print(f"{args.records} INFO records")
+    print(f"{'handler':<12}{'loop ms':>10}{'us/record':>12}")
+    for name, seconds in (("direct", direct), ("queue", queued)):
+        print(f"{name:<12}{seconds * 1000:>10.1f}{seconds / args.records * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
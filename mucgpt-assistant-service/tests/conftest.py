@@ -5,6 +5,7 @@ import pytest_asyncio
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from core import directory_cache
+from core.tiered_cache import TieredCache
 from database.database_models import AssistantVersion, Base
 from tests.shared_directory_tree import TEST_TREE
 
@@ -67,3 +68,11 @@ def mock_directory_cache():
         path_matcher._INDEX_CACHE["expires_at"] = None
     except Exception:
         pass
+
+
+@pytest.fixture(autouse=True)
+def reset_local_cache():
+    """Keep in-process cache entries from leaking between tests."""
+    TieredCache.reset()
+    yield
+    TieredCache.reset()
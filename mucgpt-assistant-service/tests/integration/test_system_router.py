@@ -1,5 +1,7 @@
 import pytest
 
+from core.metrics import Metrics
+
 # Headers for authentication
 headers = {
     "Authorization": "Bearer dummy_access_token",
@@ -19,3 +21,18 @@ def test_health_check(test_client):
     response = test_client.get("health")
     assert response.status_code == 200
     assert response.text == '"OK"'
+
+
+@pytest.mark.integration
+def test_metrics(test_client):
+    """Test that metrics are exposed in the Prometheus text format."""
+    Metrics.inc("mucgpt_tiered_cache_requests_total", namespace="compliance", tier="l1")
+
+    response = test_client.get("metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'mucgpt_tiered_cache_requests_total{namespace="compliance",tier="l1"}'
+        in response.text
+    )
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import cloudpickle
+import pytest
+from tests.shared_directory_tree import TEST_TREE
+
+from core.cache_codec import CacheDecodeError, decode, encode
+
+
+def test_directory_envelope_round_trips_compressed() -> None:
+    envelope = {"data": TEST_TREE * 20, "loaded_at": "2026-01-01T00:00:00Z"}
+
+    encoded = encode(envelope, compression_min_bytes=1024)
+
+    assert decode(encoded) == envelope
+    assert len(encoded) < len(cloudpickle.dumps(envelope))
+
+
+def test_pickled_entries_are_rejected() -> None:
+    with pytest.raises(CacheDecodeError):
+        decode(cloudpickle.dumps({"data": TEST_TREE}))
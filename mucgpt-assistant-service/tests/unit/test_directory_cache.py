@@ -3,7 +3,9 @@ from __future__ import annotations
 import pytest
 from fastapi import HTTPException
 
+from core import directory_cache
 from core.directory_cache import _simplify_node, get_directory_children_by_path
+from core.metrics import Metrics
 from core.organization.directory import OrganizationNode
 
 
@@ -133,3 +135,32 @@ async def test_get_directory_children_not_found(monkeypatch) -> None:
         await get_directory_children_by_path(["BAU", "MISSING"])
 
     assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_cached_tree_is_read_from_redis_once(monkeypatch) -> None:
+    reads: list[str] = []
+    envelope = {"data": [], "loaded_at": "2026-01-01T00:00:00Z"}
+
+    async def init_redis() -> None:
+        return None
+
+    async def get_object(key: str):
+        reads.append(key)
+        return envelope
+
+    monkeypatch.setattr(directory_cache.RedisCache, "init_redis", init_redis)
+    monkeypatch.setattr(directory_cache.RedisCache, "get_object", get_object)
+    Metrics.reset()
+
+    first = await directory_cache._get_cached_tree("tree")
+    second = await directory_cache._get_cached_tree("tree")
+
+    assert first == second == envelope
+    assert reads == ["tree"]
+    assert (
+        Metrics.value(
+            "mucgpt_tiered_cache_requests_total", namespace="directory_tree", tier="l1"
+        )
+        == 1
+    )
@@ -1,3 +1,4 @@
+import asyncio
 import time
 import uuid
 from collections.abc import AsyncGenerator
@@ -77,7 +78,7 @@ def _message_chunk_trace_event(
 def _write_stream_trace_span(
     input_messages: list[InputMessage], trace_events: list[dict[str, Any]]
 ) -> None:
-    if not trace_events:
+    if not trace_events or not LangfuseProvider.is_sampled():
         return
     try:
         with get_client().start_as_current_observation(
@@ -173,6 +174,8 @@ class MUCGPTAgentExecutor:
         assistant_id: str | None = None,
         data_sources: list[dict[str, Any]] | None = None,
         conversation_id: str | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
     ) -> AsyncGenerator[dict]:
         logger.info(
             "Chat streaming started with temperature %s, model %s",
@@ -218,8 +221,11 @@ class MUCGPTAgentExecutor:
                         "user_info": user_info,
                         "llm_user": llm_user,
                         "llm_extra_body": llm_extra_body,
+                        "llm_max_tokens": max_tokens,
+                        "llm_stop": stop,
                         "assistant_id": assistant_id,
                         "data_sources": data_sources,
+                        "conversation_id": conversation_id,
                     },
                 ),
             )
@@ -228,12 +234,13 @@ class MUCGPTAgentExecutor:
                 logger.debug(
                     "Enabled tools for this request: %s", ", ".join(enabled_tools)
                 )
+            stream = self.agent.graph.astream(
+                {"messages": msgs},
+                stream_mode=["messages", "custom", "updates"],
+                config=config,
+            )
             try:
-                async for item in self.agent.graph.astream(
-                    {"messages": msgs},
-                    stream_mode=["messages", "custom", "updates"],
-                    config=config,
-                ):
+                async for item in stream:
                     # item is a tuple of (messages, (message_chunk, meta_data)) or a tool call chunk
                     if not isinstance(item, tuple) or len(item) != 2:
                         logger.error(
@@ -325,6 +332,22 @@ class MUCGPTAgentExecutor:
                     output="".join(answer_chunks),
                     metadata={"agent_stream_event_count": len(trace_events)},
                 )
+            except (asyncio.CancelledError, GeneratorExit):
+                # The client went away (or the server shuts down): stop the
+                # graph, which closes model streams and tool sessions.
+                await stream.aclose()
+                _write_stream_trace_span(messages, trace_events)
+                get_client().update_current_span(
+                    output="".join(answer_chunks),
+                    level="WARNING",
+                    status_message="Stream cancelled before completion",
+                    metadata={
+                        "agent_stream_event_count": len(trace_events),
+                        "cancelled": True,
+                    },
+                )
+                logger.info("Chat streaming cancelled")
+                raise
             except Exception as ex:
                 _write_stream_trace_span(messages, trace_events)
                 logger.error("Streaming error: %s", str(ex), exc_info=True)
@@ -368,6 +391,8 @@ class MUCGPTAgentExecutor:
         assistant_id: str | None = None,
         data_sources: list[dict[str, Any]] | None = None,
         conversation_id: str | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
     ) -> ChatCompletionResponse:
         logger.info(
             "Chat non-streaming started with temperature %s, model %s",
@@ -400,8 +425,11 @@ class MUCGPTAgentExecutor:
                     "user_info": user_info,
                     "llm_user": llm_user,
                     "llm_extra_body": llm_extra_body,
+                    "llm_max_tokens": max_tokens,
+                    "llm_stop": stop,
                     "assistant_id": assistant_id,
                     "data_sources": data_sources,
+                    "conversation_id": conversation_id,
                 },
             )
             config = merge_configs(self.base_config, request_config)
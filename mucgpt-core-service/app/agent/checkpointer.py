@@ -0,0 +1,329 @@
+"""LangGraph checkpointers that persist deep-agent state between chat turns.
+
+Checkpoints are scoped to a thread per user and ``conversation_id``; see
+``conversation_thread_id``. The backend is selected via
+``AGENT_CHECKPOINTER``: ``redis`` for deployments, ``memory`` for tests and
+local development, ``none`` to keep every turn stateless.
+"""
+
+import hashlib
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import WatchError
+
+from config.settings import AgentCheckpointerType, get_settings
+from core.cache import RedisCache
+from core.logtools import getLogger
+
+logger = getLogger(name="agent-checkpointer")
+
+_KEY_PREFIX = "mucgpt:agent-checkpoint:v1:"
+
+
+def conversation_thread_id(user_id: str, conversation_id: str) -> str:
+    """Return the checkpoint thread id for a user's conversation."""
+    user_hash = hashlib.sha256(user_id.encode("utf-8")).hexdigest()
+    return f"{user_hash}:{conversation_id}"
+
+
+def _pack(typed: tuple[str, bytes]) -> bytes:
+    type_, data = typed
+    return type_.encode("utf-8") + b"\n" + data
+
+
+def _unpack(blob: bytes) -> tuple[str, bytes]:
+    type_, _, data = blob.partition(b"\n")
+    return type_.decode("utf-8"), data
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver[int]):
+    """Async checkpoint saver storing each thread in a single Redis hash.
+
+    Every write refreshes the hash's TTL, so idle conversations expire as a
+    whole. ``acompact`` collapses a finished turn into one self-contained
+    checkpoint, which keeps the stored size proportional to the state
+    instead of the number of graph steps ever executed.
+    """
+
+    def __init__(self, ttl_seconds: int, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(thread_id: str) -> str:
+        return f"{_KEY_PREFIX}{thread_id}"
+
+    @staticmethod
+    def _ids(config: RunnableConfig) -> tuple[str, str]:
+        configurable = config["configurable"]
+        return str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")
+
+    async def _load_tuple(
+        self,
+        redis: Redis | Pipeline,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint_id: str,
+    ) -> CheckpointTuple | None:
+        key = self._key(thread_id)
+        blob = await redis.hget(key, f"checkpoint:{checkpoint_ns}:{checkpoint_id}")  # type: ignore[misc]
+        if blob is None:
+            return None
+        checkpoint, metadata, parent_id = self.serde.loads_typed(_unpack(blob))
+
+        write_prefix = f"write:{checkpoint_ns}:{checkpoint_id}:".encode()
+        write_fields = [
+            field
+            for field in await redis.hkeys(key)  # type: ignore[misc]
+            if field.startswith(write_prefix)
+        ]
+        writes = []
+        if write_fields:
+            writes = [
+                self.serde.loads_typed(_unpack(write_blob))
+                for write_blob in await redis.hmget(key, write_fields)  # type: ignore[misc]
+            ]
+        # Replay order must match live execution for delta channels.
+        writes.sort(key=lambda w: writes_sort_key(w[3], w[0], w[4]))
+        pending_writes = [
+            (task_id, channel, value) for task_id, channel, value, *_ in writes
+        ]
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=checkpoint,
+            metadata=metadata,
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=pending_writes,
+        )
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id, checkpoint_ns = self._ids(config)
+        checkpoint_id = get_checkpoint_id(config)
+        async with RedisCache.connection() as redis:
+            if checkpoint_id is None:
+                key = self._key(thread_id)
+                latest = await redis.hget(key, f"latest:{checkpoint_ns}")  # type: ignore[misc]
+                if latest is None:
+                    return None
+                checkpoint_id = latest.decode("utf-8")
+            return await self._load_tuple(
+                redis, thread_id, checkpoint_ns, checkpoint_id
+            )
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        if config is None:
+            raise ValueError("RedisCheckpointSaver.alist requires a thread_id")
+        thread_id, checkpoint_ns = self._ids(config)
+        prefix = f"checkpoint:{checkpoint_ns}:".encode()
+        async with RedisCache.connection() as redis:
+            fields = await redis.hkeys(self._key(thread_id))  # type: ignore[misc]
+        checkpoint_ids = sorted(
+            (
+                field[len(prefix) :].decode("utf-8")
+                for field in fields
+                if field.startswith(prefix)
+            ),
+            reverse=True,
+        )
+        before_id = get_checkpoint_id(before) if before else None
+        for checkpoint_id in checkpoint_ids:
+            if before_id is not None and checkpoint_id >= before_id:
+                continue
+            async with RedisCache.connection() as redis:
+                checkpoint_tuple = await self._load_tuple(
+                    redis, thread_id, checkpoint_ns, checkpoint_id
+                )
+            if checkpoint_tuple is None:
+                continue
+            if filter and any(
+                checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()
+            ):
+                continue
+            yield checkpoint_tuple
+            if limit is not None:
+                limit -= 1
+                if limit <= 0:
+                    return
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id, checkpoint_ns = self._ids(config)
+        key = self._key(thread_id)
+        blob = _pack(
+            self.serde.dumps_typed(
+                (
+                    checkpoint,
+                    get_checkpoint_metadata(config, metadata),
+                    config["configurable"].get("checkpoint_id"),
+                )
+            )
+        )
+        async with (
+            RedisCache.connection() as redis,
+            redis.pipeline(transaction=True) as pipe,
+        ):
+            pipe.hset(key, f"checkpoint:{checkpoint_ns}:{checkpoint['id']}", blob)
+            pipe.hset(key, f"latest:{checkpoint_ns}", checkpoint["id"])
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id, checkpoint_ns = self._ids(config)
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        key = self._key(thread_id)
+        async with (
+            RedisCache.connection() as redis,
+            redis.pipeline(transaction=True) as pipe,
+        ):
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                field = f"write:{checkpoint_ns}:{checkpoint_id}:{task_id}:{write_idx}"
+                blob = _pack(
+                    self.serde.dumps_typed(
+                        (task_id, channel, value, task_path, write_idx)
+                    )
+                )
+                if write_idx >= 0:
+                    pipe.hsetnx(key, field, blob)
+                else:
+                    pipe.hset(key, field, blob)
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        async with RedisCache.connection() as redis:
+            await redis.delete(self._key(thread_id))
+
+    async def acompact(self, config: RunnableConfig, values: dict[str, Any]) -> None:
+        """Replace a thread's history with its latest checkpoint only.
+
+        ``values`` are the materialized state values of that checkpoint (as
+        returned by ``graph.aget_state``). Delta channels, which are normally
+        rebuilt by replaying ancestor writes, are stored with their plain
+        value, which LangGraph restores directly, so the compacted checkpoint
+        no longer depends on its ancestors.
+
+        The thread is rewritten in a WATCH/MULTI transaction. If another turn
+        writes to it in the meantime, compaction is skipped; the next turn
+        compacts again.
+        """
+        thread_id, checkpoint_ns = self._ids(config)
+        key = self._key(thread_id)
+        try:
+            async with (
+                RedisCache.connection() as redis,
+                redis.pipeline(transaction=True) as pipe,
+            ):
+                await pipe.watch(key)
+                latest_id = await pipe.hget(key, f"latest:{checkpoint_ns}")
+                if latest_id is None:
+                    return
+                latest = await self._load_tuple(
+                    pipe, thread_id, checkpoint_ns, latest_id.decode("utf-8")
+                )
+                if latest is None:
+                    return
+
+                checkpoint = latest.checkpoint.copy()
+                channel_values = dict(checkpoint["channel_values"])
+                for channel in checkpoint["channel_versions"]:
+                    if channel not in channel_values and channel in values:
+                        channel_values[channel] = values[channel]
+                checkpoint["channel_values"] = channel_values
+                metadata = {
+                    k: v
+                    for k, v in latest.metadata.items()
+                    if k != "counters_since_delta_snapshot"
+                }
+                blob = _pack(self.serde.dumps_typed((checkpoint, metadata, None)))
+
+                pipe.multi()
+                pipe.delete(key)
+                pipe.hset(key, f"checkpoint:{checkpoint_ns}:{checkpoint['id']}", blob)
+                pipe.hset(key, f"latest:{checkpoint_ns}", checkpoint["id"])
+                pipe.expire(key, self.ttl_seconds)
+                await pipe.execute()
+        except WatchError:
+            logger.debug("Thread %s changed during compaction; skipped", thread_id)
+
+
+class AgentCheckpointer:
+    """Process-wide checkpointer selected by ``AGENT_CHECKPOINTER``."""
+
+    _checkpointer: BaseCheckpointSaver | None = None
+
+    @classmethod
+    def get(cls) -> BaseCheckpointSaver | None:
+        """Return the configured checkpointer, or ``None`` if disabled."""
+        if cls._checkpointer is not None:
+            return cls._checkpointer
+        settings = get_settings()
+        if settings.AGENT_CHECKPOINTER == AgentCheckpointerType.REDIS:
+            cls._checkpointer = RedisCheckpointSaver(
+                ttl_seconds=settings.AGENT_CHECKPOINT_TTL_SECONDS
+            )
+        elif settings.AGENT_CHECKPOINTER == AgentCheckpointerType.MEMORY:
+            cls._checkpointer = InMemorySaver()
+        return cls._checkpointer
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._checkpointer = None
@@ -1,29 +1,38 @@
-import os
+import hashlib
+import json
 from typing import Any, cast
 
 from deepagents import create_deep_agent
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.runnables.config import merge_configs
 from langchain_core.tools.base import BaseTool
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
+from agent.checkpointer import RedisCheckpointSaver, conversation_thread_id
 from agent.middleware import ContextMiddleware, RequestContext, ToolErrorMiddleware
 from agent.state_models.default_state import DefaultAgentState
 from agent.tools.mcp import McpBearerAuthProvider
 from core.auth_models import AuthenticationResult
 from core.logtools import getLogger
+from core.prompt_pool import PromptPool
 
 logger = getLogger(name="mucgpt-core-react-agent")
 
-DEFAULT_INSTRUCTIONS = ""
-with open(
-    os.path.join(os.path.dirname(__file__), "prompt_pool", "default_instructions.md")
-) as fp:
-    DEFAULT_INSTRUCTIONS = fp.read()
-
 # TODO:
 # - consider prompt pool in langfuse
 
+
+def _history_digest(messages: list[BaseMessage]) -> str:
+    digest = hashlib.sha256()
+    for message in messages:
+        digest.update(
+            json.dumps([message.type, message.content], ensure_ascii=False).encode()
+        )
+    return digest.hexdigest()
+
+
 class _ConfiguredLangChainDeepAgentGraph:
     """Simple wrapper around a LangChain agent to configure it with user info and tools on each run."""
 
@@ -33,27 +42,53 @@ class _ConfiguredLangChainDeepAgentGraph:
         tools: list[BaseTool],
         logger,
         debug: bool = True,
+        checkpointer: BaseCheckpointSaver | None = None,
     ):
         self.model = llm
         self.tools = tools
         self.logger = logger
         self.debug = debug
+        self.checkpointer = checkpointer
 
         # After PR #1177 the agent graph is not compiled per request anymore.
         # dynamically selecting the state schema based on the tools is not supported anymore --> defautling to DefaultAgentState for now.
         self.state_schema = DefaultAgentState
-        self.agent = create_deep_agent(
+        self._build_agent()
+
+    def _build_agent(self) -> None:
+        self._prompt_version = PromptPool.version()
+        self._agent = create_deep_agent(
             model=cast(Any, self.model),
             tools=self.tools,
             middleware=[
                 ContextMiddleware(state_schema=self.state_schema),
                 ToolErrorMiddleware(),
             ], # type: ignore
-            system_prompt=DEFAULT_INSTRUCTIONS,
+            system_prompt=PromptPool.get("default_instructions.md"),
             debug=self.debug,
             state_schema=self.state_schema,
             context_schema=RequestContext,
-            checkpointer=None,
+            checkpointer=self.checkpointer,
+        )
+
+    @property
+    def agent(self):
+        """The compiled graph, rebuilt once the prompt pool has been reloaded.
+
+        The system prompt is baked into the graph, so a graph built before a
+        reload would keep answering with the old instructions.
+        """
+        if self._prompt_version != PromptPool.version():
+            self.logger.info("Prompt pool changed; rebuilding agent graph")
+            self._build_agent()
+        return self._agent
+
+    def _trace_metadata(self) -> RunnableConfig:
+        return RunnableConfig(
+            metadata={
+                "agent_state_schema": self.state_schema.__name__,
+                "prompt_pool_version": PromptPool.version(),
+            }
         )
 
     def _prepare_run(
@@ -88,10 +123,77 @@ class _ConfiguredLangChainDeepAgentGraph:
             stream=configurable.get("llm_streaming", False),
             extra_body=extra_body,
             enabled_tools=enabled_tools,
+            max_tokens=configurable.get("llm_max_tokens"),
+            stop=configurable.get("llm_stop"),
         )
 
         return messages, data_sources, request_context
 
+    async def _resume_thread(
+        self, messages: list[Any], config: RunnableConfig
+    ) -> tuple[list[Any], RunnableConfig]:
+        """Attach the conversation's checkpoint thread to ``config``.
+
+        Clients resend their full history, so only the messages the
+        checkpoint has not seen yet are passed on; the assistant answers the
+        client echoes back are already part of the checkpointed state. If the
+        client history diverged from the checkpoint (e.g. an edited message),
+        the thread is discarded and rebuilt from the full history.
+        """
+        configurable = config.get("configurable", {})
+        conversation_id = configurable.get("conversation_id")
+        if not conversation_id:
+            raise ValueError("conversation_id is required when using a checkpointer")
+        user_info = cast(AuthenticationResult, configurable["user_info"])
+        thread_id = conversation_thread_id(user_info.user_id, conversation_id)
+        thread_config = merge_configs(
+            config,
+            RunnableConfig(
+                configurable={"thread_id": thread_id},
+                metadata={
+                    "client_history_length": len(messages),
+                    "client_history_digest": _history_digest(messages),
+                },
+            ),
+        )
+
+        snapshot = await self.agent.aget_state(
+            RunnableConfig(configurable={"thread_id": thread_id})
+        )
+        if not snapshot.values:
+            return messages, thread_config
+
+        metadata = snapshot.metadata or {}
+        seen = metadata.get("client_history_length")
+        if (
+            isinstance(seen, int)
+            and seen < len(messages)
+            and _history_digest(messages[:seen])
+            == metadata.get("client_history_digest")
+        ):
+            new_messages = list(messages[seen:])
+            while new_messages and isinstance(new_messages[0], AIMessage):
+                new_messages.pop(0)
+            if new_messages:
+                self.logger.debug(
+                    "Resuming thread with %d new message(s)", len(new_messages)
+                )
+                return new_messages, thread_config
+
+        self.logger.info("Client history diverged from checkpoint; resetting thread")
+        await self.checkpointer.adelete_thread(thread_id)  # type: ignore[union-attr]
+        return messages, thread_config
+
+    async def _compact_thread(self, config: RunnableConfig) -> None:
+        """Collapse the finished turn into a single checkpoint."""
+        if not isinstance(self.checkpointer, RedisCheckpointSaver):
+            return
+        try:
+            snapshot = await self.agent.aget_state(config)
+            await self.checkpointer.acompact(config, snapshot.values)
+        except Exception:
+            self.logger.warning("Failed to compact agent checkpoint", exc_info=True)
+
     async def astream(
         self,
         input_data: dict[str, Any],
@@ -104,13 +206,13 @@ class _ConfiguredLangChainDeepAgentGraph:
 
         # Keep the stable graph schema visible in trace metadata without
         # mutating the caller's config dict.
-        config = merge_configs(
-            config or {},
-            RunnableConfig(metadata={"agent_state_schema": self.state_schema.__name__}),
-        )
+        config = merge_configs(config or {}, self._trace_metadata())
+
+        if self.checkpointer is not None:
+            messages, config = await self._resume_thread(messages, config)
 
         input_payload = {"messages": messages}
-        if data_sources:
+        if data_sources or self.checkpointer is not None:
             input_payload["data_sources"] = data_sources  # type: ignore
 
         async for item in self.agent.astream(
@@ -122,6 +224,9 @@ class _ConfiguredLangChainDeepAgentGraph:
         ):
             yield item
 
+        if self.checkpointer is not None:
+            await self._compact_thread(config)
+
     async def ainvoke(
         self,
         input_data: dict[str, Any],
@@ -132,18 +237,21 @@ class _ConfiguredLangChainDeepAgentGraph:
         messages, data_sources, request_context = self._prepare_run(input_data, config)
 
         # Merge agent_state_schema into trace metadata.
-        config = merge_configs(
-            config or {},
-            RunnableConfig(metadata={"agent_state_schema": self.state_schema.__name__}),
-        )
+        config = merge_configs(config or {}, self._trace_metadata())
+
+        if self.checkpointer is not None:
+            messages, config = await self._resume_thread(messages, config)
 
         input_payload = {"messages": messages}
-        if data_sources:
+        if data_sources or self.checkpointer is not None:
             input_payload["data_sources"] = data_sources  # type: ignore
 
-        return await self.agent.ainvoke(
+        result = await self.agent.ainvoke(
             input_payload, config=config, context=request_context, **kwargs
         )
+        if self.checkpointer is not None:
+            await self._compact_thread(config)
+        return result
 
 
 class MUCGPTAgent:
@@ -155,6 +263,7 @@ class MUCGPTAgent:
         tools: list[BaseTool],
         logger=None,
         debug: bool = True,
+        checkpointer: BaseCheckpointSaver | None = None,
     ):
         self.logger = logger if logger else getLogger(name="mucgpt-core-react-agent")
         self.model = llm  # required for non-streaming calls, e.g. assisted MUCGPT-Assistant generation.
@@ -163,4 +272,5 @@ class MUCGPTAgent:
             tools=tools,
             logger=self.logger,
             debug=debug,
+            checkpointer=checkpointer,
         )
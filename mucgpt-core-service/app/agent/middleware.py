@@ -1,4 +1,5 @@
-from collections.abc import Awaitable, Callable
+import hashlib
+from collections.abc import Awaitable, Callable, Mapping, Sized
 from dataclasses import dataclass
 from typing import Any
 from xml.sax.saxutils import escape, quoteattr
@@ -19,15 +20,27 @@ from langfuse.langchain import CallbackHandler as LFCallbackHandler
 from langgraph.config import get_config as get_runtime_config
 from langgraph.types import Command
 
+from agent.retrieval import aselect_relevant_chunks, select_relevant_chunks
 from agent.state_models.default_state import DefaultAgentState
+from agent.token_budget import fit_to_budget, get_token_counter, reserved_output_tokens
 from agent.tools.policies import get_policy_for_state
 from config.harness_profiles import DEEP_AGENT_BUILTIN_TOOLS
 from config.langfuse_provider import LangfuseProvider
-from config.model_provider import ModelRegistry
+from config.model_provider import ModelRegistry, ModelsConfigurationException
+from config.settings import (
+    ModelInfo,
+    get_model_config,
+    get_retrieval_settings,
+    get_token_budget_settings,
+)
 from core.logtools import getLogger
+from core.metrics import Metrics
 
 logger = getLogger(name="agent-middleware")
 
+# State strings up to this length are attached to spans verbatim.
+_SPAN_INLINE_MAX_CHARS = 200
+
 
 @dataclass
 class RequestContext:
@@ -38,6 +51,8 @@ class RequestContext:
     user: str | None = None
     extra_body: dict[str, Any] | None = None
     enabled_tools: list[str] | None = None
+    max_tokens: int | None = None
+    stop: list[str] | None = None
 
 
 def _make_scoped_callbacks() -> list:
@@ -47,8 +62,11 @@ def _make_scoped_callbacks() -> list:
     can preserve parent/child run lineage under the active ``MUCGPTAgent`` run.
     Fall back to creating a fresh handler when the provider is unavailable.
 
-    Silently returns ``[]`` when Langfuse is not installed / configured.
+    Silently returns ``[]`` when Langfuse is not installed / configured or
+    the request was sampled out.
     """
+    if not LangfuseProvider.is_sampled():
+        return []
     try:
         provider_handler = LangfuseProvider.get_callback_handler()
         if provider_handler is not None:
@@ -59,24 +77,67 @@ def _make_scoped_callbacks() -> list:
         return []
 
 
+def _item_shape(item: Any) -> str:
+    """Identify a collection item by title and size, without reading its content."""
+    if isinstance(item, str):
+        return f"str:{len(item)}"
+    if isinstance(item, Mapping):
+        content = item.get("content")
+        size = len(content) if isinstance(content, Sized) else 0
+        return f"{item.get('title') or item.get('name') or ''}:{size}"
+    return type(item).__name__
+
+
+def _summarize_state_value(value: Any) -> Any:
+    """Span metadata for one state field.
+
+    Short scalars are kept, long strings are reduced to their length and
+    collections to a count plus a fingerprint of item titles and sizes. The
+    cost depends on the number of items, not on the size of their content.
+    """
+    if isinstance(value, str):
+        if len(value) <= _SPAN_INLINE_MAX_CHARS:
+            return value
+        return {"chars": len(value)}
+    if isinstance(value, bool | int | float):
+        return str(value)
+    if isinstance(value, Mapping):
+        return {"count": len(value)}
+    if isinstance(value, list | tuple):
+        shapes = "\n".join(_item_shape(item) for item in value)
+        return {
+            "count": len(value),
+            "fingerprint": hashlib.sha256(shapes.encode("utf-8")).hexdigest()[:12],
+        }
+    return type(value).__name__
+
+
 def _annotate_span_with_policy_state(
     policy: Any,
     state: Any,
     state_schema: type,
 ) -> None:
-    """Write policy name and current scope fields as metadata on the active
-    Langfuse span.
+    """Write policy name and a summary of the current state fields as metadata
+    on the active Langfuse span.
 
     Called from ``ContextMiddleware`` *before* the model invocation, so the
     active OTel span is the LangGraph node span that wraps the upcoming LLM
     call.  ``update_current_span`` enriches that span with policy/state context
-    that would otherwise be invisible to Langfuse.
+    that would otherwise be invisible to Langfuse.  Large fields such as
+    ``data_sources`` are summarized by ``_summarize_state_value``.
 
-    Silently no-ops when Langfuse is not configured or no span is active.
+    Silently no-ops when Langfuse is not configured, no span is active or the
+    request was sampled out; the summary is only built otherwise.
     """
+    if not LangfuseProvider.is_sampled():
+        return
     try:
         from langfuse import get_client as _lf_get_client
 
+        client = _lf_get_client()
+        if client.get_current_observation_id() is None:
+            return
+
         metadata: dict[str, Any] = {
             "policy": policy.__class__.__name__,
             "agent_state_schema": state_schema.__name__,
@@ -88,12 +149,12 @@ def _annotate_span_with_policy_state(
                 else (state.model_dump() if hasattr(state, "model_dump") else {})
             )
             metadata["agent_state"] = {
-                k: str(v)
+                k: _summarize_state_value(v)
                 for k, v in state_dict.items()
                 if v is not None and k != "messages"
             }
 
-        _lf_get_client().update_current_span(metadata=metadata)
+        client.update_current_span(metadata=metadata)
     except Exception:
         pass  # Langfuse not configured or no active span — do not break execution
 
@@ -182,7 +243,7 @@ def _inject_data_sources(
     if not data_sources_xml:
         return messages
 
-    logger.info(f"Injecting {len(data_sources)} data source(s) into request context")
+    logger.info("Injecting %s data source(s) into request context", len(data_sources))
 
     context_message = HumanMessage(
         content=(
@@ -236,6 +297,135 @@ def _get_assistant_id_from_request(request: ModelRequest) -> str | None:
     return str(assistant_id) if assistant_id else None
 
 
+def _get_model_info(model_name: str | None) -> ModelInfo | None:
+    """Return the configured model info for ``model_name`` (default model if None)."""
+    if model_name is None:
+        try:
+            model_name = getattr(ModelRegistry.get_model(), "model_name", None)
+        except ModelsConfigurationException:
+            return None
+    if model_name is None:
+        return None
+    model_config = get_model_config(model_name)
+    return model_config.model_info if model_config else None
+
+
+def _latest_user_text(messages: list[AnyMessage]) -> str:
+    """Return the text of the latest user message, ignoring injected context."""
+    for msg in reversed(messages):
+        if not isinstance(msg, HumanMessage):
+            continue
+        text = str(msg.text)
+        if DATA_SOURCES_SENTINEL not in text:
+            return text
+    return ""
+
+
+def _apply_retrieval(request: ModelRequest, data_sources: list[Any]) -> list[Any]:
+    """Replace large data sources by the chunks relevant to the latest turn."""
+    if not data_sources:
+        return data_sources
+    selected = select_relevant_chunks(
+        data_sources,
+        query=_latest_user_text(request.messages),
+        config=get_retrieval_settings(),
+        counter=get_token_counter(),
+    )
+    return _record_retrieval(data_sources, selected)
+
+
+async def _aapply_retrieval(
+    request: ModelRequest, data_sources: list[Any]
+) -> list[Any]:
+    """Async variant of ``_apply_retrieval``; indexes are built off the event loop."""
+    if not data_sources:
+        return data_sources
+    selected = await aselect_relevant_chunks(
+        data_sources,
+        query=_latest_user_text(request.messages),
+        config=get_retrieval_settings(),
+        counter=get_token_counter(),
+    )
+    return _record_retrieval(data_sources, selected)
+
+
+def _record_retrieval(
+    data_sources: list[Any], selected: list[dict[str, Any]] | None
+) -> list[Any]:
+    if selected is None:
+        Metrics.inc("mucgpt_data_source_retrieval_total", mode="full")
+        return data_sources
+    logger.info(
+        "Selected %d chunk(s) from %d data source(s)",
+        len(selected),
+        len(data_sources),
+    )
+    Metrics.inc("mucgpt_data_source_retrieval_total", mode="retrieval")
+    return selected
+
+
+def _apply_token_budget(
+    request: ModelRequest,
+    data_sources: list[Any],
+) -> tuple[ModelRequest, list[Any]]:
+    """Fit history and data sources into the selected model's input window.
+
+    Data sources are truncated first, then the oldest conversation turns are
+    dropped. The request's system message, system messages in the history
+    (e.g. assistant instructions), tool schemas and the latest user turn are
+    never shortened. No-ops when budgeting is disabled or the model's
+    ``max_input_tokens`` is unknown.
+    """
+    budget_config = get_token_budget_settings()
+    if not budget_config.ENABLED:
+        return request, data_sources
+
+    runtime_context = _get_request_context(request)
+    model_info = _get_model_info(
+        runtime_context.model_name if runtime_context else None
+    )
+    if model_info is None or not model_info.max_input_tokens:
+        return request, data_sources
+
+    # Reserve what _configure_model_request will send as max_tokens.
+    max_tokens = (
+        model_info.clamp_max_tokens(runtime_context.max_tokens)
+        if runtime_context is not None
+        else None
+    )
+    counter = get_token_counter()
+    fixed_tokens = sum(counter.count_tool(tool) for tool in request.tools or [])
+    if request.system_message is not None:
+        fixed_tokens += counter.count_message(request.system_message)
+
+    result = fit_to_budget(
+        messages=request.messages,
+        data_sources=data_sources,
+        fixed_tokens=fixed_tokens,
+        max_input_tokens=model_info.max_input_tokens,
+        reserved_tokens=reserved_output_tokens(model_info, budget_config, max_tokens),
+        budget_config=budget_config,
+        counter=counter,
+    )
+    if result.truncated_sources:
+        logger.info(
+            "Truncated %d data source(s) to fit the input window",
+            len(result.truncated_sources),
+        )
+        Metrics.inc("mucgpt_token_budget_adjustments_total", action="truncate_sources")
+    if result.trimmed_messages:
+        logger.info(
+            "Dropped %d oldest message(s) to fit the input window",
+            result.trimmed_messages,
+        )
+        Metrics.inc("mucgpt_token_budget_adjustments_total", action="trim_history")
+        request = request.override(messages=result.messages)
+    if not result.fits:
+        logger.warning("Request still exceeds the input window after budgeting")
+        Metrics.inc("mucgpt_token_budget_adjustments_total", action="over_budget")
+    return request, result.data_sources
+
+
 def _configure_model_request(request: ModelRequest) -> ModelRequest:
     """Select a concrete model and apply request-scoped invocation settings."""
     runtime_context = _get_request_context(request)
@@ -251,8 +441,19 @@ def _configure_model_request(request: ModelRequest) -> ModelRequest:
         model_settings["user"] = runtime_context.user
     if runtime_context.extra_body is not None:
         model_settings["extra_body"] = runtime_context.extra_body
+    if runtime_context.stop:
+        model_settings["stop"] = runtime_context.stop
 
     model = ModelRegistry.get_model(runtime_context.model_name)
+    model_name = runtime_context.model_name or getattr(model, "model_name", None)
+    model_config = get_model_config(model_name) if model_name else None
+    max_tokens = (
+        model_config.clamp_max_tokens(runtime_context.max_tokens)
+        if model_config
+        else runtime_context.max_tokens
+    )
+    if max_tokens is not None:
+        model_settings["max_tokens"] = max_tokens
     model_settings = ModelRegistry.normalize_model_settings(model, model_settings)
     return request.override(model=model, model_settings=model_settings)
 
@@ -306,7 +507,7 @@ class ContextMiddleware(AgentMiddleware):
         # request = policy.infer_scope(request, callbacks=inference_callbacks)
         request = _filter_request_tools(request)
         request = request.override(tools=policy.select_tools(request))
-        logger.info(f"selected Tools: {len(request.tools or [])}")
+        logger.info("selected Tools: %s", len(request.tools or []))
         _annotate_span_with_policy_state(policy, request.state, self.state_schema)
 
         assistant_id = _get_assistant_id_from_request(request)
@@ -318,7 +519,10 @@ class ContextMiddleware(AgentMiddleware):
             if isinstance(request.state, dict)
             else []
         )
-        all_data_sources = self.data_sources + state_data_sources
+        all_data_sources = _apply_retrieval(
+            request, self.data_sources + state_data_sources
+        )
+        request, all_data_sources = _apply_token_budget(request, all_data_sources)
         if all_data_sources:
             new_messages = _inject_data_sources(request.messages, all_data_sources)
             request = request.override(messages=new_messages)
@@ -340,7 +544,7 @@ class ContextMiddleware(AgentMiddleware):
         # request = await policy.ainfer_scope(request, callbacks=inference_callbacks)
         request = _filter_request_tools(request)
         request = request.override(tools=policy.select_tools(request))
-        logger.info(f"selected Tools: {len(request.tools or [])}")
+        logger.info("selected Tools: %s", len(request.tools or []))
         _annotate_span_with_policy_state(policy, request.state, self.state_schema)
 
         assistant_id = _get_assistant_id_from_request(request)
@@ -352,7 +556,10 @@ class ContextMiddleware(AgentMiddleware):
             if isinstance(request.state, dict)
             else []
         )
-        all_data_sources = self.data_sources + state_data_sources
+        all_data_sources = await _aapply_retrieval(
+            request, self.data_sources + state_data_sources
+        )
+        request, all_data_sources = _apply_token_budget(request, all_data_sources)
         if all_data_sources:
             new_messages = _inject_data_sources(request.messages, all_data_sources)
             request = request.override(messages=new_messages)
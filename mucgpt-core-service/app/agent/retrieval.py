@@ -0,0 +1,254 @@
+"""Lexical (BM25) retrieval over uploaded data sources.
+
+Large data sources are split into chunks and only the chunks that best
+match the user's latest message are injected into model calls. Indexes are
+built in memory and cached by the content hash of the data sources, so the
+several model calls of one agent run (and follow-up turns on the same
+documents) share one index. The async path builds missing indexes in a
+worker thread so the event loop keeps serving other requests.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from agent.token_budget import TokenCounter
+from config.settings import DataSourceRetrievalConfig
+from parsing.base import ParsedDocument
+from parsing.chunking import DocumentChunk, chunk_document
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_K1 = 1.5
+_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in _TOKEN.findall(text.casefold()) if len(token) > 1]
+
+
+@dataclass
+class SourceChunk:
+    source_index: int
+    title: str
+    chunk_count: int
+    chunk: DocumentChunk
+    metadata: dict[str, Any]
+
+
+class BM25Index:
+    """Okapi BM25 index over the chunks of a set of data sources."""
+
+    def __init__(self, chunks: list[SourceChunk]):
+        self.chunks = chunks
+        self._term_freqs = [Counter(tokenize(c.chunk.content)) for c in chunks]
+        self._lengths = [sum(freqs.values()) for freqs in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(chunks)) if chunks else 0.0
+        document_freqs: Counter[str] = Counter()
+        for freqs in self._term_freqs:
+            document_freqs.update(freqs.keys())
+        total = len(chunks)
+        self._idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in document_freqs.items()
+        }
+
+    def search(self, query: str, top_k: int) -> list[tuple[float, SourceChunk]]:
+        terms = [term for term in set(tokenize(query)) if term in self._idf]
+        if not terms:
+            return []
+        scored = []
+        for index, freqs in enumerate(self._term_freqs):
+            length_norm = _K1 * (
+                1 - _B + _B * self._lengths[index] / (self._avg_length or 1.0)
+            )
+            score = 0.0
+            for term in terms:
+                tf = freqs.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (_K1 + 1) / (tf + length_norm)
+            if score > 0:
+                scored.append((score, self.chunks[index]))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored[:top_k]
+
+
+def _source_fields(source: Any, index: int) -> tuple[str, str, dict[str, Any]]:
+    if isinstance(source, str):
+        return f"Document {index}", source, {}
+    if isinstance(source, dict):
+        metadata = source.get("metadata")
+        return (
+            str(source.get("title") or f"Document {index}"),
+            str(source.get("content") or ""),
+            dict(metadata) if isinstance(metadata, dict) else {},
+        )
+    return f"Document {index}", "", {}
+
+
+def build_index(
+    data_sources: list[Any], chunk_max_tokens: int, counter: TokenCounter
+) -> BM25Index:
+    chunks: list[SourceChunk] = []
+    for source_index, source in enumerate(data_sources, start=1):
+        title, content, metadata = _source_fields(source, source_index)
+        if not content.strip():
+            continue
+        document_chunks = chunk_document(
+            ParsedDocument(content=content),
+            max_tokens=chunk_max_tokens,
+            counter=counter,
+        )
+        chunks.extend(
+            SourceChunk(
+                source_index=source_index,
+                title=title,
+                chunk_count=len(document_chunks),
+                chunk=chunk,
+                metadata=metadata,
+            )
+            for chunk in document_chunks
+        )
+    return BM25Index(chunks)
+
+
+class RetrievalIndexCache:
+    """Process-wide LRU cache of BM25 indexes keyed by data source content."""
+
+    _lock = threading.Lock()
+    _indexes: OrderedDict[str, BM25Index] = OrderedDict()
+
+    @staticmethod
+    def build_key(data_sources: list[Any], chunk_max_tokens: int) -> str:
+        digest = hashlib.sha256(str(chunk_max_tokens).encode("utf-8"))
+        for index, source in enumerate(data_sources, start=1):
+            title, content, _ = _source_fields(source, index)
+            digest.update(json.dumps([title, content], ensure_ascii=False).encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def _lookup(cls, key: str) -> BM25Index | None:
+        with cls._lock:
+            index = cls._indexes.get(key)
+            if index is not None:
+                cls._indexes.move_to_end(key)
+            return index
+
+    @classmethod
+    def _store(cls, key: str, index: BM25Index, max_entries: int) -> None:
+        with cls._lock:
+            cls._indexes[key] = index
+            while len(cls._indexes) > max_entries:
+                cls._indexes.popitem(last=False)
+
+    @classmethod
+    def get_or_build(
+        cls,
+        data_sources: list[Any],
+        config: DataSourceRetrievalConfig,
+        counter: TokenCounter,
+    ) -> BM25Index:
+        key = cls.build_key(data_sources, config.CHUNK_MAX_TOKENS)
+        index = cls._lookup(key)
+        if index is None:
+            index = build_index(data_sources, config.CHUNK_MAX_TOKENS, counter)
+            cls._store(key, index, config.INDEX_CACHE_SIZE)
+        return index
+
+    @classmethod
+    async def aget_or_build(
+        cls,
+        data_sources: list[Any],
+        config: DataSourceRetrievalConfig,
+        counter: TokenCounter,
+    ) -> BM25Index:
+        """Like ``get_or_build``, but builds a missing index in a worker thread."""
+        key = cls.build_key(data_sources, config.CHUNK_MAX_TOKENS)
+        index = cls._lookup(key)
+        if index is None:
+            index = await asyncio.to_thread(
+                build_index, data_sources, config.CHUNK_MAX_TOKENS, counter
+            )
+            cls._store(key, index, config.INDEX_CACHE_SIZE)
+        return index
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._indexes.clear()
+
+
+def _chunk_source(item: SourceChunk) -> dict[str, Any]:
+    chunk = item.chunk
+    metadata = {
+        **item.metadata,
+        "excerpt": f"part {chunk.index + 1} of {item.chunk_count}",
+        "characters": f"{chunk.start}-{chunk.end}",
+    }
+    if chunk.heading:
+        metadata["section"] = chunk.heading
+    return {"title": item.title, "content": chunk.content, "metadata": metadata}
+
+
+def _needs_retrieval(
+    data_sources: list[Any],
+    query: str,
+    config: DataSourceRetrievalConfig,
+    counter: TokenCounter,
+) -> bool:
+    if not config.ENABLED or not data_sources or not query.strip():
+        return False
+    total_tokens = sum(
+        counter.count_text(_source_fields(source, index)[1])
+        for index, source in enumerate(data_sources, start=1)
+    )
+    return total_tokens >= config.MIN_TOTAL_TOKENS
+
+
+def _select_chunks(
+    index: BM25Index, query: str, top_k: int
+) -> list[dict[str, Any]] | None:
+    hits = index.search(query, top_k)
+    if not hits:
+        return None
+    selected = sorted(
+        (item for _, item in hits),
+        key=lambda item: (item.source_index, item.chunk.start),
+    )
+    return [_chunk_source(item) for item in selected]
+
+
+def select_relevant_chunks(
+    data_sources: list[Any],
+    query: str,
+    config: DataSourceRetrievalConfig,
+    counter: TokenCounter,
+) -> list[dict[str, Any]] | None:
+    """Return the best matching chunks as data sources, or ``None`` to keep all.
+
+    Data sources are kept in full when retrieval is disabled, when they are
+    below ``MIN_TOTAL_TOKENS`` or when the query matches nothing. Selected
+    chunks are returned in document order.
+    """
+    if not _needs_retrieval(data_sources, query, config, counter):
+        return None
+    index = RetrievalIndexCache.get_or_build(data_sources, config, counter)
+    return _select_chunks(index, query, config.TOP_K)
+
+
+async def aselect_relevant_chunks(
+    data_sources: list[Any],
+    query: str,
+    config: DataSourceRetrievalConfig,
+    counter: TokenCounter,
+) -> list[dict[str, Any]] | None:
+    """Async variant of ``select_relevant_chunks`` for use on the event loop."""
+    if not _needs_retrieval(data_sources, query, config, counter):
+        return None
+    index = await RetrievalIndexCache.aget_or_build(data_sources, config, counter)
+    return _select_chunks(index, query, config.TOP_K)
@@ -0,0 +1,296 @@
+"""Pre-flight token budgeting for agent model calls.
+
+Keeps the prompt (system message, tool schemas, chat history and injected
+data sources) within the selected model's ``max_input_tokens`` while always
+leaving room for the model's output.
+"""
+
+import hashlib
+import json
+import math
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from langchain_core.messages import AnyMessage, HumanMessage, SystemMessage
+
+from config.settings import ModelInfo, TokenBudgetConfig, get_token_budget_settings
+from core.logtools import getLogger
+
+logger = getLogger(name="agent-token-budget")
+
+# Approximate per-message framing overhead of chat completion APIs.
+_MESSAGE_OVERHEAD_TOKENS = 4
+TRUNCATION_MARKER = (
+    "\n\n[... truncated: showing the first {shown} of {total} characters of "
+    "this document to fit the model's input limit ...]"
+)
+
+
+class TokenCounter:
+    """Token counter with a bounded per-message count cache.
+
+    Uses a tiktoken encoding when one is configured and loadable, otherwise a
+    conservative characters-per-token estimate. Message counts are cached by
+    message id, so a growing conversation only pays for the new messages.
+    """
+
+    def __init__(
+        self,
+        chars_per_token: float = 3.0,
+        encoding_name: str | None = None,
+        cache_size: int = 4096,
+    ):
+        self.chars_per_token = chars_per_token
+        self._encoding = self._load_encoding(encoding_name)
+        self._cache: OrderedDict[str, int] = OrderedDict()
+        self._cache_size = cache_size
+
+    @staticmethod
+    def _load_encoding(encoding_name: str | None) -> Any | None:
+        if not encoding_name:
+            return None
+        try:
+            import tiktoken
+
+            return tiktoken.get_encoding(encoding_name)
+        except Exception:
+            logger.warning(
+                "Tokenizer encoding %s unavailable; using approximate token counts",
+                encoding_name,
+                exc_info=True,
+            )
+            return None
+
+    def _cached(self, key: str, compute) -> int:
+        count = self._cache.get(key)
+        if count is not None:
+            self._cache.move_to_end(key)
+            return count
+        count = compute()
+        self._cache[key] = count
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return count
+
+    def count_text(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is None:
+            return math.ceil(len(text) / self.chars_per_token)
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        return self._cached(
+            f"text:{digest}",
+            lambda: len(self._encoding.encode(text, disallowed_special=())),
+        )
+
+    def count_message(self, message: AnyMessage) -> int:
+        def compute() -> int:
+            content = message.content
+            if not isinstance(content, str):
+                content = json.dumps(content, ensure_ascii=False, default=str)
+            count = _MESSAGE_OVERHEAD_TOKENS + self.count_text(content)
+            tool_calls = getattr(message, "tool_calls", None)
+            if tool_calls:
+                count += self.count_text(
+                    json.dumps(tool_calls, ensure_ascii=False, default=str)
+                )
+            return count
+
+        if message.id:
+            return self._cached(f"message:{message.id}", compute)
+        return compute()
+
+    def count_tool(self, tool: Any) -> int:
+        if isinstance(tool, dict):
+            schema = tool
+        else:
+            schema = {
+                "name": getattr(tool, "name", ""),
+                "description": getattr(tool, "description", ""),
+                "args": getattr(tool, "args", {}),
+            }
+        return self.count_text(json.dumps(schema, ensure_ascii=False, default=str))
+
+
+@dataclass
+class BudgetResult:
+    messages: list[AnyMessage]
+    data_sources: list[Any]
+    trimmed_messages: int = 0
+    truncated_sources: list[str] = field(default_factory=list)
+    fits: bool = True
+
+
+@lru_cache(maxsize=1)
+def get_token_counter() -> TokenCounter:
+    """Return the process-wide counter configured from ``TOKEN_BUDGET``."""
+    config = get_token_budget_settings()
+    return TokenCounter(
+        chars_per_token=config.CHARS_PER_TOKEN,
+        encoding_name=config.TOKENIZER_ENCODING,
+    )
+
+
+def reserved_output_tokens(
+    model_info: ModelInfo,
+    budget_config: TokenBudgetConfig,
+    max_tokens: int | None = None,
+) -> int:
+    """Output tokens kept free for the answer.
+
+    ``max_tokens`` is the limit sent with the model call. Backends such as
+    vLLM and OpenAI reject calls whose prompt plus ``max_tokens`` exceeds the
+    context window, so all of it is reserved. Without one,
+    ``RESERVED_OUTPUT_TOKENS`` capped by the model's output limit is kept.
+    """
+    if max_tokens is not None:
+        return max_tokens
+    reserved = budget_config.RESERVED_OUTPUT_TOKENS
+    if model_info.max_output_tokens:
+        reserved = min(reserved, model_info.max_output_tokens)
+    return reserved
+
+
+def _source_content(source: Any) -> str:
+    if isinstance(source, str):
+        return source
+    if isinstance(source, dict):
+        return str(source.get("content") or "")
+    return ""
+
+
+def _source_title(source: Any, index: int) -> str:
+    if isinstance(source, dict) and source.get("title"):
+        return str(source["title"])
+    return f"Document {index}"
+
+
+def _with_content(source: Any, content: str) -> Any:
+    if isinstance(source, dict):
+        return {**source, "content": content}
+    return content
+
+
+def _truncate_data_sources(
+    data_sources: list[Any], limit: int, counter: TokenCounter
+) -> tuple[list[Any], list[str]]:
+    """Shrink data sources to ``limit`` tokens, sharing the budget fairly.
+
+    Small documents are kept whole; the remaining budget is split evenly
+    between the larger ones, which are cut at a character boundary and
+    marked as truncated.
+    """
+    counts = [counter.count_text(_source_content(source)) for source in data_sources]
+    allowance: dict[int, int] = {}
+    remaining = max(limit, 0)
+    pending = sorted(range(len(data_sources)), key=lambda i: counts[i])
+    while pending:
+        share = remaining // len(pending)
+        index = pending[0]
+        if counts[index] > share:
+            for index in pending:
+                allowance[index] = share
+            break
+        allowance[index] = counts[index]
+        remaining -= counts[index]
+        pending.pop(0)
+
+    truncated: list[Any] = []
+    truncated_titles: list[str] = []
+    for index, source in enumerate(data_sources):
+        content = _source_content(source)
+        if counts[index] <= allowance[index]:
+            truncated.append(source)
+            continue
+        marker_tokens = counter.count_text(TRUNCATION_MARKER)
+        keep_tokens = max(allowance[index] - marker_tokens, 0)
+        keep_chars = int(len(content) * keep_tokens / counts[index])
+        shown = content[:keep_chars]
+        truncated.append(
+            _with_content(
+                source,
+                shown + TRUNCATION_MARKER.format(shown=len(shown), total=len(content)),
+            )
+        )
+        truncated_titles.append(_source_title(source, index + 1))
+    return truncated, truncated_titles
+
+
+def _turn_starts(messages: list[AnyMessage]) -> list[int]:
+    starts = [
+        i for i, message in enumerate(messages) if isinstance(message, HumanMessage)
+    ]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    return starts
+
+
+def fit_to_budget(
+    *,
+    messages: list[AnyMessage],
+    data_sources: list[Any],
+    fixed_tokens: int,
+    max_input_tokens: int,
+    reserved_tokens: int,
+    budget_config: TokenBudgetConfig,
+    counter: TokenCounter,
+) -> BudgetResult:
+    """Fit history and data sources into the input window.
+
+    ``fixed_tokens`` covers the parts outside ``messages`` that are never
+    shortened (the request's system message and tool schemas). System
+    messages inside ``messages``, e.g. an assistant's instructions sent by
+    the client, are kept as well and counted like fixed tokens. Data sources
+    are truncated first, down to ``DATA_SOURCE_SHARE`` of the available
+    space; if that is not enough the oldest conversation turns are dropped.
+    The latest user turn is always kept.
+    """
+    system_messages = [m for m in messages if isinstance(m, SystemMessage)]
+    history = [m for m in messages if not isinstance(m, SystemMessage)]
+    available = (
+        max_input_tokens
+        - reserved_tokens
+        - budget_config.SAFETY_MARGIN_TOKENS
+        - fixed_tokens
+        - sum(counter.count_message(message) for message in system_messages)
+    )
+    history_tokens = [counter.count_message(message) for message in history]
+    source_tokens = sum(
+        counter.count_text(_source_content(source)) for source in data_sources
+    )
+    history_total = sum(history_tokens)
+
+    if history_total + source_tokens <= available:
+        return BudgetResult(messages=messages, data_sources=data_sources)
+
+    result = BudgetResult(messages=messages, data_sources=data_sources)
+    if data_sources:
+        source_limit = max(
+            available - history_total,
+            int(available * budget_config.DATA_SOURCE_SHARE),
+        )
+        if source_tokens > source_limit:
+            result.data_sources, result.truncated_sources = _truncate_data_sources(
+                data_sources, source_limit, counter
+            )
+            source_tokens = sum(
+                counter.count_text(_source_content(source))
+                for source in result.data_sources
+            )
+
+    starts = _turn_starts(history)
+    protected_start = starts[-1]
+    cut = 0
+    for next_start in starts[1:]:
+        if history_total + source_tokens <= available or cut >= protected_start:
+            break
+        history_total -= sum(history_tokens[cut:next_start])
+        cut = next_start
+    if cut:
+        dropped = {id(message) for message in history[:cut]}
+        result.messages = [m for m in messages if id(m) not in dropped]
+    result.trimmed_messages = cut
+    result.fits = history_total + source_tokens <= available
+    return result
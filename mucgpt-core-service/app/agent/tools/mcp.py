@@ -10,6 +10,7 @@ from langchain_mcp_adapters.sessions import (
 from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
 from mcp import ClientSession
 from mcp.types import Tool as MCPTool
+from pydantic import ValidationError
 from redis.asyncio import Redis
 from redis.exceptions import LockError
 
@@ -17,6 +18,7 @@ from config.settings import MCPSourceConfig, MCPTransport, get_mcp_settings
 from core.auth_models import AuthenticationResult
 from core.cache import RedisCache
 from core.logtools import getLogger
+from core.tiered_cache import TieredCache
 
 # Mirrors langchain_mcp_adapters.tools.MAX_ITERATIONS: a safety bound on paginated
 # tools/list calls, not a real-world limit any MCP server is expected to hit.
@@ -31,8 +33,9 @@ class McpLoader:
     # simply never read - a clean cache miss - instead of reaching _wrap_raw_tools
     # with the wrong shape and crashing on the first read after a deploy. If this
     # cache's stored shape ever changes again, bump this suffix again rather than
-    # reusing a prefix that may already hold a different payload shape.
-    _CACHE_PREFIX = "mcp_tools_raw"
+    # reusing a prefix that may already hold a different payload shape. "_v2" stores
+    # the tools as JSON dicts (see _dump_raw_tools) instead of MCPTool objects.
+    _CACHE_PREFIX = "mcp_tools_raw_v2"
     _logger = getLogger(name="mucgpt-core-mcp-loader")
     _mcp_settings = get_mcp_settings()
 
@@ -55,8 +58,8 @@ class McpLoader:
         a LangChain `BaseTool` object is not inert metadata. Each tool's invocation closure
         holds a live reference to its full MCP connection dict — including any decrypted
         secret header values and a per-user bearer-auth object. Earlier versions of this
-        loader cached those whole `BaseTool` objects via `RedisCache`, which serializes with
-        `cloudpickle` (see core/cache.py). Unlike `json`, `cloudpickle` happily serializes
+        loader cached those whole `BaseTool` objects via `RedisCache`, which serialized with
+        `cloudpickle` at the time. Unlike `json`, `cloudpickle` happily serializes
         arbitrary Python object graphs, closures and all — so credentials were being written
         into Redis without a single line of this file ever mentioning `secret_value`. The
         result: anyone with read access to that Redis instance could recover live, working
@@ -68,7 +71,7 @@ class McpLoader:
         """
         sources = McpLoader._mcp_settings.SOURCES
         McpLoader._logger.info(
-            f"Configured MCP sources: {list(sources.keys()) if sources else []}"
+            "Configured MCP sources: %s", list(sources.keys()) if sources else []
         )
 
         if not sources:
@@ -88,12 +91,17 @@ class McpLoader:
         )
 
         async def cached_or_none() -> list[BaseTool] | None:
-            raw_dump: dict[str, list[MCPTool]] | None = await RedisCache.get_object(
-                cache_key
+            raw_dump: dict[str, list[dict]] | None = await TieredCache.get(
+                cache_key, namespace="mcp_tools"
             )
             if raw_dump is None:
                 return None
-            return McpLoader._wrap_raw_tools(raw_dump, user_info, sources)
+            try:
+                raw_by_source = McpLoader._load_raw_tools(raw_dump)
+            except ValidationError:
+                McpLoader._logger.warning("Ignoring malformed MCP tools cache entry")
+                return None
+            return McpLoader._wrap_raw_tools(raw_by_source, user_info, sources)
 
         if not effective_force:
             cached = await cached_or_none()
@@ -114,8 +122,9 @@ class McpLoader:
                 # API keys in the query string, and logging the full URL would open
                 # a second place for that secret to leak besides Redis.
                 McpLoader._logger.info(
-                    f"Configuring MCP connection for source '{source_id}' "
-                    f"with transport '{source_cfg.transport}'"
+                    "Configuring MCP connection for source '%s' with transport '%s'",
+                    source_id,
+                    source_cfg.transport,
                 )
 
                 con = McpLoader._build_connection(source_id, source_cfg, user_info)
@@ -135,22 +144,22 @@ class McpLoader:
 
                     raw_by_source[source_id] = raw_tools
                     McpLoader._logger.info(
-                        f"Retrieved MCP tools from '{source_id}': {len(raw_tools)}"
+                        "Retrieved MCP tools from '%s': %s", source_id, len(raw_tools)
                     )
                 except Exception as e:
                     McpLoader._logger.error(
-                        f"Exception while fetching MCP tools from '{source_id}'",
+                        "Exception while fetching MCP tools from '%s'",
+                        source_id,
                         exc_info=e,
                     )
                     failed_sources.add(source_id)
 
             return raw_by_source, failed_sources
 
-        redis: Redis = await RedisCache.get_redis()
         lock_name = f"{cache_key}:lock"
-        lock = redis.lock(name=lock_name, timeout=60, blocking_timeout=10)
-
         try:
+            redis: Redis = await RedisCache.get_redis()
+            lock = redis.lock(name=lock_name, timeout=60, blocking_timeout=10)
             async with lock:
                 McpLoader._logger.info("Acquired MCP tools lock")
 
@@ -172,9 +181,9 @@ class McpLoader:
                             sorted(list(failed_sources)),
                             short_ttl,
                         )
-                        await RedisCache.set_object(
+                        await TieredCache.set(
                             key=cache_key,
-                            obj=raw_by_source,
+                            obj=McpLoader._dump_raw_tools(raw_by_source),
                             ttl=short_ttl,
                         )
                     else:
@@ -185,9 +194,9 @@ class McpLoader:
                     return McpLoader._wrap_raw_tools(raw_by_source, user_info, sources)
 
                 # Healthy load: cache with full TTL
-                await RedisCache.set_object(
+                await TieredCache.set(
                     key=cache_key,
-                    obj=raw_by_source,
+                    obj=McpLoader._dump_raw_tools(raw_by_source),
                     ttl=McpLoader._mcp_settings.CACHE_TTL,
                 )
                 return McpLoader._wrap_raw_tools(raw_by_source, user_info, sources)
@@ -211,6 +220,12 @@ class McpLoader:
             )
             raw_by_source, _failed = await fetch_all_tools()
             return McpLoader._wrap_raw_tools(raw_by_source, user_info, sources)
+        except RedisCache.UNAVAILABLE_ERRORS:
+            McpLoader._logger.warning(
+                "Redis unavailable; performing uncached MCP tool load", exc_info=True
+            )
+            raw_by_source, _failed = await fetch_all_tools()
+            return McpLoader._wrap_raw_tools(raw_by_source, user_info, sources)
         except Exception as e:
             McpLoader._logger.error(
                 "Failed to acquire/use MCP tools lock",
@@ -274,8 +289,9 @@ class McpLoader:
             )
         else:
             McpLoader._logger.error(
-                f"Unsupported transport protocol {source_cfg.transport} "
-                f"for MCP source {source_id}"
+                "Unsupported transport protocol %s for MCP source %s",
+                source_cfg.transport,
+                source_id,
             )
             return None
 
@@ -305,7 +321,7 @@ class McpLoader:
 
         header_names = sorted(con["headers"].keys())
         McpLoader._logger.info(
-            f"Header names configured for source '{source_id}': {header_names}"
+            "Header names configured for source '%s': %s", source_id, header_names
         )
 
         return con
@@ -351,6 +367,22 @@ class McpLoader:
 
         wrapped_tool.metadata = metadata
 
+    @staticmethod
+    def _dump_raw_tools(
+        raw_by_source: dict[str, list[MCPTool]],
+    ) -> dict[str, list[dict]]:
+        return {
+            source_id: [tool.model_dump(mode="json") for tool in raw_tools]
+            for source_id, raw_tools in raw_by_source.items()
+        }
+
+    @staticmethod
+    def _load_raw_tools(raw_dump: dict[str, list]) -> dict[str, list[MCPTool]]:
+        return {
+            source_id: [MCPTool.model_validate(tool) for tool in raw_tools]
+            for source_id, raw_tools in raw_dump.items()
+        }
+
     @staticmethod
     def _wrap_raw_tools(
         raw_by_source: dict[str, list[MCPTool]],
@@ -368,7 +400,8 @@ class McpLoader:
             source_cfg = sources.get(source_id)
             if source_cfg is None:
                 McpLoader._logger.warning(
-                    f"Cached MCP source '{source_id}' is no longer configured; skipping"
+                    "Cached MCP source '%s' is no longer configured; skipping",
+                    source_id,
                 )
                 continue
 
@@ -390,7 +423,9 @@ class McpLoader:
                     tools.append(wrapped_tool)
                 except Exception as e:
                     McpLoader._logger.error(
-                        f"Failed to wrap cached MCP tool '{raw_tool.name}' from '{source_id}'",
+                        "Failed to wrap cached MCP tool '%s' from '%s'",
+                        raw_tool.name,
+                        source_id,
                         exc_info=e,
                     )
 
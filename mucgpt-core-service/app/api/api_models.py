@@ -78,7 +78,13 @@ class ChatCompletionRequest(BaseModel):
         None,
         description="Creativity level: 'low' (conservative), 'medium' (balanced), 'high' (creative)",
     )
-    max_tokens: int | None = Field(4096, description="Maximum tokens to generate")
+    max_tokens: int | None = Field(
+        None,
+        description="Maximum tokens to generate, capped at the model's max_output_tokens; defaults to that limit",
+    )
+    stop: str | list[str] | None = Field(
+        None, description="Sequence(s) at which the model stops generating"
+    )
     stream: bool | None = Field(
         False, description="Whether to stream partial responses back"
     )
@@ -90,7 +96,17 @@ class ChatCompletionRequest(BaseModel):
     )
     conversation_id: str | None = Field(
         None,
-        description="Stable client-generated id for this conversation. Accepted but not yet used server-side.",
+        description="Stable client-generated id for this conversation. Used to key the server-side conversation history.",
+    )
+    history_version: str | None = Field(
+        None,
+        description=(
+            "Hex SHA-256 digest of the messages of this conversation already stored "
+            "server-side, computed over the UTF-8 JSON array `[role, content]` of each "
+            "message in order. When set, `messages` only contains the new messages and "
+            "the rest of the history (and `data_sources`, if omitted) is restored from "
+            "the server. Answered with 409 if the stored history does not match."
+        ),
     )
     data_sources: list[ChatDataSource] | None = Field(
         None,
@@ -350,6 +366,41 @@ class AssistantDraftResult(BaseModel):
     title: str = Field(..., description="Generated title for the assistant.")
 
 
+AssistantDraftPart = Literal["system_prompt", "description", "title"]
+
+
+class AssistantDraftStreamEvent(BaseModel):
+    """Server-sent event emitted by the streaming assistant draft endpoint.
+
+    ``delta`` events carry incremental system prompt tokens, ``part`` events
+    carry a completed draft part, ``done`` carries the full draft and
+    ``error`` carries a user-facing error message.
+    """
+
+    type: Literal["delta", "part", "done", "error"] = Field(
+        ..., description="Event type."
+    )
+    part: AssistantDraftPart | None = Field(
+        None, description="Draft part this event belongs to."
+    )
+    content: str | None = Field(
+        None, description="Token delta, completed part text or error message."
+    )
+    draft: AssistantDraftResult | None = Field(
+        None, description="The complete draft, sent with the final done event."
+    )
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "type": "part",
+                "part": "title",
+                "content": "Protokoll-Assistent",
+                "draft": None,
+            }
+        }
+    )
+
+
 ComplianceCategoryId = Literal[
     "migration_asylum_border",
     "public_services_access",
@@ -497,3 +548,47 @@ class ConfigResponse(BaseModel):
         None,
         description="Base URL of the ad2image service for Gravatar-compatible avatar images.",
     )
+
+
+class ParseBatchResult(BaseModel):
+    """One NDJSON line of the ``/v1/parse/batch`` response."""
+
+    index: int = Field(description="Position of the file in the request")
+    filename: str | None = Field(None, description="Name of the uploaded file")
+    content: str | None = Field(
+        None, description="Extracted text content, if parsing succeeded"
+    )
+    status_code: int | None = Field(
+        None, description="HTTP status code describing the failure, if any"
+    )
+    error: str | None = Field(None, description="Error message, if parsing failed")
+
+
+class ParsedChunk(BaseModel):
+    """One token-bounded chunk of a structured ``/v1/parse`` response."""
+
+    index: int = Field(description="Position of the chunk in the document")
+    content: str = Field(description="Text of the chunk")
+    start: int = Field(description="Start offset of the chunk in `content`")
+    end: int = Field(description="End offset (exclusive) of the chunk in `content`")
+    tokens: int = Field(description="Approximate number of tokens in the chunk")
+    heading: str | None = Field(
+        None, description="Closest preceding section heading, if any"
+    )
+    page_start: int | None = Field(
+        None, description="Page the chunk starts on, if the parser reports pages"
+    )
+    page_end: int | None = Field(
+        None, description="Page the chunk ends on, if the parser reports pages"
+    )
+
+
+class ParsedDocumentResponse(BaseModel):
+    """Structured ``/v1/parse`` response, returned for ``structured=true``."""
+
+    filename: str | None = Field(None, description="Name of the uploaded file")
+    content: str = Field(description="Full extracted text content")
+    total_tokens: int = Field(description="Sum of the chunk token counts")
+    chunks: list[ParsedChunk] = Field(
+        default_factory=list, description="Retrieval-sized parts of the content"
+    )
@@ -1,22 +1,30 @@
+import asyncio
 import json
+from collections.abc import AsyncIterator
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
 from api.api_models import (
+    ChatCompletionMessage,
     ChatCompletionRequest,
     ChatCompletionResponse,
 )
 from api.exception import llm_exception_handler
+from config.langfuse_provider import sample_trace
 from config.model_provider import ModelRegistry, ModelsConfigurationException
 from config.settings import get_settings
 from core.auth import authenticate_user
 from core.auth_models import AuthenticationResult
+from core.conversation_store import ConversationStore, StoredConversation
+from core.disconnect import DisconnectGuard, needs_disconnect_guard
 from core.logtools import getLogger
+from core.metrics import Metrics
 from init_app import init_agent
 
 logger = getLogger()
-router = APIRouter(prefix="/v1")
+router = APIRouter(prefix="/v1", dependencies=[Depends(sample_trace)])
 
 
 def get_temperature_from_request(request: ChatCompletionRequest) -> float:
@@ -42,13 +50,15 @@ def get_temperature_from_request(request: ChatCompletionRequest) -> float:
                 return model_config.get_temperature_for_creativity(request.creativity)
             except ValueError:
                 logger.warning(
-                    f"Invalid creativity level '{request.creativity}', using default 'medium'"
+                    "Invalid creativity level '%s', using default 'medium'",
+                    request.creativity,
                 )
                 return model_config.get_temperature_for_creativity("medium")
         else:
             # Model not found, use default mapping
             logger.warning(
-                f"Model '{request.model}' not found in configuration, using default temperature mapping"
+                "Model '%s' not found in configuration, using default temperature mapping",
+                request.model,
             )
             default_temps = {
                 "low": 0.0,
@@ -65,6 +75,66 @@ def get_temperature_from_request(request: ChatCompletionRequest) -> float:
     return 0.5
 
 
+async def resolve_conversation_history(
+    request: ChatCompletionRequest,
+    user_info: AuthenticationResult,
+) -> tuple[list[ChatCompletionMessage], list[dict[str, Any]] | None]:
+    """Return the full message history and data sources for a request.
+
+    Full-history requests are returned unchanged. Incremental requests
+    (``history_version`` set) are prefixed with the history stored for
+    ``conversation_id``; a missing or diverged history is answered with 409
+    so the client can resend the full history.
+    """
+    data_sources = (
+        [source.model_dump() for source in request.data_sources]
+        if request.data_sources
+        else None
+    )
+    if request.history_version is None:
+        return request.messages, data_sources
+
+    stored = None
+    if request.conversation_id and ConversationStore.is_enabled():
+        stored = await ConversationStore.load(
+            user_info.user_id, request.conversation_id
+        )
+    if stored is None or stored.version != request.history_version:
+        raise HTTPException(
+            status_code=409,
+            detail="Stored conversation history is unavailable or out of date; resend the full history.",
+        )
+
+    history = [ChatCompletionMessage.model_construct(**m) for m in stored.messages]
+    if data_sources is None:
+        data_sources = stored.data_sources
+    return history + request.messages, data_sources
+
+
+async def store_conversation_history(
+    request: ChatCompletionRequest,
+    user_info: AuthenticationResult,
+    messages: list[ChatCompletionMessage],
+    data_sources: list[dict[str, Any]] | None,
+    answer: str,
+) -> None:
+    """Persist the history including ``answer`` for the next incremental request."""
+    if not request.conversation_id or not ConversationStore.is_enabled():
+        return
+    await ConversationStore.save(
+        user_info.user_id,
+        request.conversation_id,
+        StoredConversation(
+            messages=[
+                {"role": message.role, "content": message.content}
+                for message in messages
+            ]
+            + [{"role": "assistant", "content": answer}],
+            data_sources=data_sources,
+        ),
+    )
+
+
 @router.post(
     "/chat/completions",
     summary="Create chat completion",
@@ -77,6 +147,7 @@ def get_temperature_from_request(request: ChatCompletionRequest) -> float:
 )
 async def chat_completions(
     request: ChatCompletionRequest,
+    http_request: Request,
     user_info: AuthenticationResult = Depends(authenticate_user),
 ) -> StreamingResponse | ChatCompletionResponse:
     """
@@ -96,7 +167,11 @@ async def chat_completions(
                 status_code = 500
             raise HTTPException(status_code=status_code, detail=detail) from exc
 
-        ae = await init_agent(user_info=user_info, model_name=request.model)
+        ae = await init_agent(
+            user_info=user_info,
+            model_name=request.model,
+            conversation_id=request.conversation_id,
+        )
         if request.conversation_id:
             logger.debug(
                 "Received conversation_id=%s",
@@ -110,15 +185,12 @@ async def chat_completions(
         # Use enabled_tools from request if provided, otherwise use no tool
         enabled_tools = request.enabled_tools or []
 
-        # Structured data sources for request context
-        data_sources = (
-            [source.model_dump() for source in request.data_sources]
-            if request.data_sources
-            else None
-        )
+        # Full history and structured data sources for request context
+        messages, data_sources = await resolve_conversation_history(request, user_info)
+        stop = [request.stop] if isinstance(request.stop, str) else request.stop
         if request.stream:
             gen = ae.run_with_streaming(
-                messages=request.messages,
+                messages=messages,
                 temperature=temperature,
                 model=request.model,
                 user_info=user_info,
@@ -126,16 +198,54 @@ async def chat_completions(
                 assistant_id=request.assistant_id,
                 data_sources=data_sources,
                 conversation_id=request.conversation_id,
+                max_tokens=request.max_tokens,
+                stop=stop,
+            )
+
+            guard = (
+                DisconnectGuard(http_request.receive)
+                if needs_disconnect_guard(http_request.scope)
+                else None
             )
 
-            async def sse_generator():
-                async for chunk in gen:
-                    yield f"data: {json.dumps(chunk)}\n\n"
+            async def sse_generator() -> AsyncIterator[str]:
+                answer_parts: list[str] = []
+                finish_reason = None
+                chunks = guard.iterate(gen) if guard is not None else gen
+                try:
+                    async for chunk in chunks:
+                        choice = chunk["choices"][0] if chunk.get("choices") else {}
+                        content = (choice.get("delta") or {}).get("content")
+                        if isinstance(content, str):
+                            answer_parts.append(content)
+                        finish_reason = choice.get("finish_reason") or finish_reason
+                        yield f"data: {json.dumps(chunk)}\n\n"
+                except (asyncio.CancelledError, GeneratorExit):
+                    # Starlette cancels the body on disconnect.
+                    finish_reason = finish_reason or "cancelled"
+                    raise
+                finally:
+                    if guard is not None and guard.disconnected:
+                        finish_reason = finish_reason or "cancelled"
+                    if finish_reason == "cancelled":
+                        logger.info("Client disconnected; cancelled chat stream")
+                    Metrics.inc(
+                        "mucgpt_chat_streams_total",
+                        outcome=finish_reason or "incomplete",
+                    )
+                if finish_reason == "stop":
+                    await store_conversation_history(
+                        request,
+                        user_info,
+                        messages,
+                        data_sources,
+                        "".join(answer_parts),
+                    )
 
             return StreamingResponse(sse_generator(), media_type="text/event-stream")
         else:
-            return await ae.run_without_streaming(
-                messages=request.messages,
+            response = await ae.run_without_streaming(
+                messages=messages,
                 temperature=temperature,
                 model=request.model,
                 user_info=user_info,
@@ -143,7 +253,19 @@ async def chat_completions(
                 assistant_id=request.assistant_id,
                 data_sources=data_sources,
                 conversation_id=request.conversation_id,
+                max_tokens=request.max_tokens,
+                stop=stop,
             )
+            if request.conversation_id and ConversationStore.is_enabled():
+                completion = ChatCompletionResponse.model_validate(response)
+                await store_conversation_history(
+                    request,
+                    user_info,
+                    messages,
+                    data_sources,
+                    completion.choices[0].message.content,
+                )
+            return response
     except HTTPException:
         raise
     except Exception as e:
@@ -17,6 +17,7 @@ from api.api_models import (
     ComplianceCheckResponse,
     ComplianceStatus,
 )
+from config.langfuse_provider import sample_trace
 from config.settings import InternalTaskModelStrength, get_settings
 from core.auth import authenticate_user
 from core.auth_models import AuthenticationResult
@@ -28,9 +29,10 @@ from core.llm_helpers import (
     read_prompt_file,
 )
 from core.logtools import getLogger
+from core.tiered_cache import TieredCache
 
 logger = getLogger()
-router = APIRouter(prefix="/v1")
+router = APIRouter(prefix="/v1", dependencies=[Depends(sample_trace)])
 
 _COMPLIANCE_CACHE_KEY_PREFIX = "mucgpt:assistant-compliance:v1:"
 
@@ -62,10 +64,12 @@ async def _cache_compliance_result(result: ComplianceCheckResponse) -> None:
         return
     try:
         await RedisCache.init_redis()
-        await RedisCache.set_object(
+        # Published so that assistant service replicas drop older verdicts.
+        await TieredCache.set(
             _build_compliance_cache_key(result.prompt_hash),
-            result.model_dump(),
+            result.model_dump(mode="json"),
             ttl=settings.COMPLIANCE_CACHE_TTL_SECONDS,
+            local_ttl=0,
         )
     except Exception:
         logger.warning(
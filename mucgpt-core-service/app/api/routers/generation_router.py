@@ -1,16 +1,21 @@
 import asyncio
+from collections.abc import AsyncIterator, Callable
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from langfuse import observe
 
 from api.api_models import (
+    AssistantDraftPart,
     AssistantDraftRequest,
     AssistantDraftResult,
+    AssistantDraftStreamEvent,
     ChatCompletionMessage,
     ChatTitleRequest,
     ChatTitleResult,
 )
 from api.exception import llm_exception_handler
+from config.langfuse_provider import sample_trace
 from config.settings import InternalTaskModelStrength, get_settings
 from core.auth import authenticate_user
 from core.auth_models import AuthenticationResult
@@ -19,11 +24,34 @@ from core.llm_helpers import (
     get_internal_task_model,
     invoke_internal_generation,
     read_prompt_file,
+    stream_internal_generation,
 )
 from core.logtools import getLogger
 
 logger = getLogger()
-router = APIRouter(prefix="/v1")
+router = APIRouter(prefix="/v1", dependencies=[Depends(sample_trace)])
+
+_ASSISTANT_DRAFT_PROMPTS: tuple[tuple[AssistantDraftPart, str], ...] = (
+    ("system_prompt", "prompt_for_systemprompt.md"),
+    ("description", "prompt_for_description_from_seed.md"),
+    ("title", "prompt_for_title_from_seed.md"),
+)
+
+
+def _assistant_draft_messages(
+    prompt_filename: str, prompt_seed: str
+) -> list[ChatCompletionMessage]:
+    return [
+        ChatCompletionMessage(
+            role="system",
+            content=read_prompt_file(GENERATION_PROMPTS_DIR, prompt_filename),
+        ),
+        ChatCompletionMessage(role="user", content="Funktion: " + prompt_seed),
+    ]
+
+
+def _assistant_draft_run_name(part: AssistantDraftPart) -> str:
+    return "assistant-draft-" + part.replace("_", "-")
 
 
 @observe(
@@ -55,6 +83,40 @@ async def _invoke_assistant_draft_part(
     )
 
 
+@observe(
+    name="assistant-draft-part-generation",
+    capture_input=False,
+    capture_output=False,
+)
+async def _stream_assistant_draft_part(
+    *,
+    model_name: str,
+    temperature: float,
+    messages: list[ChatCompletionMessage],
+    user_info: AuthenticationResult,
+    trace_tags: list[str],
+    run_name: str,
+    on_delta: Callable[[str], None],
+) -> str:
+    """Trace wrapper for a streamed assistant-draft sub-generation.
+
+    Forwards every token delta to ``on_delta`` and returns the full text.
+    """
+
+    chunks: list[str] = []
+    async for delta in stream_internal_generation(
+        model_name=model_name,
+        temperature=temperature,
+        messages=messages,
+        user_info=user_info,
+        trace_tags=trace_tags,
+        run_name=run_name,
+    ):
+        chunks.append(delta)
+        on_delta(delta)
+    return "".join(chunks)
+
+
 def _normalize_chat_title(value: str) -> str:
     """Normalize a generated chat title to a short, readable form.
 
@@ -102,54 +164,21 @@ async def generate_assistant_draft(
 
     try:
         model_name = get_internal_task_model(settings, InternalTaskModelStrength.STRONG)
-        logger.info("assistant-draft: reading prompt templates")
-        system_prompt_system = read_prompt_file(
-            GENERATION_PROMPTS_DIR, "prompt_for_systemprompt.md"
-        )
-        description_system = read_prompt_file(
-            GENERATION_PROMPTS_DIR, "prompt_for_description_from_seed.md"
-        )
-        title_system = read_prompt_file(
-            GENERATION_PROMPTS_DIR, "prompt_for_title_from_seed.md"
-        )
-
-        base_user_content = "Funktion: " + request.prompt_seed
-
         logger.info("assistant-draft: running llm calls in parallel")
         generated_system_prompt, description, title = await asyncio.gather(
-            _invoke_assistant_draft_part(
-                model_name=model_name,
-                temperature=1.0,
-                messages=[
-                    ChatCompletionMessage(role="system", content=system_prompt_system),
-                    ChatCompletionMessage(role="user", content=base_user_content),
-                ],
-                user_info=user_info,
-                trace_tags=["assistant-draft", "system-prompt"],
-                run_name="assistant-draft-system-prompt",
-            ),
-            _invoke_assistant_draft_part(
-                model_name=model_name,
-                temperature=1.0,
-                messages=[
-                    ChatCompletionMessage(role="system", content=description_system),
-                    ChatCompletionMessage(role="user", content=base_user_content),
-                ],
-                user_info=user_info,
-                trace_tags=["assistant-draft", "description"],
-                run_name="assistant-draft-description",
-            ),
-            _invoke_assistant_draft_part(
-                model_name=model_name,
-                temperature=1.0,
-                messages=[
-                    ChatCompletionMessage(role="system", content=title_system),
-                    ChatCompletionMessage(role="user", content=base_user_content),
-                ],
-                user_info=user_info,
-                trace_tags=["assistant-draft", "title"],
-                run_name="assistant-draft-title",
-            ),
+            *(
+                _invoke_assistant_draft_part(
+                    model_name=model_name,
+                    temperature=1.0,
+                    messages=_assistant_draft_messages(
+                        prompt_filename, request.prompt_seed
+                    ),
+                    user_info=user_info,
+                    trace_tags=["assistant-draft", part.replace("_", "-")],
+                    run_name=_assistant_draft_run_name(part),
+                )
+                for part, prompt_filename in _ASSISTANT_DRAFT_PROMPTS
+            )
         )
 
         logger.info("assistant-draft: returning finished draft")
@@ -164,6 +193,122 @@ async def generate_assistant_draft(
         raise HTTPException(status_code=500, detail=msg)
 
 
+def _sse(event: AssistantDraftStreamEvent) -> str:
+    return f"data: {event.model_dump_json()}\n\n"
+
+
+@observe(
+    name="assistant-draft-stream-generation", capture_input=False, capture_output=False
+)
+async def _assistant_draft_events(
+    *,
+    prompt_seed: str,
+    model_name: str,
+    user_info: AuthenticationResult,
+) -> AsyncIterator[str]:
+    """Run the three draft generations concurrently and yield SSE events.
+
+    The system prompt is streamed token by token; description and title are
+    emitted as soon as each of them completes. Pending generations are
+    cancelled when the client goes away or one of the parts fails.
+    """
+
+    queue: asyncio.Queue[AssistantDraftStreamEvent] = asyncio.Queue()
+
+    async def run_part(part: AssistantDraftPart, prompt_filename: str) -> None:
+        part_kwargs = {
+            "model_name": model_name,
+            "temperature": 1.0,
+            "messages": _assistant_draft_messages(prompt_filename, prompt_seed),
+            "user_info": user_info,
+            "trace_tags": ["assistant-draft", part.replace("_", "-")],
+            "run_name": _assistant_draft_run_name(part),
+        }
+        try:
+            if part == "system_prompt":
+                content = await _stream_assistant_draft_part(
+                    **part_kwargs,
+                    on_delta=lambda delta: queue.put_nowait(
+                        AssistantDraftStreamEvent(
+                            type="delta", part=part, content=delta
+                        )
+                    ),
+                )
+            else:
+                content = await _invoke_assistant_draft_part(**part_kwargs)
+        except Exception as e:
+            logger.exception("Exception in /generations/assistant-draft/stream")
+            msg = llm_exception_handler(ex=e, logger=logger)
+            queue.put_nowait(
+                AssistantDraftStreamEvent(type="error", part=part, content=msg)
+            )
+            return
+        queue.put_nowait(
+            AssistantDraftStreamEvent(type="part", part=part, content=content)
+        )
+
+    tasks = [
+        asyncio.create_task(run_part(part, prompt_filename))
+        for part, prompt_filename in _ASSISTANT_DRAFT_PROMPTS
+    ]
+    results: dict[AssistantDraftPart, str] = {}
+    try:
+        while len(results) < len(tasks):
+            event = await queue.get()
+            yield _sse(event)
+            if event.type == "error":
+                return
+            if event.type == "part" and event.part is not None:
+                results[event.part] = event.content or ""
+
+        logger.info("assistant-draft: returning finished draft")
+        yield _sse(
+            AssistantDraftStreamEvent(
+                type="done",
+                draft=AssistantDraftResult(
+                    title=results["title"],
+                    description=results["description"],
+                    system_prompt=results["system_prompt"],
+                ),
+            )
+        )
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@router.post(
+    "/generations/assistant-draft/stream",
+    summary="Stream an assistant draft from a prompt seed",
+    description=(
+        "Streaming variant of `/generations/assistant-draft`. Emits server-sent events: "
+        "`delta` events with system prompt tokens as they are generated, a `part` event "
+        "for each completed part, and a final `done` event with the complete draft. "
+        "Failures are reported as an `error` event."
+    ),
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_assistant_draft(
+    request: AssistantDraftRequest,
+    user_info: AuthenticationResult = Depends(authenticate_user),
+) -> StreamingResponse:
+    """Stream a full assistant draft from a short prompt seed."""
+
+    model_name = get_internal_task_model(
+        get_settings(), InternalTaskModelStrength.STRONG
+    )
+    return StreamingResponse(
+        _assistant_draft_events(
+            prompt_seed=request.prompt_seed,
+            model_name=model_name,
+            user_info=user_info,
+        ),
+        media_type="text/event-stream",
+    )
+
+
 @router.post(
     "/generations/chat-title",
     summary="Generate a chat title from the last turn",
@@ -1,10 +1,24 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import asdict
+
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 
+from agent.token_budget import get_token_counter
+from api.api_models import ParseBatchResult, ParsedChunk, ParsedDocumentResponse
 from config.settings import ParserBackendType, get_settings
 from core.auth import authenticate_user
 from core.logtools import getLogger
-from parsing.base import ParserBackend
+from parsing.base import (
+    ParsedDocument,
+    ParserBackend,
+    UnsupportedFileTypeError,
+    UploadTooLargeError,
+)
+from parsing.cache import ParseCache
+from parsing.chunking import chunk_document
 from parsing.factory import get_parser
 
 logger = getLogger()
@@ -14,12 +28,70 @@ router = APIRouter(prefix="/v1")
 _parser: ParserBackend | None = get_parser()
 
 
+def _parser_http_exception(
+    exc: Exception, filename: str | None
+) -> HTTPException | None:
+    """Map a parser backend error to the HTTP error reported for ``filename``.
+
+    Returns ``None`` for unexpected errors, which are left to propagate.
+    """
+    if isinstance(exc, UploadTooLargeError):
+        logger.warning(str(exc))
+        return HTTPException(status_code=413, detail=str(exc))
+    if isinstance(exc, UnsupportedFileTypeError):
+        logger.warning(str(exc))
+        return HTTPException(status_code=415, detail=str(exc))
+    if isinstance(exc, httpx.TimeoutException):
+        logger.error(
+            "Timeout while parsing file '%s': %s",
+            filename,
+            exc,
+            exc_info=exc,
+        )
+        return HTTPException(
+            status_code=504,
+            detail=f"Parser service timed out while processing '{filename}'.",
+        )
+    if isinstance(exc, httpx.HTTPStatusError):
+        status_code = (
+            exc.response.status_code if exc.response is not None else "unknown"
+        )
+        response_text = exc.response.text if exc.response is not None else ""
+        logger.error(
+            "Parser backend HTTP error while parsing file '%s': status=%s body=%s",
+            filename,
+            status_code,
+            response_text,
+            exc_info=exc,
+        )
+        return HTTPException(
+            status_code=502,
+            detail=f"Parser service returned an error while processing '{filename}'.",
+        )
+    if isinstance(exc, httpx.ConnectError | httpx.NetworkError):
+        logger.error(
+            "Parser backend error while parsing file '%s': %s",
+            filename,
+            exc,
+            exc_info=exc,
+        )
+        return HTTPException(
+            status_code=502,
+            detail=f"Parser service returned an error while processing '{filename}'.",
+        )
+    return None
+
+
 @router.post(
     "/parse",
     summary="Upload and parse a file",
     description="Uploads a file, extracts its text content via the configured parser backend, and returns the parsed text directly.",
     responses={
-        200: {"description": "Parsed text content of the uploaded file"},
+        200: {
+            "description": "Parsed text content of the uploaded file, or a structured document for `structured=true`"
+        },
+        413: {"description": "Uploaded file exceeds the configured size limit"},
+        415: {"description": "File type is not supported by the parser backend"},
         502: {
             "description": "Parser service returned an error (connection error or non-2xx response)"
         },
@@ -29,7 +101,14 @@ _parser: ParserBackend | None = get_parser()
         504: {"description": "Parser service did not respond in time (timeout)"},
     },
 )
-async def parse_file(file: UploadFile, user_info=Depends(authenticate_user)) -> str:
+async def parse_file(
+    file: UploadFile,
+    structured: bool = Query(
+        False,
+        description="Return the content split into chunks with page numbers, headings, offsets and token counts.",
+    ),
+    user_info=Depends(authenticate_user),
+) -> str | ParsedDocumentResponse:
     """
     Parses a file using the configured backend and returns the extracted text content.
     """
@@ -37,42 +116,171 @@ async def parse_file(file: UploadFile, user_info=Depends(authenticate_user)) ->
         raise HTTPException(
             status_code=503, detail="Document processing is not enabled."
         )
-    logger.info(f"Parsing file '{file.filename}' ({file.size} bytes)")
+    logger.info("Parsing file '%s' (%s bytes)", file.filename, file.size)
+    cache_key = None
+    if ParseCache.is_enabled():
+        # Structured results keep page boundaries, which plain results drop.
+        backend = f"{_parser.name}:pages" if structured else _parser.name
+        cache_key = await ParseCache.build_key(file, backend=backend)
+        cached = await ParseCache.get_document(cache_key, upload_bytes=file.size)
+        if cached is not None:
+            logger.info("Returning cached parse result for '%s'", file.filename)
+            return _parse_response(file, cached, structured)
     try:
-        content = await _parser.parse(file)
-    except httpx.TimeoutException as exc:
-        logger.error(
-            f"Timeout while parsing file '{file.filename}': {exc}",
-            exc_info=True,
-        )
-        raise HTTPException(
-            status_code=504,
-            detail=f"Parser service timed out while processing '{file.filename}'.",
-        )
-    except httpx.HTTPStatusError as exc:
-        status_code = (
-            exc.response.status_code if exc.response is not None else "unknown"
-        )
-        response_text = exc.response.text if exc.response is not None else ""
-        logger.error(
-            "Parser backend HTTP error while parsing file '%s': status=%s body=%s",
-            file.filename,
-            status_code,
-            response_text,
-            exc_info=True,
-        )
+        if structured:
+            document = await _parser.parse_document(file)
+        else:
+            document = ParsedDocument(content=await _parser.parse(file))
+    except Exception as exc:
+        http_exc = _parser_http_exception(exc, file.filename)
+        if http_exc is None:
+            raise
+        raise http_exc
+    logger.info("Parsing of file '%s' finished", file.filename)
+    if cache_key is not None:
+        await ParseCache.set(cache_key, document.content, pages=document.pages)
+    return _parse_response(file, document, structured)
+
+
+def _parse_response(
+    file: UploadFile, document: ParsedDocument, structured: bool
+) -> str | ParsedDocumentResponse:
+    if not structured:
+        return document.content
+    chunks = chunk_document(
+        document,
+        max_tokens=get_settings().PARSE_CHUNK_MAX_TOKENS,
+        counter=get_token_counter(),
+    )
+    return ParsedDocumentResponse(
+        filename=file.filename,
+        content=document.content,
+        total_tokens=sum(chunk.tokens for chunk in chunks),
+        chunks=[ParsedChunk(**asdict(chunk)) for chunk in chunks],
+    )
+
+
+async def _parse_group(
+    group: list[UploadFile],
+) -> list[str | Exception]:
+    """Parse ``group`` in one backend call, isolating failures per file."""
+    try:
+        return list(await _parser.parse_batch(group))
+    except Exception as exc:
+        if len(group) == 1:
+            return [exc]
+    results: list[str | Exception] = []
+    for file in group:
+        try:
+            results.append(await _parser.parse(file))
+        except Exception as exc:
+            results.append(exc)
+    return results
+
+
+async def _parse_batch_results(
+    files: list[UploadFile],
+) -> AsyncIterator[str]:
+    """Yield one NDJSON line per uploaded file as soon as its result is known."""
+    batch_settings = get_settings()
+    use_cache = ParseCache.is_enabled()
+    keys = [await ParseCache.build_key(file, backend=_parser.name) for file in files]
+    indices_by_key: dict[str, list[int]] = {}
+    for index, key in enumerate(keys):
+        indices_by_key.setdefault(key, []).append(index)
+
+    def lines(key: str, result: str | Exception) -> Iterator[str]:
+        for index in indices_by_key[key]:
+            item = ParseBatchResult(index=index, filename=files[index].filename)
+            if isinstance(result, Exception):
+                http_exc = _parser_http_exception(result, files[index].filename)
+                if http_exc is None:
+                    logger.error(
+                        "Unexpected error while parsing file '%s'",
+                        files[index].filename,
+                        exc_info=result,
+                    )
+                    http_exc = HTTPException(
+                        status_code=500,
+                        detail=f"Failed to parse '{files[index].filename}'.",
+                    )
+                item.status_code = http_exc.status_code
+                item.error = http_exc.detail
+            else:
+                item.content = result
+            yield item.model_dump_json(exclude_none=True) + "\n"
+
+    pending: list[str] = []
+    for key, indices in indices_by_key.items():
+        cached = None
+        if use_cache:
+            cached = await ParseCache.get(key, upload_bytes=files[indices[0]].size)
+        if cached is not None:
+            for line in lines(key, cached):
+                yield line
+        else:
+            pending.append(key)
+
+    semaphore = asyncio.Semaphore(batch_settings.PARSE_BATCH_CONCURRENCY)
+
+    async def run(group_keys: list[str]) -> tuple[list[str], list[str | Exception]]:
+        async with semaphore:
+            group = [files[indices_by_key[key][0]] for key in group_keys]
+            return group_keys, await _parse_group(group)
+
+    size = batch_settings.PARSE_BATCH_SIZE
+    tasks = [
+        asyncio.create_task(run(pending[start : start + size]))
+        for start in range(0, len(pending), size)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            group_keys, results = await next_done
+            for key, result in zip(group_keys, results, strict=True):
+                if use_cache and isinstance(result, str):
+                    await ParseCache.set(key, result)
+                for line in lines(key, result):
+                    yield line
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@router.post(
+    "/parse/batch",
+    summary="Upload and parse several files",
+    description=(
+        "Uploads several files and streams one JSON object per file as "
+        "newline-delimited JSON (NDJSON) as soon as each file is parsed. Lines "
+        "arrive in completion order and reference their file via `index`. "
+        "Identical files are parsed once."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        413: {"description": "Too many files in one request"},
+        503: {
+            "description": "Document processing is not enabled (no parser backend configured)"
+        },
+    },
+)
+async def parse_files(
+    files: list[UploadFile], user_info=Depends(authenticate_user)
+) -> StreamingResponse:
+    """
+    Parses several files using the configured backend with bounded concurrency.
+    """
+    if settings.PARSER_BACKEND == ParserBackendType.NONE:
         raise HTTPException(
-            status_code=502,
-            detail=f"Parser service returned an error while processing '{file.filename}'.",
-        )
-    except (httpx.ConnectError, httpx.NetworkError) as exc:
-        logger.error(
-            f"Parser backend error while parsing file '{file.filename}': {exc}",
-            exc_info=True,
+            status_code=503, detail="Document processing is not enabled."
         )
+    max_files = get_settings().PARSE_BATCH_MAX_FILES
+    if len(files) > max_files:
         raise HTTPException(
-            status_code=502,
-            detail=f"Parser service returned an error while processing '{file.filename}'.",
+            status_code=413,
+            detail=f"At most {max_files} files can be parsed in one request.",
         )
-    logger.info(f"Parsing of file '{file.filename}' finished")
-    return content
+    logger.info("Parsing %s files in batch", len(files))
+    return StreamingResponse(
+        _parse_batch_results(files), media_type="application/x-ndjson"
+    )
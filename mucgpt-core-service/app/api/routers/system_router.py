@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
 
 from api.api_models import ConfigResponse, ModelsDTO
 from config.settings import ParserBackendType, get_settings
 from core.auth import authenticate_user
+from core.metrics import Metrics
+from init_app import is_ready
 
 router = APIRouter()
 settings = get_settings()
@@ -68,3 +71,33 @@ async def get_config(user_info=Depends(authenticate_user)) -> ConfigResponse:
 )
 def health_check() -> str:
     return "OK"
+
+
+@router.get(
+    "/ready",
+    summary="Readiness check",
+    description="Reports whether the application finished warming up and accepts traffic.",
+    responses={
+        200: {"description": "Successful Response"},
+        503: {"description": "Warming up or shutting down"},
+    },
+)
+def readiness_check() -> str:
+    if not is_ready():
+        raise HTTPException(status_code=503, detail="Not ready")
+    return "OK"
+
+
+@router.get(
+    "/metrics",
+    summary="Service metrics",
+    description="Process-local service metrics in the Prometheus text exposition format. Values are not aggregated across worker processes.",
+    response_class=PlainTextResponse,
+    responses={
+        200: {"description": "Successful Response"},
+    },
+)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        Metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Depends
 
-from agent.tools.tool_metadata import list_tool_metadata
 from api.api_models import ToolListResponse
 from config.settings import get_settings
 from core.auth import authenticate_user
@@ -30,6 +29,10 @@ async def list_tools(
         :param lang: Language for tool metadata. Supported: deutsch, english, français, bairisch, українська
         :param force_reload: If true, bypass cache and force-refresh MCP tools for this request
     """
+    # Imported here to keep the MCP client stack out of the app import; it is
+    # loaded during warmup.
+    from agent.tools.tool_metadata import list_tool_metadata
+
     return await list_tool_metadata(
         lang=lang, user_info=user_info, force_reload=force_reload
     )
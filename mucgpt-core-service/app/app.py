@@ -18,11 +18,20 @@ from dotenv import find_dotenv, load_dotenv  # noqa
 load_dotenv(find_dotenv(raise_error_if_not_found=False))  # noqa
 
 from backend import backend  # noqa
+from init_app import preload_app  # noqa
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("-d", "--development", action="store_true")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", "1")),
+        help="Number of worker processes (default: $WEB_CONCURRENCY or 1).",
+    )
     log_config_path = os.getenv("LOG_CONFIG", "logconf.yaml")
     args = parser.parse_args()
 
@@ -30,4 +39,16 @@ if __name__ == "__main__":
     log_config = load_log_config(log_config_path)
 
     host = "localhost" if args.development else "0.0.0.0"
-    uvicorn.run(backend, host=host, port=8080, log_config=log_config)
+    if args.workers > 1:
+        preload_app()
+        # Workers are spawned and import the app themselves, each one opens its
+        # own connections in the lifespan.
+        uvicorn.run(
+            "app:backend",
+            host=host,
+            port=args.port,
+            workers=args.workers,
+            log_config=log_config,
+        )
+    else:
+        uvicorn.run(backend, host=host, port=args.port, log_config=log_config)
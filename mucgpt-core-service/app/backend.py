@@ -1,7 +1,6 @@
-import time
 from contextlib import asynccontextmanager
 
-from asgi_correlation_id import CorrelationIdMiddleware, correlation_id
+from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
@@ -18,6 +17,7 @@ from config.settings import (
 )
 from core.auth_models import AuthError, AuthErrorResponse
 from core.logtools import getLogger
+from core.request_timing import RequestTimingMiddleware
 from init_app import destroy_app, warmup_app
 
 logger = getLogger()
@@ -71,6 +71,8 @@ api_app = FastAPI(
 backend.mount("/api/", api_app)
 
 api_app.add_middleware(CorrelationIdMiddleware)
+# Added last so that it wraps (and also times) the correlation id middleware
+api_app.add_middleware(RequestTimingMiddleware, logger=logger)
 
 
 api_app.include_router(chat_router.router, prefix="", tags=["Chat"])
@@ -87,7 +89,7 @@ async def auth_exception_handler(request: Request, exc: AuthError):
     Exception handler for authentication errors.
     Returns a proper error response with redirect details.
     """
-    logger.error(f"Authentication failed: {exc.error}")
+    logger.error("Authentication failed: %s", exc.error)
 
     error_body = AuthErrorResponse(
         message=exc.error,
@@ -103,21 +105,3 @@ async def auth_exception_handler(request: Request, exc: AuthError):
         content=error_body.model_dump(exclude_none=True),
         headers=headers,
     )
-
-
-@api_app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """
-    Middleware to add a process time header to each response and log the request duration.
-    """
-    start_time = time.time()
-    response = await call_next(request)
-    # add trace information
-    if "x-request-id" in response.headers:
-        correlation_id.set(response.headers["x-request-id"])
-    logger.info(
-        "Request %s took %.3f seconds", request.url.path, time.time() - start_time
-    )
-    # remove trace information
-    correlation_id.set(None)
-    return response
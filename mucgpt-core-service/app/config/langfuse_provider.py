@@ -1,14 +1,46 @@
-from langfuse import Langfuse
-from langfuse.langchain import CallbackHandler
+"""Langfuse client setup and head-based trace sampling.
 
-from config.settings import LangfuseConfig
+Whether a request is traced is decided once, by the ``sample_trace`` router
+dependency, before any ``@observe`` span is opened. The decision lives in a
+context variable inherited by the tasks serving the request. Unsampled
+requests run without the LangChain callback handler and span annotations, and
+the spans they still open are dropped by the exporter filter.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from fastapi import Depends
+from langfuse import Langfuse, is_default_export_span
+
+from config.settings import LangfuseConfig, TraceSamplingKey
+from core.auth import authenticate_user
+from core.auth_models import AuthenticationResult
 from core.logtools import getLogger
 
+if TYPE_CHECKING:
+    from langfuse.langchain import CallbackHandler
+    from opentelemetry.sdk.trace import ReadableSpan
+
 logger = getLogger()
 
+_sampled: ContextVar[bool | None] = ContextVar("langfuse_sampled", default=None)
+
+
+def _user_fraction(user_id: str) -> float:
+    """Map a user id to a stable value in [0, 1)."""
+    digest = hashlib.sha256(user_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64
+
 
 class LangfuseProvider:
     _langfuse_callback: CallbackHandler | None = None
+    _sample_rate: float = 1.0
+    _sample_by: TraceSamplingKey = TraceSamplingKey.REQUEST
 
     @staticmethod
     def init(version: str, langfuse_cfg: LangfuseConfig):
@@ -19,19 +51,66 @@ class LangfuseProvider:
                 and langfuse_cfg.PUBLIC_KEY
             ):
                 try:
+                    # Pulls in LangChain and LangGraph, only needed with tracing.
+                    from langfuse.langchain import CallbackHandler
+
                     langfuse = Langfuse(
                         public_key=langfuse_cfg.PUBLIC_KEY,
                         host=langfuse_cfg.HOST,
                         secret_key=langfuse_cfg.SECRET_KEY.get_secret_value(),
                         release=version,
+                        flush_at=langfuse_cfg.FLUSH_AT,
+                        flush_interval=langfuse_cfg.FLUSH_INTERVAL_SECONDS,
+                        should_export_span=LangfuseProvider.should_export_span,
                     )
                     langfuse.auth_check()
                     LangfuseProvider._langfuse_callback = CallbackHandler(
                         public_key=langfuse_cfg.PUBLIC_KEY,
                     )
+                    LangfuseProvider._sample_rate = langfuse_cfg.SAMPLE_RATE
+                    LangfuseProvider._sample_by = langfuse_cfg.SAMPLE_BY
                 except Exception as e:
-                    logger.error(f"Error initializing Langfuse: {e}")
+                    logger.error("Error initializing Langfuse: %s", e)
+
+    @classmethod
+    def sample(cls, user_id: str | None = None) -> bool:
+        """Decide whether the current request is traced.
+
+        The first call in a request takes the decision, later calls return it.
+        """
+        decision = _sampled.get()
+        if decision is None:
+            if cls._sample_rate >= 1.0:
+                decision = True
+            elif cls._sample_by == TraceSamplingKey.USER and user_id:
+                decision = _user_fraction(user_id) < cls._sample_rate
+            else:
+                decision = random.random() < cls._sample_rate
+            _sampled.set(decision)
+        return decision
+
+    @staticmethod
+    def is_sampled() -> bool:
+        """False only for requests that were sampled out."""
+        return _sampled.get() is not False
+
+    @staticmethod
+    def should_export_span(span: ReadableSpan) -> bool:
+        return LangfuseProvider.is_sampled() and is_default_export_span(span)
 
     @staticmethod
     def get_callback_handler() -> CallbackHandler | None:
+        if not LangfuseProvider.is_sampled():
+            return None
         return LangfuseProvider._langfuse_callback
+
+
+async def sample_trace(
+    user_info: AuthenticationResult = Depends(authenticate_user),
+) -> bool:
+    """Router dependency taking the tracing decision for the request.
+
+    Must be async: the context variable set here is only visible to the
+    endpoint if the dependency runs in the request task.
+    """
+    return LangfuseProvider.sample(user_info.user_id)
@@ -0,0 +1,278 @@
+"""Startup enrichment of model metadata from the model info endpoints.
+
+Models sharing an endpoint and API key are served by one ``model/info``
+request, distinct endpoints are queried concurrently. The last successful
+responses are kept in a local snapshot file: when it covers every model the
+app starts from it and refreshes it in the background. The refreshed metadata
+replaces the snapshot values of the running process.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from config.settings import (
+    MODEL_INFO_TIMEOUT_SECONDS,
+    ModelInfo,
+    ModelsConfig,
+    aload_model_info,
+    enrich_model_metadata,
+    model_info_unavailable_error,
+    needs_model_info_endpoint,
+)
+from core.logtools import getLogger
+
+logger = getLogger()
+
+SNAPSHOT_VERSION = 1
+
+# Only these parts of an info entry are read by the enrichment; everything
+# else (e.g. deployment parameters) stays out of the snapshot file.
+_SNAPSHOT_ENTRY_KEYS = (
+    "model_name",
+    "description",
+    "litellm_provider",
+    "knowledge_cut_off",
+    "model_info",
+)
+_SNAPSHOT_LITELLM_PARAMS = ("model", "input_cost_per_token", "output_cost_per_token")
+
+
+def endpoint_key(model: ModelsConfig) -> str:
+    """Identify the info endpoint of ``model`` without exposing its API key."""
+    key_hash = hashlib.sha256(
+        model.api_key.get_secret_value().encode("utf-8")
+    ).hexdigest()[:16]
+    return f"{model.endpoint.unicode_string()}#{key_hash}"
+
+
+def _snapshot_entry(entry: dict[str, Any]) -> dict[str, Any]:
+    reduced = {key: entry[key] for key in _SNAPSHOT_ENTRY_KEYS if key in entry}
+    litellm_params = entry.get("litellm_params")
+    if isinstance(litellm_params, dict):
+        reduced["litellm_params"] = {
+            key: litellm_params[key]
+            for key in _SNAPSHOT_LITELLM_PARAMS
+            if key in litellm_params
+        }
+    return reduced
+
+
+def load_snapshot(path: Path) -> dict[str, list[dict[str, Any]]]:
+    """Return the stored info payloads by endpoint key, empty if unusable."""
+    try:
+        snapshot = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable model info snapshot %s: %s", path, exc)
+        return {}
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        return {}
+    endpoints = snapshot.get("endpoints")
+    if not isinstance(endpoints, dict):
+        return {}
+    return {
+        key: payload for key, payload in endpoints.items() if isinstance(payload, list)
+    }
+
+
+def save_snapshot(path: Path, payloads: dict[str, list[dict[str, Any]]]) -> None:
+    """Atomically replace the snapshot with ``payloads``."""
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "endpoints": {
+            key: [
+                _snapshot_entry(entry) for entry in payload if isinstance(entry, dict)
+            ]
+            for key, payload in payloads.items()
+        },
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(snapshot), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.warning("Unable to write model info snapshot %s: %s", path, exc)
+
+
+async def fetch_model_infos(
+    models: list[ModelsConfig],
+) -> tuple[dict[str, list[dict[str, Any]]], dict[str, Exception]]:
+    """Fetch the info payload of every distinct endpoint concurrently.
+
+    Returns the payloads and the errors, both keyed by ``endpoint_key``.
+    """
+    endpoints: dict[str, ModelsConfig] = {}
+    for model in models:
+        endpoints.setdefault(endpoint_key(model), model)
+
+    async with httpx.AsyncClient(timeout=MODEL_INFO_TIMEOUT_SECONDS) as client:
+        results = await asyncio.gather(
+            *(
+                aload_model_info(client, model.endpoint, model.api_key)
+                for model in endpoints.values()
+            ),
+            return_exceptions=True,
+        )
+
+    payloads: dict[str, list[dict[str, Any]]] = {}
+    errors: dict[str, Exception] = {}
+    for key, result in zip(endpoints, results, strict=True):
+        if isinstance(result, Exception):
+            logger.warning("Model info request failed: %s", result)
+            errors[key] = result
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            payloads[key] = result
+    return payloads, errors
+
+
+def _apply_payloads(
+    models: list[ModelsConfig],
+    payloads: dict[str, list[dict[str, Any]]],
+    errors: dict[str, Exception] | None = None,
+) -> None:
+    for model in models:
+        key = endpoint_key(model)
+        if key not in payloads:
+            raise model_info_unavailable_error(model) from (errors or {}).get(key)
+        enrich_model_metadata(model, payloads[key])
+
+
+def _reapply_payloads(
+    models: list[ModelsConfig],
+    configured: list[ModelInfo],
+    payloads: dict[str, list[dict[str, Any]]],
+) -> None:
+    """Re-enrich ``models`` from their ``configured`` metadata and ``payloads``.
+
+    Each model's ``model_info`` is swapped as a whole, so readers see either
+    the previous or the refreshed metadata. Models whose refreshed entry is
+    unusable keep their current metadata.
+    """
+    for model, info in zip(models, configured, strict=True):
+        candidate = model.model_copy(update={"model_info": info.model_copy()})
+        candidate._metadata_enriched = False
+        try:
+            enrich_model_metadata(candidate, payloads[endpoint_key(model)])
+        except ValueError as exc:
+            logger.warning("Keeping metadata of %s: %s", model.llm_name, exc)
+            continue
+        model.model_info = candidate.model_info
+
+
+class ModelMetadataLoader:
+    """Enriches the configured models once at startup."""
+
+    _refresh_task: asyncio.Task | None = None
+
+    @classmethod
+    async def initialize(
+        cls,
+        models: list[ModelsConfig],
+        snapshot_path: Path | None,
+        refresh: bool = True,
+    ) -> None:
+        """Complete the metadata of ``models``, raising ``ValueError`` on failure.
+
+        ``refresh=False`` skips the background refresh of a loaded snapshot, e.g.
+        in worker processes whose supervisor refreshed it with ``preload``.
+        """
+        pending = []
+        for model in models:
+            if needs_model_info_endpoint(model):
+                pending.append(model)
+            else:
+                enrich_model_metadata(model)
+        if not pending:
+            return
+
+        if snapshot_path is not None:
+            snapshot = load_snapshot(snapshot_path)
+            if {endpoint_key(model) for model in pending} <= snapshot.keys():
+                configured = [model.model_info.model_copy() for model in pending]
+                try:
+                    _apply_payloads(pending, snapshot)
+                except ValueError as exc:
+                    logger.warning(
+                        "Model info snapshot %s is outdated: %s", snapshot_path, exc
+                    )
+                else:
+                    logger.info("Loaded model metadata from %s", snapshot_path)
+                    if refresh:
+                        cls._start_refresh(pending, configured, snapshot_path)
+                    return
+
+        payloads, errors = await fetch_model_infos(pending)
+        _apply_payloads(pending, payloads, errors)
+        if snapshot_path is not None:
+            save_snapshot(snapshot_path, payloads)
+
+    @classmethod
+    async def preload(cls, models: list[ModelsConfig], snapshot_path: Path) -> None:
+        """Refresh the snapshot once before worker processes are started.
+
+        Unreachable endpoints keep the previous snapshot; workers only query the
+        endpoints themselves if no usable snapshot exists.
+        """
+        pending = [model for model in models if needs_model_info_endpoint(model)]
+        if pending:
+            await cls._refresh(pending, snapshot_path)
+
+    @classmethod
+    def _start_refresh(
+        cls,
+        models: list[ModelsConfig],
+        configured: list[ModelInfo],
+        snapshot_path: Path,
+    ) -> None:
+        if cls._refresh_task is not None and not cls._refresh_task.done():
+            return
+        cls._refresh_task = asyncio.create_task(
+            cls._refresh_and_apply(models, configured, snapshot_path)
+        )
+
+    @classmethod
+    async def _refresh_and_apply(
+        cls,
+        models: list[ModelsConfig],
+        configured: list[ModelInfo],
+        snapshot_path: Path,
+    ) -> None:
+        payloads = await cls._refresh(models, snapshot_path)
+        if payloads is not None:
+            _reapply_payloads(models, configured, payloads)
+
+    @staticmethod
+    async def _refresh(
+        models: list[ModelsConfig], snapshot_path: Path
+    ) -> dict[str, list[dict[str, Any]]] | None:
+        payloads, errors = await fetch_model_infos(models)
+        if errors:
+            logger.warning(
+                "Keeping model info snapshot, %d endpoint(s) unreachable", len(errors)
+            )
+            return None
+        save_snapshot(snapshot_path, payloads)
+        logger.info("Refreshed model info snapshot %s", snapshot_path)
+        return payloads
+
+    @classmethod
+    async def stop_refresh(cls) -> None:
+        """Cancel the background snapshot refresh if it is still running."""
+        task, cls._refresh_task = cls._refresh_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -1,10 +1,13 @@
-import logging
-from typing import Any
+from __future__ import annotations
 
-from langchain_openai import AzureChatOpenAI, ChatOpenAI
+import logging
+from typing import TYPE_CHECKING, Any
 
 from config.settings import ModelsConfig
 
+if TYPE_CHECKING:
+    from langchain_openai import AzureChatOpenAI, ChatOpenAI
+
 
 class ModelsConfigurationException(Exception):
     """Exception raised for errors in the model configuration."""
@@ -21,6 +24,9 @@ class ModelRegistry:
     @staticmethod
     def init_chat_model(config: ModelsConfig) -> ChatOpenAI | AzureChatOpenAI:
         """Initialize a concrete chat model from configuration."""
+        # langchain_openai is slow to import, load it with the first model.
+        from langchain_openai import AzureChatOpenAI, ChatOpenAI
+
         try:
             if config.type == "OPENAI":
                 return ChatOpenAI(
@@ -72,6 +78,9 @@ class ModelRegistry:
             model_name and "gpt-5" in model_name
         ):
             normalized.pop("temperature", None)
+        # Reasoning models reject stop sequences as well.
+        if model_name and "gpt-5" in model_name:
+            normalized.pop("stop", None)
         return normalized
 
     @classmethod
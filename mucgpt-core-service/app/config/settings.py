@@ -1,7 +1,9 @@
 import logging
+import tempfile
 from decimal import Decimal
 from enum import StrEnum
 from functools import lru_cache
+from pathlib import Path
 from typing import Any, Literal
 from urllib.parse import urljoin
 
@@ -10,6 +12,8 @@ from pydantic import (
     BaseModel,
     Field,
     HttpUrl,
+    NonNegativeInt,
+    PositiveFloat,
     PositiveInt,
     PrivateAttr,
     SecretStr,
@@ -34,14 +38,26 @@ class MCPTransport(StrEnum):
 
 class ParserBackendType(StrEnum):
     NONE = "none"
+    LOCAL = "local"
     XBERG = "xberg"
 
 
+class AgentCheckpointerType(StrEnum):
+    NONE = "none"
+    MEMORY = "memory"
+    REDIS = "redis"
+
+
 class InternalTaskModelStrength(StrEnum):
     WEAK = "weak"
     STRONG = "strong"
 
 
+class TraceSamplingKey(StrEnum):
+    REQUEST = "request"
+    USER = "user"
+
+
 _logger = logging.getLogger(__name__)
 _positive_int_adapter = TypeAdapter(PositiveInt)
 _decimal_adapter = TypeAdapter(Decimal)
@@ -66,6 +82,23 @@ class ModelInfo(BaseModel):
     creativity_medium_temperature: float | None = None
     creativity_high_temperature: float | None = None
 
+    def clamp_max_tokens(self, max_tokens: int | None) -> int | None:
+        """Limit a requested output token count to ``max_output_tokens``.
+
+        Args:
+            max_tokens: Requested maximum number of output tokens, or None
+
+        Returns:
+            The requested value capped at ``max_output_tokens``; the model's
+            limit if nothing was requested; None if neither is known
+        """
+        limit = self.max_output_tokens
+        if max_tokens is None:
+            return limit
+        if limit is None:
+            return max_tokens
+        return min(max_tokens, limit)
+
 
 DeepAgentBuiltinTool = Literal[
     "write_todos",
@@ -309,12 +342,23 @@ class ModelsConfig(BaseModel):
                 else default_temps["high"]
             )
 
+    def clamp_max_tokens(self, max_tokens: int | None) -> int | None:
+        """Limit a requested output token count to this model's output limit.
+
+        See ``ModelInfo.clamp_max_tokens``.
+        """
+        return self.model_info.clamp_max_tokens(max_tokens)
+
 
 class SSOConfig(BaseModel):
     """SSO configuration (nested under SSO key in YAML)."""
 
     ROLE: str | None = None
     ADMIN_ROLE: str | None = None
+    # Parsed tokens are reused until their exp claim, at most TOKEN_CACHE_TTL_SECONDS;
+    # 0 entries disables the cache
+    TOKEN_CACHE_MAX_ENTRIES: NonNegativeInt = 1024
+    TOKEN_CACHE_TTL_SECONDS: PositiveFloat = 300.0
 
 
 class LangfuseConfig(BaseModel):
@@ -323,6 +367,12 @@ class LangfuseConfig(BaseModel):
     PUBLIC_KEY: str | None = None
     SECRET_KEY: SecretStr | None = None
     HOST: str | None = None
+    # Share of requests that are traced, decided once per request (or per user)
+    SAMPLE_RATE: float = Field(default=1.0, ge=0.0, le=1.0)
+    SAMPLE_BY: TraceSamplingKey = TraceSamplingKey.REQUEST
+    # Exporter batching, None keeps the Langfuse defaults
+    FLUSH_AT: PositiveInt | None = None
+    FLUSH_INTERVAL_SECONDS: float | None = Field(default=None, gt=0)
 
 
 class MCPToolDescription(BaseModel):
@@ -396,6 +446,26 @@ class RedisConfig(BaseModel):
     PORT: int = 6379
     USERNAME: SecretStr | None = None
     PASSWORD: SecretStr | None = None
+    # Cached values of at least this size are zlib compressed
+    COMPRESSION_MIN_BYTES: PositiveInt = 1024
+    # In-process cache in front of Redis for hot keys; 0 entries disables it
+    LOCAL_CACHE_MAX_ENTRIES: NonNegativeInt = 256
+    LOCAL_CACHE_TTL_SECONDS: PositiveFloat = 30.0
+    # Connection pool and socket limits; callers wait at most POOL_TIMEOUT for a free connection
+    MAX_CONNECTIONS: PositiveInt = 50
+    POOL_TIMEOUT: PositiveFloat = 1.0
+    SOCKET_CONNECT_TIMEOUT: PositiveFloat = 1.0
+    SOCKET_TIMEOUT: PositiveFloat = 1.0
+    # Retries of failed commands with equal-jitter exponential backoff
+    RETRY_ATTEMPTS: NonNegativeInt = 2
+    RETRY_BACKOFF_BASE_SECONDS: PositiveFloat = 0.05
+    RETRY_BACKOFF_CAP_SECONDS: PositiveFloat = 0.5
+    # Consecutive connection failures that open the circuit breaker and how long it stays open
+    CIRCUIT_FAILURE_THRESHOLD: PositiveInt = 3
+    CIRCUIT_RESET_SECONDS: PositiveFloat = 10.0
+    # Resolve the primary via Sentinel ("host:port" entries) instead of HOST/PORT
+    SENTINELS: list[str] = Field(default_factory=list)
+    SENTINEL_SERVICE_NAME: str = "mymaster"
 
 
 class InternetSearchConfig(BaseModel):
@@ -408,6 +478,38 @@ class InternetSearchConfig(BaseModel):
     SAFESEARCH: int = 1
 
 
+class TokenBudgetConfig(BaseModel):
+    """Pre-flight input token budgeting (nested under TOKEN_BUDGET key in YAML)."""
+
+    ENABLED: bool = True
+    # Output tokens kept free when a model call sends no max_tokens; otherwise
+    # the max_tokens sent with the call is reserved.
+    RESERVED_OUTPUT_TOKENS: PositiveInt = 4096
+    # Headroom for message framing and tokenizer estimation errors.
+    SAFETY_MARGIN_TOKENS: int = Field(default=512, ge=0)
+    # Share of the input window data sources keep when history competes for space.
+    DATA_SOURCE_SHARE: float = Field(default=0.5, ge=0.0, le=1.0)
+    # Characters per token used by the approximate counter.
+    CHARS_PER_TOKEN: PositiveFloat = 3.0
+    # Optional tiktoken encoding (e.g. "o200k_base") for exact counting.
+    TOKENIZER_ENCODING: str | None = None
+
+
+class DataSourceRetrievalConfig(BaseModel):
+    """Lexical retrieval over uploaded data sources (nested under DATA_SOURCE_RETRIEVAL key in YAML)."""
+
+    # Off by default: with retrieval, large data sources reach the model only in part.
+    ENABLED: bool = False
+    # Data sources below this many tokens in total are injected in full.
+    MIN_TOTAL_TOKENS: PositiveInt = 8000
+    # Number of best matching chunks injected instead of the full documents.
+    TOP_K: PositiveInt = 8
+    # Maximum size of a retrievable chunk.
+    CHUNK_MAX_TOKENS: PositiveInt = 400
+    # Number of per-document-set indexes kept in memory.
+    INDEX_CACHE_SIZE: PositiveInt = 32
+
+
 # Backward-compatible aliases
 SSOSettings = SSOConfig
 LangfuseSettings = LangfuseConfig
@@ -450,18 +552,55 @@ class Settings(BaseSettings):
     # Backend settings
     UNAUTHORIZED_USER_REDIRECT_URL: str = ""
     MODELS: list[ModelsConfig] = []
+    # Last successful model info responses; set to null to always fetch at startup.
+    MODEL_INFO_SNAPSHOT_PATH: Path | None = (
+        Path(tempfile.gettempdir()) / "mucgpt-model-info.json"
+    )
     MEMORY_SERVICE_URL: str = ""
 
     # Parsing
     PARSER_BACKEND: ParserBackendType = ParserBackendType.NONE
     XBERG_URL: str = ""
     XBERG_TIMEOUT: float = 120.0
+    XBERG_MAX_UPLOAD_BYTES: PositiveInt = 100 * 1024 * 1024
+    XBERG_MAX_CONNECTIONS: PositiveInt = 20
+    PARSER_ROUTES: dict[str, ParserBackendType] = {
+        "text/plain": ParserBackendType.LOCAL,
+        "text/markdown": ParserBackendType.LOCAL,
+        "text/csv": ParserBackendType.LOCAL,
+        "application/json": ParserBackendType.LOCAL,
+        "text/html": ParserBackendType.LOCAL,
+        "message/rfc822": ParserBackendType.LOCAL,
+    }
+    PARSER_LOCAL_MAX_BYTES: PositiveInt = 10 * 1024 * 1024
+    PARSER_LOCAL_WORKERS: PositiveInt = 4
+    PARSE_CHUNK_MAX_TOKENS: PositiveInt = 512
+    PARSE_BATCH_MAX_FILES: PositiveInt = 20
+    PARSE_BATCH_SIZE: PositiveInt = 4
+    PARSE_BATCH_CONCURRENCY: PositiveInt = 2
+    PARSE_CACHE_ENABLED: bool = True
+    PARSE_CACHE_VERSION: str = "1"
+    PARSE_CACHE_TTL_SECONDS: PositiveInt = 7 * 24 * 60 * 60
+    PARSE_CACHE_MAX_ENTRY_BYTES: PositiveInt = 8 * 1024 * 1024
+    PARSE_CACHE_COMPRESSION_MIN_BYTES: PositiveInt = 4 * 1024
+
+    # Prompt pool
+    PROMPT_POOL_HOT_RELOAD: bool = False
+    PROMPT_POOL_RELOAD_INTERVAL_SECONDS: PositiveFloat = 2.0
 
     # Frontend feature flags
     TRANSCRIPTION_ENABLED: bool = False
     AI_ACT_COMPLIANCE_CHECK_ENABLED: bool = True
     COMPLIANCE_CACHE_ENABLED: bool = True
     COMPLIANCE_CACHE_TTL_SECONDS: PositiveInt = 30 * 60
+    GENERATION_CACHE_ENABLED: bool = True
+    GENERATION_CACHE_TTL_SECONDS: PositiveInt = 24 * 60 * 60
+    GENERATION_CACHE_MAX_ENTRY_BYTES: PositiveInt = 64 * 1024
+    CONVERSATION_STORE_ENABLED: bool = False
+    CONVERSATION_STORE_TTL_SECONDS: PositiveInt = 24 * 60 * 60
+    CONVERSATION_STORE_MAX_BYTES: PositiveInt = 2 * 1024 * 1024
+    AGENT_CHECKPOINTER: AgentCheckpointerType = AgentCheckpointerType.NONE
+    AGENT_CHECKPOINT_TTL_SECONDS: PositiveInt = 24 * 60 * 60
 
     # Nested sub-configurations
     SSO: SSOConfig = Field(default_factory=SSOConfig)
@@ -469,6 +608,10 @@ class Settings(BaseSettings):
     MCP: MCPConfig = Field(default_factory=MCPConfig)
     REDIS: RedisConfig = Field(default_factory=RedisConfig)
     INTERNET_SEARCH: InternetSearchConfig = Field(default_factory=InternetSearchConfig)
+    TOKEN_BUDGET: TokenBudgetConfig = Field(default_factory=TokenBudgetConfig)
+    DATA_SOURCE_RETRIEVAL: DataSourceRetrievalConfig = Field(
+        default_factory=DataSourceRetrievalConfig
+    )
 
     # Customize settings sources to prioritize YAML config
     @classmethod
@@ -500,8 +643,14 @@ class Settings(BaseSettings):
         return value.split("@")[0]
 
 
-def enrich_model_metadata(model: ModelsConfig) -> None:
-    """Populate missing metadata for a model via the remote info endpoint."""
+def enrich_model_metadata(
+    model: ModelsConfig, info_payload: list[dict[str, Any]] | None = None
+) -> None:
+    """Populate missing metadata for a model via the remote info endpoint.
+
+    ``info_payload`` is the ``data`` list of an already fetched info endpoint
+    response; without it the endpoint is called for this model.
+    """
 
     info = model.model_info
     info.description = (info.description or "").strip() or None
@@ -517,14 +666,13 @@ def enrich_model_metadata(model: ModelsConfig) -> None:
         model._metadata_enriched = True
         return
 
-    try:
-        entry = _fetch_remote_model_entry(model)
-    except RuntimeError as exc:  # pragma: no cover - defended via unit tests
-        raise ValueError(
-            "Unable to enrich model configuration. Provide max_input_tokens, "
-            "max_output_tokens, and description directly or ensure the model info "
-            f"endpoint at {model.endpoint} is reachable."
-        ) from exc
+    if info_payload is not None:
+        entry = _match_model_entry(info_payload, model)
+    else:
+        try:
+            entry = _fetch_remote_model_entry(model)
+        except RuntimeError as exc:  # pragma: no cover - defended via unit tests
+            raise model_info_unavailable_error(model) from exc
 
     if entry is None:
         raise ValueError(
@@ -545,6 +693,24 @@ def enrich_model_metadata(model: ModelsConfig) -> None:
     model._metadata_enriched = True
 
 
+def needs_model_info_endpoint(model: ModelsConfig) -> bool:
+    """Whether enriching ``model`` requires a call to its info endpoint."""
+    info = model.model_info
+    return (
+        not getattr(model, "_metadata_enriched", False)
+        and info.auto_enrich_from_model_info_endpoint
+        and not _has_complete_metadata(info)
+    )
+
+
+def model_info_unavailable_error(model: ModelsConfig) -> ValueError:
+    return ValueError(
+        "Unable to enrich model configuration. Provide max_input_tokens, "
+        "max_output_tokens, and description directly or ensure the model info "
+        f"endpoint at {model.endpoint} is reachable."
+    )
+
+
 def _has_complete_metadata(model_info: ModelInfo) -> bool:
     return (
         model_info.max_output_tokens is not None
@@ -712,34 +878,59 @@ def _fetch_remote_model_entry(model: ModelsConfig) -> dict[str, Any] | None:
     return _match_model_entry(info_payload, model)
 
 
-def _load_model_info(
+def _model_info_request(
     endpoint: HttpUrl, api_key: SecretStr | None
-) -> list[dict[str, Any]]:
+) -> tuple[str, dict[str, str]]:
     info_url = urljoin(endpoint.unicode_string(), "model/info")
-
     headers = {}
     if api_key:
         headers["Authorization"] = f"Bearer {api_key.get_secret_value()}"
+    return info_url, headers
 
-    try:
-        with httpx.Client(timeout=MODEL_INFO_TIMEOUT_SECONDS) as client:
-            response = client.get(info_url, headers=headers)
-            response.raise_for_status()
-    except httpx.TimeoutException as exc:  # pragma: no cover - network
-        raise RuntimeError(f"Request to {info_url} timed out") from exc
-    except httpx.HTTPStatusError as exc:  # pragma: no cover - network
-        raise RuntimeError(
+
+def _model_info_error(info_url: str, exc: httpx.HTTPError) -> RuntimeError:
+    if isinstance(exc, httpx.TimeoutException):
+        return RuntimeError(f"Request to {info_url} timed out")
+    if isinstance(exc, httpx.HTTPStatusError):
+        return RuntimeError(
             f"Info endpoint {info_url} returned {exc.response.status_code}"
-        ) from exc
-    except httpx.RequestError as exc:  # pragma: no cover - network
-        raise RuntimeError(f"Failed to call {info_url}: {exc}") from exc
+        )
+    return RuntimeError(f"Failed to call {info_url}: {exc}")
+
 
+def _model_info_data(info_url: str, response: httpx.Response) -> list[dict[str, Any]]:
     payload = response.json()
     if not isinstance(payload, dict) or not isinstance(payload.get("data"), list):
         raise RuntimeError(f"Unexpected payload from {info_url}: missing 'data' list")
     return payload["data"]
 
 
+def _load_model_info(
+    endpoint: HttpUrl, api_key: SecretStr | None
+) -> list[dict[str, Any]]:
+    info_url, headers = _model_info_request(endpoint, api_key)
+    try:
+        with httpx.Client(timeout=MODEL_INFO_TIMEOUT_SECONDS) as client:
+            response = client.get(info_url, headers=headers)
+            response.raise_for_status()
+    except httpx.HTTPError as exc:  # pragma: no cover - network
+        raise _model_info_error(info_url, exc) from exc
+    return _model_info_data(info_url, response)
+
+
+async def aload_model_info(
+    client: httpx.AsyncClient, endpoint: HttpUrl, api_key: SecretStr | None
+) -> list[dict[str, Any]]:
+    """Async variant of ``_load_model_info`` using a shared client."""
+    info_url, headers = _model_info_request(endpoint, api_key)
+    try:
+        response = await client.get(info_url, headers=headers)
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise _model_info_error(info_url, exc) from exc
+    return _model_info_data(info_url, response)
+
+
 def _match_model_entry(
     payload: list[dict[str, Any]], model: ModelsConfig
 ) -> dict[str, Any] | None:
@@ -813,3 +1004,23 @@ def get_redis_settings() -> RedisConfig:
 def get_internet_search_settings() -> InternetSearchConfig:
     """Return cached InternetSearchSettings instance."""
     return get_settings().INTERNET_SEARCH
+
+
+def get_model_config(llm_name: str) -> ModelsConfig | None:
+    """Return the configured model with the given ``llm_name``, if any."""
+    return next(
+        (model for model in get_settings().MODELS if model.llm_name == llm_name),
+        None,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_token_budget_settings() -> TokenBudgetConfig:
+    """Return cached TokenBudgetConfig instance."""
+    return get_settings().TOKEN_BUDGET
+
+
+@lru_cache(maxsize=1)
+def get_retrieval_settings() -> DataSourceRetrievalConfig:
+    """Return cached DataSourceRetrievalConfig instance."""
+    return get_settings().DATA_SOURCE_RETRIEVAL
@@ -0,0 +1,108 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from config.settings import get_settings
+from core.cache import RedisCache
+from core.logtools import getLogger
+
+logger = getLogger()
+
+_CACHE_KEY_PREFIX = "mucgpt:conversation:v1:"
+
+
+def history_digest(messages: list[dict[str, str]]) -> str:
+    """SHA-256 over the JSON array ``[role, content]`` of each message."""
+    digest = hashlib.sha256()
+    for message in messages:
+        digest.update(
+            json.dumps(
+                [message.get("role"), message.get("content")], ensure_ascii=False
+            ).encode()
+        )
+    return digest.hexdigest()
+
+
+@dataclass
+class StoredConversation:
+    """Conversation history as last seen by the server.
+
+    ``version`` is the ``history_digest`` of the stored messages, so clients
+    can compute it locally from the history they already hold and an edited
+    or regenerated turn no longer matches.
+    """
+
+    messages: list[dict[str, str]]
+    data_sources: list[dict[str, Any]] | None = None
+    version: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.version = history_digest(self.messages)
+
+
+class ConversationStore:
+    """Server-side chat history keyed by user and ``conversation_id``.
+
+    Lets clients send only the new turn of a conversation instead of the
+    full history on every request. Entries expire after
+    ``CONVERSATION_STORE_TTL_SECONDS`` and histories larger than
+    ``CONVERSATION_STORE_MAX_BYTES`` are not stored, which makes the next
+    incremental request fall back to a full-history request. Redis failures
+    are logged and treated like a missing entry.
+    """
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return get_settings().CONVERSATION_STORE_ENABLED
+
+    @staticmethod
+    def build_key(user_id: str, conversation_id: str) -> str:
+        user_hash = hashlib.sha256(user_id.encode("utf-8")).hexdigest()
+        return f"{_CACHE_KEY_PREFIX}{user_hash}:{conversation_id}"
+
+    @staticmethod
+    async def load(user_id: str, conversation_id: str) -> StoredConversation | None:
+        """Return the stored conversation or ``None`` if missing/unavailable."""
+        try:
+            value = await RedisCache.get_object(
+                ConversationStore.build_key(user_id, conversation_id)
+            )
+        except Exception:
+            logger.warning("Conversation store lookup failed", exc_info=True)
+            return None
+        if not isinstance(value, dict):
+            return None
+        return StoredConversation(
+            messages=value.get("messages") or [],
+            data_sources=value.get("data_sources"),
+        )
+
+    @staticmethod
+    async def save(
+        user_id: str,
+        conversation_id: str,
+        conversation: StoredConversation,
+    ) -> None:
+        """Store ``conversation`` unless it exceeds the configured size limit."""
+        settings = get_settings()
+        value = {
+            "messages": conversation.messages,
+            "data_sources": conversation.data_sources,
+        }
+        size = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        if size > settings.CONVERSATION_STORE_MAX_BYTES:
+            logger.info(
+                "Not storing conversation %s: %d bytes exceeds limit",
+                conversation_id,
+                size,
+            )
+            return
+        try:
+            await RedisCache.set_object(
+                ConversationStore.build_key(user_id, conversation_id),
+                value,
+                ttl=settings.CONVERSATION_STORE_TTL_SECONDS,
+            )
+        except Exception:
+            logger.warning("Conversation store write failed", exc_info=True)
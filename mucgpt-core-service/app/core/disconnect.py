@@ -0,0 +1,70 @@
+"""Stop consuming upstream streams as soon as the HTTP client goes away.
+
+Below ASGI spec 2.4 (uvicorn reports 2.3) ``StreamingResponse`` listens for
+``http.disconnect`` itself and cancels the task iterating the body. From 2.4
+on it relies on the server raising ``OSError`` from ``send``, so the closed
+connection is only noticed with the next chunk. An agent that is busy with a
+tool call or a slow model would run to completion for nobody; the guard
+covers that case.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import TypeVar
+
+from starlette.types import Receive, Scope
+
+T = TypeVar("T")
+
+
+def needs_disconnect_guard(scope: Scope) -> bool:
+    """Whether the server leaves disconnect detection to the application."""
+    spec_version = scope.get("asgi", {}).get("spec_version", "2.0")
+    return tuple(map(int, spec_version.split("."))) >= (2, 4)
+
+
+class DisconnectGuard:
+    """Relays items of an upstream generator until the client disconnects.
+
+    The upstream is consumed in the calling task, so context variables
+    (tracing spans, correlation ids) keep working. On disconnect the task is
+    cancelled while it waits for the upstream; the cancellation propagates
+    into the generator, which closes model streams and MCP sessions on its
+    way out. If the disconnect arrives while an item is being sent, the
+    upstream is closed before the next one is requested.
+    """
+
+    def __init__(self, receive: Receive):
+        self._receive = receive
+        self._task: asyncio.Task | None = None
+        self._awaiting_upstream = False
+        self.disconnected = False
+
+    async def _watch(self) -> None:
+        while (await self._receive())["type"] != "http.disconnect":
+            pass
+        self.disconnected = True
+        if self._awaiting_upstream and self._task is not None:
+            self._task.cancel()
+
+    async def iterate(self, upstream: AsyncGenerator[T]) -> AsyncGenerator[T]:
+        self._task = asyncio.current_task()
+        watcher = asyncio.create_task(self._watch())
+        try:
+            while not self.disconnected:
+                self._awaiting_upstream = True
+                try:
+                    item = await anext(upstream)
+                except StopAsyncIteration:
+                    return
+                except asyncio.CancelledError:
+                    # Swallow only our own cancellation, not a server shutdown.
+                    if self.disconnected and self._task.uncancel() == 0:
+                        return
+                    raise
+                finally:
+                    self._awaiting_upstream = False
+                yield item
+        finally:
+            watcher.cancel()
+            await upstream.aclose()
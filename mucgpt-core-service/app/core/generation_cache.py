@@ -0,0 +1,92 @@
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import Any, Protocol
+
+from pydantic import BaseModel
+
+from config.settings import get_settings
+from core.cache import RedisCache
+from core.logtools import getLogger
+from core.metrics import Metrics
+from core.prompt_pool import PromptPool
+
+logger = getLogger()
+
+_CACHE_KEY_PREFIX = "mucgpt:internal-generation:v1:"
+_REQUESTS_METRIC = "mucgpt_generation_cache_requests_total"
+
+
+class _MessageLike(Protocol):
+    role: str
+    content: str
+
+
+def _normalize_content(content: str) -> str:
+    return content.replace("\r\n", "\n").strip()
+
+
+class GenerationCache:
+    """Exact-match cache for deterministic (temperature 0) internal generations.
+
+    Entries are keyed by model, prompt pool version, normalized messages,
+    output-shaping options such as ``max_tokens`` and, for structured
+    generations, the JSON schema of the expected output. Any
+    Redis failure is treated as a cache miss so generation never depends on
+    the cache being available.
+    """
+
+    @staticmethod
+    def is_applicable(temperature: float, enabled: bool = True) -> bool:
+        return enabled and temperature == 0 and get_settings().GENERATION_CACHE_ENABLED
+
+    @staticmethod
+    def build_key(
+        *,
+        model_name: str,
+        messages: Sequence[_MessageLike],
+        schema: type[BaseModel] | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> str:
+        payload = {
+            "model": model_name,
+            "prompt_pool": PromptPool.version(),
+            "messages": [
+                [message.role, _normalize_content(message.content)]
+                for message in messages
+            ],
+            "schema": schema.model_json_schema() if schema is not None else None,
+            "options": options or {},
+        }
+        digest = hashlib.sha256(
+            json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        return f"{_CACHE_KEY_PREFIX}{digest}"
+
+    @staticmethod
+    async def get(key: str, task: str) -> Any | None:
+        """Return the cached value for ``key`` or ``None`` on miss/failure."""
+        try:
+            value = await RedisCache.get_object(key)
+        except Exception:
+            logger.warning("Generation cache lookup failed", exc_info=True)
+            value = None
+        Metrics.inc(
+            _REQUESTS_METRIC, result="hit" if value is not None else "miss", task=task
+        )
+        return value
+
+    @staticmethod
+    async def set(key: str, value: str | dict[str, Any]) -> None:
+        """Store ``value`` unless it exceeds the configured entry size limit."""
+        settings = get_settings()
+        size = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        if size > settings.GENERATION_CACHE_MAX_ENTRY_BYTES:
+            logger.debug("Skipping generation cache write for %d byte entry", size)
+            return
+        try:
+            await RedisCache.set_object(
+                key, value, ttl=settings.GENERATION_CACHE_TTL_SECONDS
+            )
+        except Exception:
+            logger.warning("Generation cache write failed", exc_info=True)
@@ -1,8 +1,8 @@
 import hashlib
 import re
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from pathlib import Path
-from typing import Any, Protocol
+from typing import Any, Protocol, cast
 
 from fastapi import HTTPException
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
@@ -12,12 +12,13 @@ from pydantic import BaseModel
 
 from config.langfuse_provider import LangfuseProvider
 from config.model_provider import ModelRegistry
-from config.settings import Settings
+from config.settings import Settings, get_model_config
 from core.auth_models import AuthenticationResult
+from core.generation_cache import GenerationCache
 from core.logtools import getLogger
+from core.prompt_pool import PROMPT_POOL_DIR, PromptPool
 
 logger = getLogger()
-PROMPT_POOL_DIR = Path(__file__).resolve().parents[1] / "agent/prompt_pool"
 GENERATION_PROMPTS_DIR = PROMPT_POOL_DIR / "generation_prompts"
 COMPLIANCE_PROMPTS_DIR = PROMPT_POOL_DIR / "compliance_prompts"
 
@@ -90,12 +91,15 @@ def get_internal_task_model(
 
 
 def read_prompt_file(prompt_directory: Path, filename: str) -> str:
-    """Read a prompt template from a known prompt directory."""
+    """Return a prompt template from a known prompt directory.
+
+    Served from the in-memory ``PromptPool``; no disk I/O on the request path.
+    """
 
     path = prompt_directory / filename
     try:
-        return path.read_text(encoding="utf-8")
-    except FileNotFoundError as exc:  # pragma: no cover - misconfiguration
+        return PromptPool.get(path.relative_to(PROMPT_POOL_DIR).as_posix())
+    except (KeyError, ValueError) as exc:  # pragma: no cover - misconfiguration
         logger.error("Prompt file not found: %s", path)
         raise HTTPException(
             status_code=500,
@@ -109,6 +113,7 @@ def _internal_request_config(
     temperature: float,
     user_info: AuthenticationResult,
     run_name: str,
+    streaming: bool = False,
 ) -> RunnableConfig:
     callbacks = []
     langfuse_handler = LangfuseProvider.get_callback_handler()
@@ -118,16 +123,43 @@ def _internal_request_config(
     return RunnableConfig(
         run_name=run_name,
         callbacks=callbacks if callbacks else None,  # type: ignore[arg-type]
+        metadata={"prompt_pool_version": PromptPool.version()},
         configurable={
             "llm": model_name,
             "llm_temperature": temperature,
-            "llm_streaming": False,
+            "llm_streaming": streaming,
             "user_info": user_info,
             "llm_user": extract_department_prefix(user_info.department),
         },
     )
 
 
+def _internal_model_settings(
+    *,
+    model_name: str,
+    temperature: float,
+    user_info: AuthenticationResult,
+    stream: bool = False,
+    max_tokens: int | None = None,
+    stop: list[str] | None = None,
+) -> dict[str, Any]:
+    model_settings: dict[str, Any] = {
+        "temperature": temperature,
+        "stream": stream,
+    }
+    llm_user = extract_department_prefix(user_info.department)
+    if llm_user is not None:
+        model_settings["user"] = llm_user
+    model_config = get_model_config(model_name)
+    if model_config is not None:
+        max_tokens = model_config.clamp_max_tokens(max_tokens)
+    if max_tokens is not None:
+        model_settings["max_tokens"] = max_tokens
+    if stop:
+        model_settings["stop"] = stop
+    return model_settings
+
+
 async def invoke_internal_generation(
     *,
     model_name: str,
@@ -136,8 +168,27 @@ async def invoke_internal_generation(
     user_info: AuthenticationResult,
     trace_tags: list[str],
     run_name: str,
+    cache: bool = True,
+    max_tokens: int | None = None,
+    stop: list[str] | None = None,
 ) -> str:
-    """Invoke an internal model for text generation with tracing metadata."""
+    """Invoke an internal model for text generation with tracing metadata.
+
+    Deterministic calls (temperature 0) are served from the ``GenerationCache``
+    when possible; pass ``cache=False`` to always call the model. ``max_tokens``
+    is capped at the model's ``max_output_tokens``.
+    """
+
+    cache_key = None
+    if GenerationCache.is_applicable(temperature, cache):
+        cache_key = GenerationCache.build_key(
+            model_name=model_name,
+            messages=messages,
+            options={"max_tokens": max_tokens, "stop": stop},
+        )
+        cached = await GenerationCache.get(cache_key, task=run_name)
+        if isinstance(cached, str):
+            return cached
 
     run_config = _internal_request_config(
         model_name=model_name,
@@ -145,13 +196,13 @@ async def invoke_internal_generation(
         user_info=user_info,
         run_name=run_name,
     )
-    model_settings: dict[str, Any] = {
-        "temperature": temperature,
-        "stream": False,
-    }
-    llm_user = extract_department_prefix(user_info.department)
-    if llm_user is not None:
-        model_settings["user"] = llm_user
+    model_settings = _internal_model_settings(
+        model_name=model_name,
+        temperature=temperature,
+        user_info=user_info,
+        max_tokens=max_tokens,
+        stop=stop,
+    )
     model = ModelRegistry.get_model(model_name)
     model_settings = ModelRegistry.normalize_model_settings(model, model_settings)
     llm = model.bind(**model_settings)
@@ -161,7 +212,53 @@ async def invoke_internal_generation(
     ):
         ai_message = await llm.ainvoke(to_langchain_messages(messages), config=run_config)
 
-    return extract_message_content(ai_message.content)
+    content = extract_message_content(ai_message.content)
+    if cache_key is not None:
+        await GenerationCache.set(cache_key, content)
+    return content
+
+
+async def stream_internal_generation(
+    *,
+    model_name: str,
+    temperature: float,
+    messages: Sequence[MessageLike],
+    user_info: AuthenticationResult,
+    trace_tags: list[str],
+    run_name: str,
+    max_tokens: int | None = None,
+    stop: list[str] | None = None,
+) -> AsyncIterator[str]:
+    """Stream an internal text generation, yielding non-empty content deltas."""
+
+    run_config = _internal_request_config(
+        model_name=model_name,
+        temperature=temperature,
+        user_info=user_info,
+        run_name=run_name,
+        streaming=True,
+    )
+    model_settings = _internal_model_settings(
+        model_name=model_name,
+        temperature=temperature,
+        user_info=user_info,
+        stream=True,
+        max_tokens=max_tokens,
+        stop=stop,
+    )
+    model = ModelRegistry.get_model(model_name)
+    model_settings = ModelRegistry.normalize_model_settings(model, model_settings)
+    llm = model.bind(**model_settings)
+    with propagate_attributes(
+        user_id=hash_user_id(user_info.user_id),
+        tags=trace_tags,
+    ):
+        async for chunk in llm.astream(
+            to_langchain_messages(messages), config=run_config
+        ):
+            delta = extract_message_content(chunk.content)
+            if delta:
+                yield delta
 
 
 async def invoke_internal_structured_generation[StructuredOutputT: BaseModel](
@@ -173,8 +270,26 @@ async def invoke_internal_structured_generation[StructuredOutputT: BaseModel](
     trace_tags: list[str],
     run_name: str,
     schema: type[StructuredOutputT],
+    cache: bool = True,
+    max_tokens: int | None = None,
 ) -> StructuredOutputT:
-    """Invoke an internal model and validate its response against a Pydantic schema."""
+    """Invoke an internal model and validate its response against a Pydantic schema.
+
+    Deterministic calls (temperature 0) are served from the ``GenerationCache``
+    when possible; pass ``cache=False`` to always call the model.
+    """
+
+    cache_key = None
+    if GenerationCache.is_applicable(temperature, cache):
+        cache_key = GenerationCache.build_key(
+            model_name=model_name,
+            messages=messages,
+            schema=schema,
+            options={"max_tokens": max_tokens},
+        )
+        cached = await GenerationCache.get(cache_key, task=run_name)
+        if isinstance(cached, dict):
+            return schema.model_validate(cached)
 
     run_config = _internal_request_config(
         model_name=model_name,
@@ -182,13 +297,12 @@ async def invoke_internal_structured_generation[StructuredOutputT: BaseModel](
         user_info=user_info,
         run_name=run_name,
     )
-    model_settings: dict[str, Any] = {
-        "temperature": temperature,
-        "stream": False,
-    }
-    llm_user = extract_department_prefix(user_info.department)
-    if llm_user is not None:
-        model_settings["user"] = llm_user
+    model_settings = _internal_model_settings(
+        model_name=model_name,
+        temperature=temperature,
+        user_info=user_info,
+        max_tokens=max_tokens,
+    )
     model = ModelRegistry.get_model(model_name)
     model_settings = ModelRegistry.normalize_model_settings(model, model_settings)
     llm = model.with_structured_output(schema).bind(**model_settings)
@@ -196,4 +310,11 @@ async def invoke_internal_structured_generation[StructuredOutputT: BaseModel](
         user_id=hash_user_id(user_info.user_id),
         tags=trace_tags,
     ):
-        return await llm.ainvoke(to_langchain_messages(messages), config=run_config) # type: ignore
+        result = cast(
+            StructuredOutputT,
+            await llm.ainvoke(to_langchain_messages(messages), config=run_config),
+        )
+
+    if cache_key is not None:
+        await GenerationCache.set(cache_key, result.model_dump(mode="json"))
+    return result
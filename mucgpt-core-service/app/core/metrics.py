@@ -0,0 +1,133 @@
+import bisect
+import threading
+from collections import defaultdict
+
+LabelSet = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+def _label_set(labels: dict[str, str]) -> LabelSet:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """Minimal in-process metrics registry rendered in Prometheus text format.
+
+    Counters and histograms are created on first use and identified by name
+    plus label values. Values are process-local; with several workers each
+    process reports its own series.
+    """
+
+    _lock = threading.Lock()
+    _counters: dict[str, dict[LabelSet, float]] = defaultdict(dict)
+    _histograms: dict[str, dict[LabelSet, _Histogram]] = defaultdict(dict)
+
+    @classmethod
+    def inc(cls, name: str, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter ``name`` for the given labels by ``amount``."""
+        key = _label_set(labels)
+        with cls._lock:
+            series = cls._counters[name]
+            series[key] = series.get(key, 0.0) + amount
+
+    @classmethod
+    def observe(
+        cls,
+        name: str,
+        value: float,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        **labels: str,
+    ) -> None:
+        """Record ``value`` in the histogram ``name`` for the given labels."""
+        key = _label_set(labels)
+        with cls._lock:
+            series = cls._histograms[name]
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    @classmethod
+    def value(cls, name: str, **labels: str) -> float:
+        """Return the current counter value (or histogram count) for ``name``."""
+        key = _label_set(labels)
+        with cls._lock:
+            if name in cls._counters:
+                return cls._counters[name].get(key, 0.0)
+            histogram = cls._histograms.get(name, {}).get(key)
+            return float(histogram.count) if histogram else 0.0
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._counters.clear()
+            cls._histograms.clear()
+
+    @classmethod
+    def render(cls) -> str:
+        """Render all series in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with cls._lock:
+            for name, series in sorted(cls._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in series.items():
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+            for name, series in sorted(cls._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(
+                        histogram.buckets, histogram.counts, strict=True
+                    ):
+                        cumulative += count
+                        bucket_labels = _format_labels((*labels, ("le", str(bound))))
+                        lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                    inf_labels = _format_labels((*labels, ("le", "+Inf")))
+                    lines.append(f"{name}_bucket{inf_labels} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+                    lines.append(
+                        f"{name}_count{_format_labels(labels)} {histogram.count}"
+                    )
+        return "\n".join(lines) + "\n"
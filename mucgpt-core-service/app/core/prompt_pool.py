@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
+
+from core.logtools import getLogger
+
+logger = getLogger()
+
+PROMPT_POOL_DIR = Path(__file__).resolve().parents[1] / "agent/prompt_pool"
+
+
+class PromptPool:
+    """In-memory registry of all prompt templates in ``agent/prompt_pool``.
+
+    Prompts are read once (at warmup or on first access) into an immutable
+    mapping keyed by their POSIX path relative to the pool directory, e.g.
+    ``generation_prompts/prompt_for_title.md``. A reload swaps the whole
+    snapshot at once, so readers never observe a half-updated pool.
+    """
+
+    _directory: Path = PROMPT_POOL_DIR
+    _prompts: Mapping[str, str] | None = None
+    _version: str = ""
+    _mtimes: dict[str, int] = {}
+    _watch_task: asyncio.Task | None = None
+
+    @classmethod
+    def load(cls, directory: Path | None = None) -> None:
+        """(Re)load every ``*.md`` file below the pool directory."""
+        if directory is not None:
+            cls._directory = directory
+
+        prompts: dict[str, str] = {}
+        mtimes: dict[str, int] = {}
+        for path in sorted(cls._directory.rglob("*.md")):
+            key = path.relative_to(cls._directory).as_posix()
+            prompts[key] = path.read_text(encoding="utf-8")
+            mtimes[key] = path.stat().st_mtime_ns
+
+        digest = hashlib.sha256()
+        for key, content in prompts.items():
+            digest.update(key.encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(content.encode("utf-8"))
+            digest.update(b"\0")
+
+        cls._prompts = MappingProxyType(prompts)
+        cls._mtimes = mtimes
+        cls._version = digest.hexdigest()[:16]
+        logger.info(
+            "Loaded %d prompt(s) from prompt pool (version %s)",
+            len(prompts),
+            cls._version,
+        )
+
+    @classmethod
+    def get(cls, name: str) -> str:
+        """Return the prompt stored under ``name`` (path relative to the pool).
+
+        Raises:
+            KeyError: If no prompt with that name exists in the pool.
+        """
+        if cls._prompts is None:
+            cls.load()
+        return cls._prompts[name]  # type: ignore[index]
+
+    @classmethod
+    def version(cls) -> str:
+        """Return a short content hash identifying the loaded prompt set.
+
+        The hash changes whenever any prompt file is added, removed or edited,
+        which makes it suitable as part of cache keys and trace metadata.
+        """
+        if cls._prompts is None:
+            cls.load()
+        return cls._version
+
+    @classmethod
+    def _has_changed(cls) -> bool:
+        current = {
+            path.relative_to(cls._directory).as_posix(): path.stat().st_mtime_ns
+            for path in cls._directory.rglob("*.md")
+        }
+        return current != cls._mtimes
+
+    @classmethod
+    async def _watch(cls, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if await asyncio.to_thread(cls._has_changed):
+                    await asyncio.to_thread(cls.load)
+            except Exception:
+                logger.warning("Failed to hot reload prompt pool", exc_info=True)
+
+    @classmethod
+    def start_watching(cls, interval: float) -> None:
+        """Poll the pool directory for mtime changes and reload on change."""
+        if cls._watch_task is not None and not cls._watch_task.done():
+            return
+        cls._watch_task = asyncio.create_task(cls._watch(interval))
+        logger.info("Prompt pool hot reload enabled (interval %.1fs)", interval)
+
+    @classmethod
+    async def stop_watching(cls) -> None:
+        """Cancel the hot reload task if it is running."""
+        task, cls._watch_task = cls._watch_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,191 @@
+"""Two-tier cache: a bounded in-process LRU (L1) in front of ``RedisCache`` (L2).
+
+Writes and invalidations are announced on a Redis pub/sub channel shared by
+all replicas of both services, which drop the key from their L1 as soon as
+the message arrives. The L1 TTL bounds staleness while the listener is
+reconnecting.
+
+L1 hands out the same object to every caller, so cached values must be
+treated as read-only.
+
+While Redis is unreachable reads are served from L1 or reported as misses
+and writes only land in L1, so callers continue on their uncached path.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from core.cache import RedisCache
+from core.logtools import getLogger
+from core.metrics import Metrics
+
+logger = getLogger("mucgpt-core")
+
+INVALIDATION_CHANNEL = "mucgpt:cache:invalidate"
+_REQUESTS_METRIC = "mucgpt_tiered_cache_requests_total"
+_RECONNECT_DELAY_SECONDS = 1.0
+# Upper bound for one wait on the channel. Unlike a blocking ``listen()``, which
+# reads with the client's socket timeout and fails on an idle channel, an empty
+# poll just returns None.
+_POLL_SECONDS = 5.0
+
+
+class TieredCache:
+    _redis_settings = RedisCache._redis_settings
+    _instance_id = uuid.uuid4().hex
+    _entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+    _listener_task: asyncio.Task | None = None
+
+    @classmethod
+    def _get_local(cls, key: str) -> Any | None:
+        entry = cls._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del cls._entries[key]
+            return None
+        cls._entries.move_to_end(key)
+        return value
+
+    @classmethod
+    def _set_local(cls, key: str, value: Any, local_ttl: float | None) -> None:
+        max_entries = cls._redis_settings.LOCAL_CACHE_MAX_ENTRIES
+        ttl = cls._redis_settings.LOCAL_CACHE_TTL_SECONDS
+        if local_ttl is not None:
+            ttl = min(ttl, local_ttl)
+        if not max_entries or ttl <= 0:
+            return
+        cls._entries[key] = (time.monotonic() + ttl, value)
+        cls._entries.move_to_end(key)
+        while len(cls._entries) > max_entries:
+            cls._entries.popitem(last=False)
+
+    @classmethod
+    def drop_local(cls, key: str) -> None:
+        cls._entries.pop(key, None)
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._entries.clear()
+
+    @classmethod
+    async def get(
+        cls, key: str, namespace: str, local_ttl: float | None = None
+    ) -> Any | None:
+        """
+        Get an object from L1, falling back to Redis.
+        :param key: The key the object is stored under.
+        :param namespace: Label for the hit rate metrics.
+        :param local_ttl: Keep a value read from Redis at most this long in L1 (s).
+        :return: The cached object or None on a miss.
+        """
+        value = cls._get_local(key)
+        if value is not None:
+            Metrics.inc(_REQUESTS_METRIC, namespace=namespace, tier="l1")
+            return value
+        try:
+            value = await RedisCache.get_object(key)
+        except RedisCache.UNAVAILABLE_ERRORS:
+            logger.debug("Redis unavailable; treating %s as a cache miss", key)
+            value = None
+        if value is None:
+            Metrics.inc(_REQUESTS_METRIC, namespace=namespace, tier="miss")
+            return None
+        Metrics.inc(_REQUESTS_METRIC, namespace=namespace, tier="l2")
+        cls._set_local(key, value, local_ttl)
+        return value
+
+    @classmethod
+    async def set(
+        cls,
+        key: str,
+        obj: Any,
+        ttl: int | None = None,
+        local_ttl: float | None = None,
+    ) -> None:
+        """
+        Store an object in Redis and L1 and drop it from the L1 of other replicas.
+        :param ttl: Redis time-to-live in s (default: never).
+        :param local_ttl: Upper bound for the L1 time-to-live in s; 0 skips L1.
+        """
+        try:
+            await RedisCache.set_object(key=key, obj=obj, ttl=ttl)
+        except RedisCache.UNAVAILABLE_ERRORS:
+            logger.debug("Redis unavailable; caching %s in process only", key)
+        bounds = [bound for bound in (ttl, local_ttl) if bound is not None]
+        cls._set_local(key, obj, min(bounds) if bounds else None)
+        await cls._publish(key)
+
+    @classmethod
+    async def invalidate(cls, key: str) -> None:
+        """Delete ``key`` from Redis and from the L1 of every replica."""
+        cls.drop_local(key)
+        async with RedisCache.connection() as redis:
+            await redis.delete(key)
+        await cls._publish(key)
+
+    @classmethod
+    async def _publish(cls, key: str) -> None:
+        try:
+            async with RedisCache.connection() as redis:
+                await redis.publish(INVALIDATION_CHANNEL, f"{cls._instance_id} {key}")
+        except Exception:
+            logger.warning("Failed to publish cache invalidation", exc_info=True)
+
+    @classmethod
+    def _handle_message(cls, data: bytes | str) -> None:
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        instance_id, _, key = data.partition(" ")
+        if instance_id != cls._instance_id:
+            cls.drop_local(key)
+
+    @classmethod
+    async def _listen(cls) -> None:
+        while True:
+            pubsub = None
+            try:
+                await RedisCache.init_redis()
+                redis = await RedisCache.get_redis()
+                pubsub = redis.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Invalidations may have been missed while disconnected.
+                cls.reset()
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=_POLL_SECONDS
+                    )
+                    if message is not None and message.get("type") == "message":
+                        cls._handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "Cache invalidation listener disconnected; retrying", exc_info=True
+                )
+                await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+            finally:
+                if pubsub is not None:
+                    await pubsub.aclose()
+
+    @classmethod
+    def start_listener(cls) -> None:
+        """Subscribe to invalidations of other replicas in the background."""
+        if cls._listener_task is not None and not cls._listener_task.done():
+            return
+        cls._listener_task = asyncio.create_task(cls._listen())
+
+    @classmethod
+    async def stop_listener(cls) -> None:
+        task, cls._listener_task = cls._listener_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
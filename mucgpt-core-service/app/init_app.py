@@ -1,23 +1,53 @@
-from typing import Any
+from __future__ import annotations
+
+import asyncio
+import importlib
+import os
+from typing import TYPE_CHECKING, Any
 
-from agent.agent_executor import MUCGPTAgentExecutor
-from agent.deep_agent import MUCGPTAgent
-from agent.tools.tools import ToolCollection
-from config.harness_profiles import register_model_harness_profile
 from config.langfuse_provider import LangfuseProvider
+from config.model_metadata import ModelMetadataLoader
 from config.model_provider import ModelRegistry
 from config.settings import (
+    ParserBackendType,
     Settings,
-    enrich_model_metadata,
     get_langfuse_settings,
     get_settings,
 )
 from core.auth_models import AuthenticationResult
 from core.cache import RedisCache
 from core.logtools import getLogger
+from core.prompt_pool import PromptPool
+from core.tiered_cache import TieredCache
+from parsing.local import LocalBackend
+from parsing.xberg import XbergBackend
+
+if TYPE_CHECKING:
+    from agent.agent_executor import MUCGPTAgentExecutor
 
 logger = getLogger()
 
+# Set by ``preload_app`` in the supervisor and inherited by its worker processes.
+PRELOADED_ENV = "MUCGPT_CORE_PRELOADED"
+
+# Deep Agents, LangGraph and the MCP adapters take seconds to import. They are
+# loaded in ``warmup_app`` instead of at import time, so the process starts (and
+# tests collect) without them and the first request still finds them loaded.
+_AGENT_MODULES = (
+    "agent.agent_executor",
+    "agent.checkpointer",
+    "agent.deep_agent",
+    "agent.tools.tool_metadata",
+    "agent.tools.tools",
+)
+
+_ready = False
+
+
+def is_ready() -> bool:
+    """Whether ``warmup_app`` completed and shutdown has not started yet."""
+    return _ready
+
 
 class ModelOptions:
     """Helper class for model initialization options."""
@@ -44,17 +74,46 @@ class ModelOptions:
         self.custom_model = custom_model
 
 
+def preload_app() -> None:
+    """Run shared startup checks and I/O once, before workers are spawned.
+
+    Workers import the app themselves, so no in-process state is inherited.
+    Settings and prompt templates are loaded here only to fail fast on broken
+    configuration before spawning workers. The model info snapshot is
+    refreshed, so workers start from it without querying the model info
+    endpoints. Connections (Redis, HTTP clients, Langfuse) are created per
+    worker in ``warmup_app``.
+    """
+    settings = get_settings()
+    # Fail fast on broken templates before spawning workers; each worker loads its own pool.
+    PromptPool.load()
+    if settings.MODEL_INFO_SNAPSHOT_PATH is not None:
+        asyncio.run(
+            ModelMetadataLoader.preload(
+                settings.MODELS, settings.MODEL_INFO_SNAPSHOT_PATH
+            )
+        )
+    os.environ[PRELOADED_ENV] = "1"
+
+
 async def warmup_app() -> None:
+    global _ready
     logger.info("Warming up app context...")
     settings = get_settings()
+    # preload prompt templates
+    PromptPool.load()
+    if settings.PROMPT_POOL_HOT_RELOAD:
+        PromptPool.start_watching(settings.PROMPT_POOL_RELOAD_INTERVAL_SECONDS)
     # init model metadata
-    _initialize_models_metadata(settings)
+    await _initialize_models_metadata(settings)
     # init model
     ModelRegistry.init_models(
         models_config=settings.MODELS,
         logger=logger,
     )
     # Register model-specific Deep Agents harness profiles.
+    from config.harness_profiles import register_model_harness_profile
+
     for model_config in settings.MODELS:
         register_model_harness_profile(model_config)
     # init langfuse
@@ -62,11 +121,25 @@ async def warmup_app() -> None:
     LangfuseProvider.init(version=settings.VERSION, langfuse_cfg=langfuse_settings)
     # init redis
     await RedisCache.init_redis()
+    TieredCache.start_listener()
+    # init pooled parser client
+    if settings.PARSER_BACKEND == ParserBackendType.XBERG:
+        XbergBackend.init_client()
+    for module in _AGENT_MODULES:
+        importlib.import_module(module)
+    _ready = True
     logger.info("App context warmed up")
 
 
 async def destroy_app() -> None:
+    global _ready
+    _ready = False
     logger.info("Cleaning up app context...")
+    await PromptPool.stop_watching()
+    await ModelMetadataLoader.stop_refresh()
+    await XbergBackend.close_client()
+    LocalBackend.close_executor()
+    await TieredCache.stop_listener()
     # close redis
     try:
         redis = await RedisCache.get_redis()
@@ -75,34 +148,40 @@ async def destroy_app() -> None:
         pass
 
 
-def _initialize_models_metadata(cfg: Settings) -> None:
+async def _initialize_models_metadata(cfg: Settings) -> None:
     """Ensure all configured models have complete metadata before use."""
 
-    for model in cfg.MODELS:
-        try:
-            enrich_model_metadata(model)
-        except ValueError as exc:
-            logger.error(
-                "Unable to prepare model %s for %s: %s",
-                getattr(model, "llm_name", "<unknown>"),
-                cfg.ENV_NAME,
-                exc,
-            )
-            raise
+    try:
+        await ModelMetadataLoader.initialize(
+            cfg.MODELS,
+            cfg.MODEL_INFO_SNAPSHOT_PATH,
+            refresh=os.environ.get(PRELOADED_ENV) != "1",
+        )
+    except ValueError as exc:
+        logger.error("Unable to prepare models for %s: %s", cfg.ENV_NAME, exc)
+        raise
 
 
 async def init_agent(
-    user_info: AuthenticationResult, model_name: str | None = None
+    user_info: AuthenticationResult,
+    model_name: str | None = None,
+    conversation_id: str | None = None,
 ) -> MUCGPTAgentExecutor:
     """Initialize a MUCGPTAgentExecutor with configuration.
 
     Args:
         cfg: Backend configuration
         user_info: The user to create the Agent for
+        conversation_id: Enables the configured agent checkpointer for this conversation
 
     Returns:
         Configured MUCGPTAgentExecutor
     """
+    from agent.agent_executor import MUCGPTAgentExecutor
+    from agent.checkpointer import AgentCheckpointer
+    from agent.deep_agent import MUCGPTAgent
+    from agent.tools.tools import ToolCollection
+
     try:
         model = ModelRegistry.get_model(model_name)
         tool_collection = ToolCollection(model=model)
@@ -110,9 +189,14 @@ async def init_agent(
             user_info=user_info
         )  # all tools that are available
         logger.debug(
-            f"Initializing MUCGPTAgent with tools: {[tool.name for tool in tools]}"
+            "Initializing MUCGPTAgent with tools: %s", [tool.name for tool in tools]
+        )
+        agent = MUCGPTAgent(
+            llm=model,
+            tools=tools,
+            debug=False,
+            checkpointer=AgentCheckpointer.get() if conversation_id else None,
         )
-        agent = MUCGPTAgent(llm=model, tools=tools, debug=False)
     except Exception as e:
         logger.error("Failed to initialize MUCGPTAgent: %s", e)
         raise
@@ -1,11 +1,31 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 
 from fastapi import UploadFile
 
 
+@dataclass
+class PageSpan:
+    """Character range ``[start, end)`` of one page within the document content."""
+
+    page_number: int
+    start: int
+    end: int
+
+
+@dataclass
+class ParsedDocument:
+    content: str
+    pages: list[PageSpan] = field(default_factory=list)
+
+
 class ParserBackend(ABC):
     """Abstract base class for file parsing backends."""
 
+    #: Identifies the backend in parse cache keys.
+    name: str = "parser"
+
     @abstractmethod
     async def parse(self, file: UploadFile) -> str:
         """Parse the uploaded file and return the extracted content as a string.
@@ -16,3 +36,35 @@ class ParserBackend(ABC):
         Returns:
             The extracted text content as a string.
         """
+
+    async def parse_document(self, file: UploadFile) -> ParsedDocument:
+        """Parse the uploaded file keeping page boundaries where the backend
+        reports them. The default returns the content without pages.
+        """
+        return ParsedDocument(content=await self.parse(file))
+
+    async def parse_batch(self, files: Sequence[UploadFile]) -> list[str]:
+        """Parse several files, returning their contents in the same order.
+
+        Backends that can extract several files in one request override this;
+        the default parses the files one after another.
+        """
+        return [await self.parse(file) for file in files]
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an uploaded file exceeds the configured size limit."""
+
+    def __init__(self, filename: str | None, limit: int):
+        super().__init__(f"File '{filename}' exceeds the upload limit of {limit} bytes")
+        self.filename = filename
+        self.limit = limit
+
+
+class UnsupportedFileTypeError(ValueError):
+    """Raised when a backend cannot parse files of the given MIME type."""
+
+    def __init__(self, filename: str | None, mime_type: str):
+        super().__init__(f"File type '{mime_type}' of '{filename}' is not supported")
+        self.filename = filename
+        self.mime_type = mime_type
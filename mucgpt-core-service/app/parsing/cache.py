@@ -0,0 +1,112 @@
+import hashlib
+import zlib
+
+from fastapi import UploadFile
+
+from config.settings import get_settings
+from core.cache import RedisCache
+from core.logtools import getLogger
+from core.metrics import Metrics
+from parsing.base import PageSpan, ParsedDocument
+from parsing.local import detect_mime_type
+
+logger = getLogger()
+
+_CACHE_KEY_PREFIX = "mucgpt:parse:v1:"
+_REQUESTS_METRIC = "mucgpt_parse_cache_requests_total"
+_BYTES_SAVED_METRIC = "mucgpt_parse_cache_bytes_saved_total"
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ParseCache:
+    """Content-addressed cache of extracted text for uploaded files.
+
+    Entries are keyed by the SHA-256 of the uploaded bytes, the detected MIME
+    type, the parser backend and ``PARSE_CACHE_VERSION``, so re-uploads of the
+    same document skip the parser entirely. The MIME type is part of the key
+    because it decides how the bytes are parsed, e.g. which backend
+    ``RoutingBackend`` picks. Texts above ``PARSE_CACHE_COMPRESSION_MIN_BYTES``
+    are stored zlib-compressed. Entries expire ``PARSE_CACHE_TTL_SECONDS``
+    after their last hit; Redis evicts under memory pressure according to
+    its configured policy. Any Redis failure is treated as a cache miss.
+    """
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return get_settings().PARSE_CACHE_ENABLED
+
+    @staticmethod
+    async def build_key(file: UploadFile, backend: str) -> str:
+        """Hash the upload chunk by chunk from its spool and rewind it."""
+        digest = hashlib.sha256()
+        await file.seek(0)
+        while chunk := await file.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        await file.seek(0)
+        version = get_settings().PARSE_CACHE_VERSION
+        mime_type = detect_mime_type(file)
+        return (
+            f"{_CACHE_KEY_PREFIX}{backend}:{version}:{mime_type}:{digest.hexdigest()}"
+        )
+
+    @staticmethod
+    async def get(key: str, upload_bytes: int | None = None) -> str | None:
+        """Return the cached text for ``key`` or ``None`` on miss/failure."""
+        document = await ParseCache.get_document(key, upload_bytes=upload_bytes)
+        return document.content if document is not None else None
+
+    @staticmethod
+    async def get_document(
+        key: str, upload_bytes: int | None = None
+    ) -> ParsedDocument | None:
+        """Return the cached document for ``key`` or ``None`` on miss/failure."""
+        try:
+            entry = await RedisCache.get_object(key)
+        except Exception:
+            logger.warning("Parse cache lookup failed", exc_info=True)
+            entry = None
+        if not isinstance(entry, dict):
+            Metrics.inc(_REQUESTS_METRIC, result="miss")
+            return None
+
+        try:
+            async with RedisCache.connection() as redis:
+                await redis.expire(key, get_settings().PARSE_CACHE_TTL_SECONDS)
+        except Exception:
+            logger.debug("Parse cache TTL refresh failed", exc_info=True)
+        data = entry["data"]
+        if entry.get("compressed"):
+            data = zlib.decompress(data)
+        Metrics.inc(_REQUESTS_METRIC, result="hit")
+        if upload_bytes:
+            Metrics.inc(_BYTES_SAVED_METRIC, amount=upload_bytes)
+        return ParsedDocument(
+            content=data.decode("utf-8"),
+            pages=[PageSpan(*page) for page in entry.get("pages") or []],
+        )
+
+    @staticmethod
+    async def set(key: str, text: str, pages: list[PageSpan] | None = None) -> None:
+        """Store ``text`` unless it exceeds the configured entry size limit."""
+        settings = get_settings()
+        data = text.encode("utf-8")
+        compressed = len(data) >= settings.PARSE_CACHE_COMPRESSION_MIN_BYTES
+        if compressed:
+            data = zlib.compress(data, level=6)
+        if len(data) > settings.PARSE_CACHE_MAX_ENTRY_BYTES:
+            logger.debug("Skipping parse cache write for %d byte entry", len(data))
+            return
+        try:
+            await RedisCache.set_object(
+                key,
+                {
+                    "compressed": compressed,
+                    "data": data,
+                    "pages": [
+                        (page.page_number, page.start, page.end) for page in pages or []
+                    ],
+                },
+                ttl=settings.PARSE_CACHE_TTL_SECONDS,
+            )
+        except Exception:
+            logger.warning("Parse cache write failed", exc_info=True)
@@ -0,0 +1,129 @@
+"""Split parsed documents into retrieval-sized chunks.
+
+Chunks follow the document structure: a Markdown heading always starts a
+new chunk, paragraphs are packed until ``max_tokens`` is reached and only
+paragraphs that are too long on their own are split, preferably at a
+sentence end. Every chunk records its character offsets into the parsed
+content, so callers can cite or re-assemble parts of a document.
+"""
+
+import bisect
+import re
+from dataclasses import dataclass
+
+from agent.token_budget import TokenCounter
+from parsing.base import PageSpan, ParsedDocument
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass
+class DocumentChunk:
+    index: int
+    content: str
+    start: int
+    end: int
+    tokens: int
+    heading: str | None = None
+    page_start: int | None = None
+    page_end: int | None = None
+
+
+def _paragraphs(content: str) -> list[tuple[int, int]]:
+    """Return ``(start, end)`` offsets of the non-empty paragraphs."""
+    spans = []
+    start = 0
+    for match in _PARAGRAPH_BREAK.finditer(content):
+        spans.append((start, match.start()))
+        start = match.end()
+    spans.append((start, len(content)))
+    return [(s, e) for s, e in spans if content[s:e].strip()]
+
+
+def _split_long(
+    content: str, start: int, end: int, max_tokens: int, counter: TokenCounter
+) -> list[tuple[int, int]]:
+    """Split one oversized paragraph, preferably at sentence ends."""
+    pieces: list[tuple[int, int]] = []
+    piece_start = start
+    last_break = None
+    for match in _SENTENCE_END.finditer(content, start, end):
+        if counter.count_text(content[piece_start : match.start()]) > max_tokens:
+            if last_break is not None:
+                pieces.append((piece_start, last_break[0]))
+                piece_start = last_break[1]
+        last_break = (match.start(), match.end())
+    pieces.append((piece_start, end))
+
+    # Sentences that still exceed the limit are cut by length.
+    result = []
+    for piece_start, piece_end in pieces:
+        tokens = counter.count_text(content[piece_start:piece_end])
+        if tokens <= max_tokens:
+            result.append((piece_start, piece_end))
+            continue
+        step = max((piece_end - piece_start) * max_tokens // tokens, 1)
+        result.extend(
+            (s, min(s + step, piece_end)) for s in range(piece_start, piece_end, step)
+        )
+    return result
+
+
+def _page_at(pages: list[PageSpan], starts: list[int], offset: int) -> int | None:
+    index = bisect.bisect_right(starts, offset) - 1
+    if index < 0 or offset >= pages[index].end:
+        return None
+    return pages[index].page_number
+
+
+def chunk_document(
+    document: ParsedDocument, max_tokens: int, counter: TokenCounter
+) -> list[DocumentChunk]:
+    """Split ``document`` into chunks of at most ``max_tokens`` tokens each."""
+    content = document.content
+    pieces: list[tuple[int, int, str | None]] = []
+    heading = None
+    for start, end in _paragraphs(content):
+        match = _HEADING.match(content[start:end].strip())
+        if match:
+            heading = match.group(2)
+        if counter.count_text(content[start:end]) > max_tokens:
+            pieces.extend(
+                (s, e, heading)
+                for s, e in _split_long(content, start, end, max_tokens, counter)
+            )
+        else:
+            pieces.append((start, end, heading))
+
+    groups: list[list[tuple[int, int, str | None]]] = []
+    group_tokens = 0
+    for start, end, piece_heading in pieces:
+        tokens = counter.count_text(content[start:end])
+        starts_section = bool(_HEADING.match(content[start:end].strip()))
+        if not groups or starts_section or group_tokens + tokens > max_tokens:
+            groups.append([])
+            group_tokens = 0
+        groups[-1].append((start, end, piece_heading))
+        group_tokens += tokens
+
+    pages = sorted(document.pages, key=lambda page: page.start)
+    page_starts = [page.start for page in pages]
+    chunks = []
+    for index, group in enumerate(groups):
+        start, end = group[0][0], group[-1][1]
+        text = content[start:end]
+        chunks.append(
+            DocumentChunk(
+                index=index,
+                content=text,
+                start=start,
+                end=end,
+                tokens=counter.count_text(text),
+                heading=group[0][2],
+                page_start=_page_at(pages, page_starts, start) if pages else None,
+                page_end=_page_at(pages, page_starts, end - 1) if pages else None,
+            )
+        )
+    return chunks
@@ -1,6 +1,8 @@
 from config.settings import ParserBackendType, get_settings
 from core.logtools import getLogger
 from parsing.base import ParserBackend
+from parsing.local import LocalBackend
+from parsing.routing import RoutingBackend
 from parsing.xberg import XbergBackend
 
 logger = getLogger()
@@ -10,7 +12,9 @@ def get_parser() -> ParserBackend | None:
     """Instantiate and return the configured parser backend, or ``None`` when
     document processing is disabled (``PARSER_BACKEND=none``).
 
-    The backend is selected via the ``PARSER_BACKEND`` setting.
+    The backend is selected via the ``PARSER_BACKEND`` setting. With Xberg,
+    MIME types routed to ``local`` in ``PARSER_ROUTES`` are parsed in-process
+    and everything else is sent to Xberg.
     """
     settings = get_settings()
     backend = settings.PARSER_BACKEND
@@ -19,8 +23,27 @@ def get_parser() -> ParserBackend | None:
         logger.info("Document processing disabled (PARSER_BACKEND=none)")
         return None
 
+    if backend == ParserBackendType.LOCAL:
+        logger.info("Using LocalBackend for parsing")
+        return LocalBackend()
+
     if backend == ParserBackendType.XBERG:
-        logger.info("Using XbergBackend for parsing")
-        return XbergBackend()
+        local_mime_types = {
+            mime_type
+            for mime_type, route in settings.PARSER_ROUTES.items()
+            if route == ParserBackendType.LOCAL
+        }
+        if not local_mime_types:
+            logger.info("Using XbergBackend for parsing")
+            return XbergBackend()
+        logger.info(
+            "Using XbergBackend for parsing, local parsing for %s",
+            ", ".join(sorted(local_mime_types)),
+        )
+        return RoutingBackend(
+            local=LocalBackend(),
+            fallback=XbergBackend(),
+            local_mime_types=local_mime_types,
+        )
 
     raise ValueError(f"Unknown parser backend: '{backend}'")
@@ -0,0 +1,214 @@
+"""In-process extractors for simple document formats.
+
+These formats carry their text more or less verbatim, so extracting them
+locally takes milliseconds instead of a round trip to the Xberg service.
+Extraction runs in a small thread pool to keep the event loop responsive
+for larger HTML files and e-mails.
+"""
+
+import asyncio
+import json
+import mimetypes
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from email import policy
+from email.message import EmailMessage
+from email.parser import BytesParser
+from html.parser import HTMLParser
+
+from fastapi import UploadFile
+
+from config.settings import get_settings
+from core.logtools import getLogger
+from parsing.base import ParserBackend, UnsupportedFileTypeError, UploadTooLargeError
+
+logger = getLogger()
+
+_GENERIC_MIME_TYPES = {"", "application/octet-stream", "binary/octet-stream"}
+_BLOCK_TAGS = {
+    "address",
+    "article",
+    "aside",
+    "blockquote",
+    "br",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "figcaption",
+    "footer",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "hr",
+    "li",
+    "main",
+    "nav",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "tr",
+    "ul",
+}
+_SKIPPED_TAGS = {"head", "noscript", "script", "style", "template"}
+
+
+def detect_mime_type(file: UploadFile) -> str:
+    """Return the upload's MIME type, guessed from its filename if generic."""
+    content_type = (file.content_type or "").split(";")[0].strip().lower()
+    if content_type in _GENERIC_MIME_TYPES and file.filename:
+        guessed, _ = mimetypes.guess_type(file.filename)
+        if guessed:
+            return guessed
+    return content_type or "application/octet-stream"
+
+
+def _decode(data: bytes) -> str:
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        # Typical for CSV exports from Windows office applications.
+        return data.decode("cp1252", errors="replace")
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+        elif tag in {"td", "th"}:
+            self.parts.append("\t")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+    def text(self) -> str:
+        lines = [" ".join(line.split()) for line in "".join(self.parts).splitlines()]
+        paragraphs: list[str] = []
+        for line in lines:
+            if line or (paragraphs and paragraphs[-1]):
+                paragraphs.append(line)
+        return "\n".join(paragraphs).strip()
+
+
+def html_to_text(html: str) -> str:
+    """Return the visible text of ``html`` with block elements on own lines."""
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor.text()
+
+
+def _extract_text(data: bytes) -> str:
+    return _decode(data).strip()
+
+
+def _extract_json(data: bytes) -> str:
+    text = _decode(data)
+    try:
+        return json.dumps(json.loads(text), indent=2, ensure_ascii=False)
+    except ValueError:
+        return text.strip()
+
+
+def _extract_html(data: bytes) -> str:
+    return html_to_text(_decode(data))
+
+
+def _extract_eml(data: bytes) -> str:
+    message = BytesParser(policy=policy.default).parsebytes(data)
+    assert isinstance(message, EmailMessage)
+    header_lines = [
+        f"{name}: {message[name]}"
+        for name in ("From", "To", "Cc", "Date", "Subject")
+        if message[name]
+    ]
+    text = ""
+    body = message.get_body(preferencelist=("plain", "html"))
+    if body is not None:
+        content = body.get_content()
+        if body.get_content_type() == "text/html":
+            content = html_to_text(content)
+        text = content.strip()
+    attachments = [
+        filename
+        for part in message.iter_attachments()
+        if (filename := part.get_filename())
+    ]
+    sections = ["\n".join(header_lines), text]
+    if attachments:
+        sections.append("Attachments: " + ", ".join(attachments))
+    return "\n\n".join(section for section in sections if section)
+
+
+EXTRACTORS: dict[str, Callable[[bytes], str]] = {
+    "text/plain": _extract_text,
+    "text/markdown": _extract_text,
+    "text/x-markdown": _extract_text,
+    "text/csv": _extract_text,
+    "application/json": _extract_json,
+    "text/html": _extract_html,
+    "message/rfc822": _extract_eml,
+}
+
+
+class LocalBackend(ParserBackend):
+    """Parses the formats in ``EXTRACTORS`` in-process."""
+
+    name = "local"
+    _executor: ThreadPoolExecutor | None = None
+
+    def __init__(self):
+        settings = get_settings()
+        self._max_bytes = settings.PARSER_LOCAL_MAX_BYTES
+        self._workers = settings.PARSER_LOCAL_WORKERS
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if LocalBackend._executor is None:
+            LocalBackend._executor = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="local-parser"
+            )
+        return LocalBackend._executor
+
+    @staticmethod
+    def close_executor() -> None:
+        executor, LocalBackend._executor = LocalBackend._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def accepts(self, file: UploadFile) -> bool:
+        """Whether ``file`` is small enough to be parsed in-process."""
+        return file.size is None or file.size <= self._max_bytes
+
+    async def parse(self, file: UploadFile) -> str:
+        mime_type = detect_mime_type(file)
+        extractor = EXTRACTORS.get(mime_type)
+        if extractor is None:
+            raise UnsupportedFileTypeError(file.filename, mime_type)
+        await file.seek(0)
+        data = await file.read(self._max_bytes + 1)
+        if len(data) > self._max_bytes:
+            raise UploadTooLargeError(file.filename, self._max_bytes)
+        logger.debug("Parsing '%s' (%s) locally", file.filename, mime_type)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), extractor, data
+        )
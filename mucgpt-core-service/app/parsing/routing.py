@@ -0,0 +1,63 @@
+from collections.abc import Sequence
+
+from fastapi import UploadFile
+
+from core.logtools import getLogger
+from parsing.base import ParsedDocument, ParserBackend
+from parsing.local import EXTRACTORS, LocalBackend, detect_mime_type
+
+logger = getLogger()
+
+
+class RoutingBackend(ParserBackend):
+    """Dispatches uploads to the local parser or a fallback by MIME type.
+
+    ``local_mime_types`` lists the MIME types parsed in-process; every other
+    file, and local candidates above ``PARSER_LOCAL_MAX_BYTES``, go to
+    ``fallback``.
+    """
+
+    def __init__(
+        self,
+        local: LocalBackend,
+        fallback: ParserBackend,
+        local_mime_types: set[str],
+    ):
+        unsupported = local_mime_types - EXTRACTORS.keys()
+        if unsupported:
+            raise ValueError(
+                f"No local extractor for MIME types: {', '.join(sorted(unsupported))}"
+            )
+        self._local = local
+        self._fallback = fallback
+        self._local_mime_types = local_mime_types
+        self.name = f"{local.name}+{fallback.name}"
+
+    def route(self, file: UploadFile) -> ParserBackend:
+        if detect_mime_type(file) in self._local_mime_types and self._local.accepts(
+            file
+        ):
+            return self._local
+        return self._fallback
+
+    async def parse(self, file: UploadFile) -> str:
+        return await self.route(file).parse(file)
+
+    async def parse_document(self, file: UploadFile) -> ParsedDocument:
+        return await self.route(file).parse_document(file)
+
+    async def parse_batch(self, files: Sequence[UploadFile]) -> list[str]:
+        results: list[str] = [""] * len(files)
+        fallback_indices = []
+        for index, file in enumerate(files):
+            if self.route(file) is self._local:
+                results[index] = await self._local.parse(file)
+            else:
+                fallback_indices.append(index)
+        if fallback_indices:
+            fallback_results = await self._fallback.parse_batch(
+                [files[index] for index in fallback_indices]
+            )
+            for index, content in zip(fallback_indices, fallback_results, strict=True):
+                results[index] = content
+        return results
@@ -1,41 +1,134 @@
+import os
+from collections.abc import AsyncIterator, Sequence
+
 import httpx
 from fastapi import UploadFile
 
 from config.settings import get_settings
 from core.logtools import getLogger
-from parsing.base import ParserBackend
+from parsing.base import (
+    PageSpan,
+    ParsedDocument,
+    ParserBackend,
+    UploadTooLargeError,
+)
 
 logger = getLogger()
 
+_CHUNK_BYTES = 64 * 1024
+
+
+def _quote_param(value: str) -> str:
+    """Escape a multipart header parameter the way browsers do."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', "%22")
+        .replace("\r", "%0D")
+        .replace("\n", "%0A")
+    )
+
+
+class _MultipartUpload:
+    """Multipart body with one ``files`` part per upload, read asynchronously.
+
+    httpx reads file fields synchronously on the event loop, so the body is
+    built here from ``UploadFile.read``, which moves reads of uploads spooled
+    to disk to a worker thread. The size limit is enforced while streaming.
+    When every upload knows its size the body length is sent up front instead
+    of a chunked body.
+    """
+
+    def __init__(self, uploads: Sequence[UploadFile], limit: int):
+        self._uploads = uploads
+        self._limit = limit
+        self._boundary = os.urandom(16).hex()
+        self._part_headers = [self._part_header(file) for file in uploads]
+        self._closing = f"--{self._boundary}--\r\n".encode()
+
+    def _part_header(self, file: UploadFile) -> bytes:
+        disposition = 'form-data; name="files"'
+        if file.filename is not None:
+            disposition += f'; filename="{_quote_param(file.filename)}"'
+        content_type = file.content_type or "application/octet-stream"
+        return (
+            f"--{self._boundary}\r\n"
+            f"Content-Disposition: {disposition}\r\n"
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {"Content-Type": f"multipart/form-data; boundary={self._boundary}"}
+        sizes = [file.size for file in self._uploads]
+        if None not in sizes:
+            length = sum(len(header) + 2 for header in self._part_headers)
+            headers["Content-Length"] = str(length + sum(sizes) + len(self._closing))
+        return headers
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for file, header in zip(self._uploads, self._part_headers, strict=True):
+            yield header
+            read = 0
+            while chunk := await file.read(_CHUNK_BYTES):
+                read += len(chunk)
+                if read > self._limit:
+                    raise UploadTooLargeError(file.filename, self._limit)
+                yield chunk
+            yield b"\r\n"
+        yield self._closing
+
 
 class XbergBackend(ParserBackend):
-    """Parsing backend that delegates extraction to a remote Xberg service."""
+    """Parsing backend that delegates extraction to a remote Xberg service.
+
+    All instances share one pooled ``httpx.AsyncClient``; it is created in
+    ``init_client`` at startup (or lazily on first use) and closed in
+    ``close_client`` on shutdown.
+    """
+
+    name = "xberg"
+    _client: httpx.AsyncClient | None = None
 
     def __init__(self):
         settings = get_settings()
         self._extract_url = f"{settings.XBERG_URL.rstrip('/')}/extract"
         self._timeout = settings.XBERG_TIMEOUT
-        logger.info(f"XbergBackend configured with URL {settings.XBERG_URL}")
+        self._max_upload_bytes = settings.XBERG_MAX_UPLOAD_BYTES
+        logger.info("XbergBackend configured with URL %s", settings.XBERG_URL)
 
-    async def parse(self, file: UploadFile) -> str:
-        file_bytes = await file.read()
-
-        # Use a list-of-tuples for multipart fields so repeated "files" is supported.
-        files = [
-            (
-                "files",
-                (
-                    file.filename,
-                    file_bytes,
-                    file.content_type or "application/octet-stream",
+    @staticmethod
+    def init_client() -> httpx.AsyncClient:
+        if XbergBackend._client is None:
+            settings = get_settings()
+            XbergBackend._client = httpx.AsyncClient(
+                timeout=settings.XBERG_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.XBERG_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.XBERG_MAX_CONNECTIONS,
                 ),
             )
-        ]
+        return XbergBackend._client
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self._extract_url, files=files, timeout=self._timeout
-            )
+    @staticmethod
+    async def close_client() -> None:
+        client, XbergBackend._client = XbergBackend._client, None
+        if client is not None:
+            await client.aclose()
+
+    async def _extract(self, uploads: Sequence[UploadFile]) -> list[dict]:
+        """Send ``uploads`` in one multipart request and return Xberg's results."""
+        for file in uploads:
+            if file.size is not None and file.size > self._max_upload_bytes:
+                raise UploadTooLargeError(file.filename, self._max_upload_bytes)
+            await file.seek(0)
+
+        body = _MultipartUpload(uploads, self._max_upload_bytes)
+        response = await self.init_client().post(
+            self._extract_url,
+            content=body,
+            headers=body.headers,
+            timeout=self._timeout,
+        )
 
         if response.is_error:
             logger.error(
@@ -63,5 +156,49 @@ class XbergBackend(ParserBackend):
                 "Unexpected Xberg response shape: %s", type(payload).__name__
             )
             results = []
+        return results
 
+    async def parse(self, file: UploadFile) -> str:
+        results = await self._extract([file])
         return "\n\n".join(r["content"] for r in results if r.get("content"))
+
+    async def parse_document(self, file: UploadFile) -> ParsedDocument:
+        results = await self._extract([file])
+        parts: list[str] = []
+        pages: list[PageSpan] = []
+        offset = 0
+        for result in results:
+            # Results only carry "pages" when Xberg is configured to extract them.
+            result_pages = [
+                page
+                for page in result.get("pages") or []
+                if isinstance(page, dict) and page.get("content")
+            ]
+            if not result_pages and result.get("content"):
+                result_pages = [{"content": result["content"]}]
+            for page in result_pages:
+                if parts:
+                    offset += 2
+                content = page["content"]
+                if isinstance(page.get("page_number"), int):
+                    pages.append(
+                        PageSpan(page["page_number"], offset, offset + len(content))
+                    )
+                parts.append(content)
+                offset += len(content)
+        return ParsedDocument(content="\n\n".join(parts), pages=pages)
+
+    async def parse_batch(self, files: Sequence[UploadFile]) -> list[str]:
+        if len(files) < 2:
+            return await super().parse_batch(files)
+        results = await self._extract(files)
+        if len(results) != len(files):
+            # Results can only be attributed to files when Xberg returns exactly
+            # one per file; otherwise parse them one by one.
+            logger.warning(
+                "Xberg returned %d results for %d files; parsing individually",
+                len(results),
+                len(files),
+            )
+            return await super().parse_batch(files)
+        return [r.get("content") or "" for r in results]
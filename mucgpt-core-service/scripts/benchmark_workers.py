@@ -0,0 +1,114 @@
+"""Measure request throughput of the core service per worker count.
+
+Starts ``app.py`` with each worker count, waits until it answers on ``--path``
+and keeps ``--concurrency`` requests in flight for ``--duration`` seconds.
+
+Example:
+    uv run python scripts/benchmark_workers.py --workers 1 2 4 --path /api/health
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+
+
+async def _wait_until_ready(url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                response = await client.get(url)
+                if response.status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{url} not ready after {timeout:.0f}s")
+            await asyncio.sleep(0.5)
+
+
+async def _load(url: str, concurrency: int, duration: float) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def _run(workers: int, args: argparse.Namespace) -> tuple[float, float, float, int]:
+    url = f"http://localhost:{args.port}{args.path}"
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "app.py",
+            "--development",
+            "--port",
+            str(args.port),
+            "--workers",
+            str(workers),
+        ],
+        cwd=APP_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(_wait_until_ready(url, args.startup_timeout))
+        latencies, errors = asyncio.run(_load(url, args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    if not latencies:
+        return 0.0, 0.0, 0.0, errors
+    quantiles = statistics.quantiles(latencies, n=100)
+    return (
+        len(latencies) / args.duration,
+        quantiles[49] * 1000,
+        quantiles[94] * 1000,
+        errors,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/api/health")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8}{'req/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+    for workers in args.workers:
+        throughput, p50, p95, errors = _run(workers, args)
+        print(f"{workers:>8}{throughput:>12.1f}{p50:>10.2f}{p95:>10.2f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
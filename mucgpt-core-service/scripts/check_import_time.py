@@ -0,0 +1,79 @@
+"""Profile ``import backend`` with ``-X importtime`` and enforce a budget.
+
+Fails when the import takes longer than ``--budget-ms`` or loads one of the
+packages that are deferred to ``warmup_app``. Set the settings the app needs
+at import (e.g. ``MUCGPT_CORE_VERSION``) in the environment.
+
+Example:
+    MUCGPT_CORE_VERSION=dev uv run python scripts/check_import_time.py --budget-ms 2500
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+
+DEFERRED_PACKAGES = (
+    "anthropic",
+    "deepagents",
+    "langchain_anthropic",
+    "langchain_mcp_adapters",
+    "langchain_openai",
+    "langgraph",
+    "mcp",
+    "openai",
+)
+
+
+def profile(module: str) -> dict[str, int]:
+    """Cumulative import time in µs per module imported by ``module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="backend")
+    parser.add_argument("--budget-ms", type=float, default=2500.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    timings = profile(args.module)
+    total_ms = timings[args.module] / 1000
+    top_level = {name: micros for name, micros in timings.items() if "." not in name}
+    slowest = sorted(top_level.items(), key=lambda item: -item[1])[: args.top]
+    for name, micros in slowest:
+        print(f"{micros / 1000:>10.1f} ms  {name}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(
+            f"import {args.module} took {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)"
+        )
+    loaded = sorted(set(DEFERRED_PACKAGES) & timings.keys())
+    if loaded:
+        failures.append(f"deferred packages imported eagerly: {', '.join(loaded)}")
+    print(f"import {args.module}: {total_ms:.0f} ms")
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 # tests/integration/test_chat_router.py
+import asyncio
 import json
 import logging
 from unittest.mock import AsyncMock, Mock, patch
@@ -19,7 +20,11 @@ from api.api_models import (
     ChatCompletionResponse,
     Usage,
 )
+from backend import api_app
 from config.model_provider import ModelRegistry, ModelsConfigurationException
+from core.auth import authenticate_user
+from core.conversation_store import ConversationStore, history_digest
+from core.metrics import Metrics
 
 DUMMY_USER_ID = "test_user_123"
 
@@ -435,3 +440,295 @@ class TestChatRouter:
         assert response.usage.prompt_tokens > 0
         assert response.usage.completion_tokens > 0
         assert response.usage.total_tokens > 0
+
+
+@pytest.fixture
+def conversation_store(monkeypatch: pytest.MonkeyPatch) -> dict:
+    store: dict = {}
+
+    async def get_object(key: str):
+        return store.get(key)
+
+    async def set_object(key: str, obj, ttl: int | None = None) -> None:
+        store[key] = obj
+
+    monkeypatch.setattr("core.conversation_store.RedisCache.get_object", get_object)
+    monkeypatch.setattr("core.conversation_store.RedisCache.set_object", set_object)
+    monkeypatch.setattr(ConversationStore, "is_enabled", staticmethod(lambda: True))
+    return store
+
+
+def _completion_response(content: str) -> dict:
+    return ChatCompletionResponse(
+        id="chatcmpl-test",
+        created=1234567890,
+        choices=[
+            ChatCompletionChoice(
+                index=0,
+                message=ChatCompletionMessage(role="assistant", content=content),
+                finish_reason="stop",
+            )
+        ],
+        usage=Usage(prompt_tokens=1, completion_tokens=1, total_tokens=2),
+    ).model_dump()
+
+
+class TestConversationHistory:
+    @patch("api.routers.chat_router.init_agent", new_callable=AsyncMock)
+    def test_incremental_request_restores_stored_history(
+        self, mock_init_agent, test_client: TestClient, conversation_store: dict
+    ):
+        mock_agent_executor = Mock(MUCGPTAgentExecutor)
+        mock_agent_executor.run_without_streaming = AsyncMock(
+            side_effect=[_completion_response("First"), _completion_response("Second")]
+        )
+        mock_init_agent.return_value = mock_agent_executor
+
+        first = test_client.post(
+            "/v1/chat/completions",
+            json={
+                "conversation_id": "conv-1",
+                "messages": [
+                    {"role": "system", "content": "Be brief."},
+                    {"role": "user", "content": "Hi"},
+                ],
+                "data_sources": [{"title": "a.pdf", "content": "Document"}],
+            },
+        )
+        assert first.status_code == 200, first.text
+
+        second = test_client.post(
+            "/v1/chat/completions",
+            json={
+                "conversation_id": "conv-1",
+                "history_version": history_digest(
+                    [
+                        {"role": "system", "content": "Be brief."},
+                        {"role": "user", "content": "Hi"},
+                        {"role": "assistant", "content": "First"},
+                    ]
+                ),
+                "messages": [{"role": "user", "content": "And now?"}],
+            },
+        )
+        assert second.status_code == 200, second.text
+
+        call = mock_agent_executor.run_without_streaming.call_args_list[1].kwargs
+        assert [(m.role, m.content) for m in call["messages"]] == [
+            ("system", "Be brief."),
+            ("user", "Hi"),
+            ("assistant", "First"),
+            ("user", "And now?"),
+        ]
+        assert call["data_sources"][0]["title"] == "a.pdf"
+        (stored,) = conversation_store.values()
+        assert len(stored["messages"]) == 5
+        assert stored["messages"][-1] == {"role": "assistant", "content": "Second"}
+
+    @patch("api.routers.chat_router.init_agent", new_callable=AsyncMock)
+    def test_incremental_request_with_stale_version_returns_conflict(
+        self, mock_init_agent, test_client: TestClient, conversation_store: dict
+    ):
+        mock_agent_executor = Mock(MUCGPTAgentExecutor)
+        mock_agent_executor.run_without_streaming = AsyncMock(
+            return_value=_completion_response("Answer")
+        )
+        mock_init_agent.return_value = mock_agent_executor
+
+        resp = test_client.post(
+            "/v1/chat/completions",
+            json={
+                "conversation_id": "unknown",
+                "history_version": history_digest([]),
+                "messages": [{"role": "user", "content": "Hello"}],
+            },
+        )
+
+        assert resp.status_code == 409
+        mock_agent_executor.run_without_streaming.assert_not_called()
+
+    @patch("api.routers.chat_router.init_agent", new_callable=AsyncMock)
+    def test_incremental_request_after_edited_turn_returns_conflict(
+        self, mock_init_agent, test_client: TestClient, conversation_store: dict
+    ):
+        mock_agent_executor = Mock(MUCGPTAgentExecutor)
+        mock_agent_executor.run_without_streaming = AsyncMock(
+            return_value=_completion_response("First")
+        )
+        mock_init_agent.return_value = mock_agent_executor
+
+        first = test_client.post(
+            "/v1/chat/completions",
+            json={
+                "conversation_id": "conv-edit",
+                "messages": [{"role": "user", "content": "Hi"}],
+            },
+        )
+        assert first.status_code == 200, first.text
+
+        # Same number of messages, but the client regenerated the answer.
+        resp = test_client.post(
+            "/v1/chat/completions",
+            json={
+                "conversation_id": "conv-edit",
+                "history_version": history_digest(
+                    [
+                        {"role": "user", "content": "Hi"},
+                        {"role": "assistant", "content": "Regenerated"},
+                    ]
+                ),
+                "messages": [{"role": "user", "content": "And now?"}],
+            },
+        )
+
+        assert resp.status_code == 409
+        assert mock_agent_executor.run_without_streaming.call_count == 1
+
+    @patch("api.routers.chat_router.ChatCompletionResponse")
+    @patch("api.routers.chat_router.init_agent", new_callable=AsyncMock)
+    def test_disabled_store_skips_response_validation(
+        self,
+        mock_init_agent,
+        mock_response_model,
+        test_client: TestClient,
+        conversation_store: dict,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(
+            ConversationStore, "is_enabled", staticmethod(lambda: False)
+        )
+        mock_agent_executor = Mock(MUCGPTAgentExecutor)
+        mock_agent_executor.run_without_streaming = AsyncMock(
+            return_value=_completion_response("Answer")
+        )
+        mock_init_agent.return_value = mock_agent_executor
+
+        resp = test_client.post(
+            "/v1/chat/completions",
+            json={
+                "conversation_id": "conv-off",
+                "messages": [{"role": "user", "content": "Hi"}],
+            },
+        )
+
+        assert resp.status_code == 200, resp.text
+        mock_response_model.model_validate.assert_not_called()
+        assert conversation_store == {}
+
+    @patch("api.routers.chat_router.init_agent", new_callable=AsyncMock)
+    def test_streamed_answer_is_stored(
+        self, mock_init_agent, test_client: TestClient, conversation_store: dict
+    ):
+        async def stream(**_kwargs):
+            for content, finish_reason in (("Hel", None), ("lo", None), (None, "stop")):
+                yield ChatCompletionChunk(
+                    id="chunk",
+                    created=1234567890,
+                    choices=[
+                        ChatCompletionChunkChoice(
+                            delta=ChatCompletionDelta(content=content),
+                            index=0,
+                            finish_reason=finish_reason,
+                        )
+                    ],
+                ).model_dump()
+
+        mock_agent_executor = Mock(MUCGPTAgentExecutor)
+        mock_agent_executor.run_with_streaming = stream
+        mock_init_agent.return_value = mock_agent_executor
+
+        with test_client.stream(
+            "POST",
+            "/v1/chat/completions",
+            json={
+                "conversation_id": "conv-stream",
+                "stream": True,
+                "messages": [{"role": "user", "content": "Hi"}],
+            },
+        ) as resp:
+            assert resp.status_code == 200
+            list(resp.iter_lines())
+
+        (stored,) = conversation_store.values()
+        assert stored["messages"] == [
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hello"},
+        ]
+
+
+async def _disconnect_after_first_chunk(spec_version: str) -> None:
+    """Drive the ASGI app like a server whose client leaves mid-stream."""
+    body = json.dumps(
+        {"stream": True, "messages": [{"role": "user", "content": "Hi"}]}
+    ).encode()
+    request_sent = False
+    first_chunk_sent = asyncio.Event()
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await first_chunk_sent.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.body" and message.get("body"):
+            first_chunk_sent.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": spec_version},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/v1/chat/completions",
+        "raw_path": b"/v1/chat/completions",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    await asyncio.wait_for(api_app(scope, receive, send), timeout=5)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("spec_version", ["2.3", "2.4"])
+@patch("api.routers.chat_router.init_agent", new_callable=AsyncMock)
+async def test_client_disconnect_cancels_the_agent(
+    mock_init_agent, spec_version: str, override_authenticate_user
+):
+    agent_cancelled = asyncio.Event()
+
+    async def stream(**_kwargs):
+        yield ChatCompletionChunk(
+            id="chunk",
+            created=1234567890,
+            choices=[
+                ChatCompletionChunkChoice(
+                    delta=ChatCompletionDelta(content="Hel"), index=0
+                )
+            ],
+        ).model_dump()
+        try:
+            await asyncio.sleep(60)  # slow tool call or model response
+        except asyncio.CancelledError:
+            agent_cancelled.set()
+            raise
+
+    mock_agent_executor = Mock(MUCGPTAgentExecutor)
+    mock_agent_executor.run_with_streaming = stream
+    mock_init_agent.return_value = mock_agent_executor
+    api_app.dependency_overrides[authenticate_user] = override_authenticate_user
+    Metrics.reset()
+    try:
+        await _disconnect_after_first_chunk(spec_version)
+    finally:
+        api_app.dependency_overrides.clear()
+
+    assert agent_cancelled.is_set()
+    assert Metrics.value("mucgpt_chat_streams_total", outcome="cancelled") == 1
@@ -1,10 +1,11 @@
-from collections.abc import Sequence
+import json
+from collections.abc import AsyncIterator, Sequence
 from typing import Any
 from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, AIMessageChunk
 
 
 class _FakeConfiguredModel:
@@ -31,6 +32,23 @@ class _FakeConfiguredModel:
             raise RuntimeError("boom")
         return AIMessage(content=self._response_by_run_name.get(run_name, "fallback"))
 
+    async def astream(
+        self, messages: Sequence[Any], config: Any = None
+    ) -> AsyncIterator[AIMessageChunk]:
+        run_name = (config or {}).get("run_name") or ""
+        if self._fail_run_name and run_name == self._fail_run_name:
+            raise RuntimeError("boom")
+        for token in self._response_by_run_name.get(run_name, "fallback").split(" "):
+            yield AIMessageChunk(content=token + " ")
+
+
+def _parse_sse_events(body: str) -> list[dict[str, Any]]:
+    return [
+        json.loads(line.removeprefix("data: "))
+        for line in body.splitlines()
+        if line.startswith("data: ")
+    ]
+
 
 @pytest.mark.integration
 @patch("core.llm_helpers.ModelRegistry.get_model")
@@ -135,3 +153,65 @@ def test_generate_assistant_draft_error_mapping(
     assert resp.status_code == 500
     detail = resp.json().get("detail", "")
     assert "Fehler" in detail or "Ein Fehler" in detail
+
+
+@pytest.mark.integration
+@patch("core.llm_helpers.ModelRegistry.get_model")
+def test_stream_assistant_draft_emits_deltas_parts_and_done(
+    mock_get_model, test_client: TestClient
+) -> None:
+    responses = {
+        "assistant-draft-system-prompt": "Du bist ein Assistent",
+        "assistant-draft-description": "Beschreibungssatz",
+        "assistant-draft-title": "Titel",
+    }
+    mock_get_model.return_value = _FakeConfiguredModel(response_by_run_name=responses)
+
+    resp = test_client.post(
+        "/v1/generations/assistant-draft/stream",
+        json={"prompt_seed": "Hilft bei Meeting-Protokollen"},
+    )
+
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse_events(resp.text)
+
+    deltas = [event["content"] for event in events if event["type"] == "delta"]
+    assert "".join(deltas) == "Du bist ein Assistent "
+    parts = {
+        event["part"]: event["content"] for event in events if event["type"] == "part"
+    }
+    assert parts == {
+        "system_prompt": "Du bist ein Assistent ",
+        "description": "Beschreibungssatz",
+        "title": "Titel",
+    }
+    assert events[-1]["type"] == "done"
+    assert events[-1]["draft"] == {
+        "system_prompt": "Du bist ein Assistent ",
+        "description": "Beschreibungssatz",
+        "title": "Titel",
+    }
+
+
+@pytest.mark.integration
+@patch("core.llm_helpers.ModelRegistry.get_model")
+def test_stream_assistant_draft_reports_error_event(
+    mock_get_model, test_client: TestClient
+) -> None:
+    mock_get_model.return_value = _FakeConfiguredModel(
+        response_by_run_name={},
+        fail_run_name="assistant-draft-title",
+    )
+
+    resp = test_client.post(
+        "/v1/generations/assistant-draft/stream",
+        json={"prompt_seed": "Hilft bei Meeting-Protokollen"},
+    )
+
+    assert resp.status_code == 200
+    events = _parse_sse_events(resp.text)
+    assert events[-1]["type"] == "error"
+    assert events[-1]["part"] == "title"
+    assert "Fehler" in events[-1]["content"]
+    assert all(event["type"] != "done" for event in events)
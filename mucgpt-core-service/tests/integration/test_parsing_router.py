@@ -1,3 +1,5 @@
+import json
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -6,6 +8,7 @@ from fastapi.testclient import TestClient
 
 from backend import api_app
 from config.settings import ParserBackendType
+from parsing.base import ParsedDocument, UploadTooLargeError
 
 headers = {
     "Authorization": "Bearer dummy_access_token",
@@ -191,3 +194,186 @@ class TestParsingRouter:
 
         assert response.status_code == 502
         assert "error" in response.json()["detail"].lower()
+
+    def test_parse_too_large_returns_413(self, test_client: TestClient):
+        """When the upload exceeds the size limit the endpoint returns 413."""
+        mock_parser = AsyncMock()
+        mock_parser.parse = AsyncMock(
+            side_effect=UploadTooLargeError("huge.pdf", limit=10)
+        )
+
+        with (
+            patch("api.routers.parsing_router.settings") as mock_settings,
+            patch("api.routers.parsing_router._parser", mock_parser),
+        ):
+            mock_settings.PARSER_BACKEND = ParserBackendType.XBERG
+            response = test_client.post(
+                "/v1/parse",
+                files={"file": ("huge.pdf", b"pdf bytes", "application/pdf")},
+                headers=headers,
+            )
+
+        assert response.status_code == 413
+        assert "huge.pdf" in response.json()["detail"]
+
+    def test_parse_returns_cached_result_for_same_content(
+        self, test_client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """A second upload of the same bytes is answered from the parse cache."""
+        store: dict[str, Any] = {}
+
+        async def get_object(key: str) -> Any | None:
+            return store.get(key)
+
+        async def set_object(key: str, obj: Any, ttl: int | None = None) -> None:
+            store[key] = obj
+
+        monkeypatch.setattr("parsing.cache.RedisCache.get_object", get_object)
+        monkeypatch.setattr("parsing.cache.RedisCache.set_object", set_object)
+        mock_parser = AsyncMock()
+        mock_parser.name = "mock"
+        mock_parser.parse = AsyncMock(return_value="Parsed once.")
+
+        with (
+            patch("api.routers.parsing_router.settings") as mock_settings,
+            patch("api.routers.parsing_router._parser", mock_parser),
+        ):
+            mock_settings.PARSER_BACKEND = ParserBackendType.XBERG
+            responses = [
+                test_client.post(
+                    "/v1/parse",
+                    files={"file": (name, b"same bytes", "application/pdf")},
+                    headers=headers,
+                )
+                for name in ("first.pdf", "second.pdf")
+            ]
+
+        assert [r.json() for r in responses] == ["Parsed once.", "Parsed once."]
+        mock_parser.parse.assert_awaited_once()
+
+    def test_parse_structured_returns_chunks(self, test_client: TestClient):
+        """With structured=true the endpoint returns chunks with offsets and tokens."""
+        content = "# Titel\n\nEinleitung.\n\n## Abschnitt\n\nInhalt."
+        mock_parser = AsyncMock()
+        mock_parser.name = "mock"
+        mock_parser.parse_document = AsyncMock(
+            return_value=ParsedDocument(content=content)
+        )
+
+        with (
+            patch("api.routers.parsing_router.settings") as mock_settings,
+            patch("api.routers.parsing_router._parser", mock_parser),
+        ):
+            mock_settings.PARSER_BACKEND = ParserBackendType.XBERG
+            response = test_client.post(
+                "/v1/parse?structured=true",
+                files={"file": ("doc.md", b"# Titel", "text/markdown")},
+                headers=headers,
+            )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["content"] == content
+        assert [chunk["heading"] for chunk in body["chunks"]] == [
+            "Titel",
+            "Abschnitt",
+        ]
+        assert body["total_tokens"] == sum(c["tokens"] for c in body["chunks"])
+        chunk = body["chunks"][1]
+        assert content[chunk["start"] : chunk["end"]] == chunk["content"]
+
+
+@pytest.mark.integration
+class TestParseBatch:
+    @staticmethod
+    def _post(client: TestClient, files: list[tuple[str, bytes]]):
+        return client.post(
+            "/v1/parse/batch",
+            files=[
+                ("files", (name, content, "application/pdf")) for name, content in files
+            ],
+            headers=headers,
+        )
+
+    def test_batch_streams_ndjson_and_dedupes_identical_files(
+        self, test_client: TestClient
+    ):
+        """Each file gets one NDJSON line; identical uploads are parsed once."""
+        parsed: list[list[str]] = []
+
+        async def parse_batch(files):
+            parsed.append([file.filename for file in files])
+            return [f"text of {file.filename}" for file in files]
+
+        mock_parser = AsyncMock()
+        mock_parser.name = "mock"
+        mock_parser.parse_batch = parse_batch
+
+        with (
+            patch("api.routers.parsing_router.settings") as mock_settings,
+            patch("api.routers.parsing_router._parser", mock_parser),
+        ):
+            mock_settings.PARSER_BACKEND = ParserBackendType.XBERG
+            response = self._post(
+                test_client,
+                [("a.pdf", b"one"), ("b.pdf", b"two"), ("copy.pdf", b"one")],
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = sorted(
+            (json.loads(line) for line in response.text.splitlines()),
+            key=lambda line: line["index"],
+        )
+        assert [line["content"] for line in lines] == [
+            "text of a.pdf",
+            "text of b.pdf",
+            "text of a.pdf",
+        ]
+        assert sorted(sum(parsed, [])) == ["a.pdf", "b.pdf"]
+
+    def test_batch_reports_errors_per_file(self, test_client: TestClient):
+        """A failing file is reported in its own line without failing the batch."""
+
+        async def parse(file):
+            if file.filename == "slow.pdf":
+                raise httpx.TimeoutException("timed out")
+            return "ok"
+
+        mock_parser = AsyncMock()
+        mock_parser.name = "mock"
+        mock_parser.parse = parse
+        mock_parser.parse_batch = AsyncMock(
+            side_effect=httpx.TimeoutException("timed out")
+        )
+
+        with (
+            patch("api.routers.parsing_router.settings") as mock_settings,
+            patch("api.routers.parsing_router._parser", mock_parser),
+        ):
+            mock_settings.PARSER_BACKEND = ParserBackendType.XBERG
+            response = self._post(
+                test_client, [("fast.pdf", b"one"), ("slow.pdf", b"two")]
+            )
+
+        lines = {
+            line["filename"]: line
+            for line in map(json.loads, response.text.splitlines())
+        }
+        assert lines["fast.pdf"]["content"] == "ok"
+        assert lines["slow.pdf"]["status_code"] == 504
+        assert "content" not in lines["slow.pdf"]
+
+    def test_batch_rejects_too_many_files(
+        self, test_client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Requests above PARSE_BATCH_MAX_FILES are rejected with 413."""
+        monkeypatch.setattr(
+            "api.routers.parsing_router.get_settings",
+            lambda: MagicMock(PARSE_BATCH_MAX_FILES=1),
+        )
+        with patch("api.routers.parsing_router.settings") as mock_settings:
+            mock_settings.PARSER_BACKEND = ParserBackendType.XBERG
+            response = self._post(test_client, [("a.pdf", b"1"), ("b.pdf", b"2")])
+
+        assert response.status_code == 413
@@ -3,6 +3,7 @@ from unittest.mock import patch
 import pytest
 
 from config.settings import ParserBackendType, Settings
+from core.metrics import Metrics
 
 headers = {
     "Authorization": "Bearer dummy_access_token",
@@ -33,6 +34,27 @@ def test_health_check(test_client):
     assert response.text == '"OK"'
 
 
+@pytest.mark.integration
+def test_ready_check_follows_warmup(test_client):
+    """Test the /ready endpoint reports 503 until the app is warmed up."""
+    with patch("api.routers.system_router.is_ready", return_value=False):
+        assert test_client.get("/ready").status_code == 503
+    with patch("api.routers.system_router.is_ready", return_value=True):
+        response = test_client.get("/ready")
+    assert response.status_code == 200
+    assert response.text == '"OK"'
+
+
+@pytest.mark.integration
+def test_metrics_endpoint_renders_prometheus_text(test_client):
+    """Test the /metrics endpoint exposes recorded metrics as plain text."""
+    Metrics.inc("mucgpt_test_requests_total", result="hit")
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'mucgpt_test_requests_total{result="hit"}' in response.text
+
+
 @pytest.mark.integration
 def test_document_processing_enabled_when_parser_backend_set(test_client):
     """document_processing_enabled is True when PARSER_BACKEND is set to xberg."""
@@ -335,3 +335,43 @@ class TestMUCGPTAgentExecutor:
         assert events[0]["content"] == "hidden"
         assert events[2]["content"]["tool_name"] == "example_tool"
         assert events[3]["content"]["agent"]["messages"][0]["content"] == "done"
+
+    @pytest.mark.asyncio
+    async def test_closing_the_stream_stops_the_graph_and_marks_the_trace(
+        self, monkeypatch
+    ):
+        langfuse_client = FakeLangfuseClient()
+        monkeypatch.setattr("agent.agent_executor.get_client", lambda: langfuse_client)
+        monkeypatch.setattr(
+            "agent.agent_executor.propagate_attributes",
+            lambda **_kwargs: nullcontext(),
+        )
+        graph_closed = []
+
+        class EndlessGraph:
+            async def astream(self, *_args, **_kwargs):
+                try:
+                    while True:
+                        yield (
+                            "messages",
+                            (AIMessageChunk(content="x"), {"langgraph_node": "model"}),
+                        )
+                finally:
+                    graph_closed.append(True)
+
+        agent = StreamingAgent()
+        agent.graph = EndlessGraph()
+        stream = MUCGPTAgentExecutor(agent).run_with_streaming(
+            messages=[InputMessage(role="user", content="hi")],
+            temperature=0.7,
+            model="test",
+            user_info=None,
+        )
+
+        await anext(stream)
+        await stream.aclose()
+
+        assert graph_closed == [True]
+        final_update = langfuse_client.current_span_updates[-1]
+        assert final_update["level"] == "WARNING"
+        assert final_update["metadata"]["cancelled"] is True
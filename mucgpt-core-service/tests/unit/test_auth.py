@@ -1,9 +1,10 @@
 import base64
 import json
+import time
 
 import pytest
 
-from core.auth import ACCESS_DENIED_MESSAGE, AuthenticationHelper
+from core.auth import ACCESS_DENIED_MESSAGE, AuthenticationHelper, ClaimsCache
 from core.auth_models import AuthError
 
 
@@ -96,3 +97,36 @@ def test_user_without_basic_or_admin_role_is_denied():
 
     assert exc_info.value.status_code == 403
     assert exc_info.value.error == ACCESS_DENIED_MESSAGE
+
+
+def test_claims_cache_reuses_parsed_tokens(monkeypatch: pytest.MonkeyPatch):
+    helper = AuthenticationHelper(role=None, claims_cache=ClaimsCache(8, ttl=60))
+    token = _token({"sub": "user-id", "exp": time.time() + 3600})
+    first = helper.authenticate(token)
+
+    def fail(token: str) -> dict:
+        raise AssertionError("token parsed twice")
+
+    monkeypatch.setattr(helper, "parse_jwt_payload", fail)
+
+    assert helper.authenticate(token) is first
+
+
+def test_claims_cache_honors_exp():
+    cache = ClaimsCache(8, ttl=60)
+    helper = AuthenticationHelper(role=None, claims_cache=cache)
+
+    helper.authenticate(_token({"sub": "expired", "exp": time.time() - 1}))
+    helper.authenticate(_token({"sub": "valid", "exp": time.time() + 3600}))
+
+    assert len(cache._entries) == 1
+
+
+def test_denied_tokens_are_not_cached():
+    cache = ClaimsCache(8, ttl=60)
+    helper = AuthenticationHelper(role="required-role", claims_cache=cache)
+
+    with pytest.raises(AuthError):
+        helper.authenticate(_token({"sub": "user-id"}))
+
+    assert not cache._entries
@@ -0,0 +1,81 @@
+import zlib
+from enum import StrEnum
+
+import cloudpickle
+import pytest
+
+from core.cache import RedisCache
+from core.cache_codec import CODEC_VERSION, CacheDecodeError, decode, encode
+
+
+class Verdict(StrEnum):
+    PASS = "pass"
+
+
+def test_round_trips_json_values_and_bytes():
+    value = {
+        "text": "Grüß Gott",
+        "data": b"\x00\xffbinary",
+        "pages": [(1, 0, 10), (2, 10, 20)],
+        "nested": {"blobs": [b"a", b"b"], "count": 2, "ratio": 0.5, "none": None},
+    }
+
+    decoded = decode(encode(value, compression_min_bytes=1024))
+
+    assert decoded == {**value, "pages": [[1, 0, 10], [2, 10, 20]]}
+
+
+def test_enums_are_stored_by_value():
+    assert decode(encode({"verdict": Verdict.PASS}, 1024)) == {"verdict": "pass"}
+
+
+def test_large_values_are_compressed():
+    value = {"content": "lorem ipsum " * 1000}
+
+    small = encode(value, compression_min_bytes=1024)
+    uncompressed = encode(value, compression_min_bytes=10**9)
+
+    assert len(small) < len(uncompressed) / 10
+    assert decode(small) == value
+
+
+def test_unsupported_types_are_rejected():
+    with pytest.raises(TypeError, match="not cacheable"):
+        encode({"callback": object()}, 1024)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        cloudpickle.dumps({"legacy": True}),
+        b"MCG" + bytes([CODEC_VERSION + 1, 0]) + b"{}",
+        b"MCG" + bytes([CODEC_VERSION, 1]) + zlib.compress(b"\x00\x00\x00\x09garbage"),
+        b"MC",
+    ],
+)
+def test_foreign_entries_fail_to_decode(data):
+    with pytest.raises(CacheDecodeError):
+        decode(data)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store: dict[str, bytes] = {}
+
+    async def set(self, name, value, ex=None):
+        self.store[name] = value
+
+    async def get(self, name):
+        return self.store.get(name)
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_reads_incompatible_entries_as_misses(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(RedisCache, "_redis_client", redis)
+
+    await RedisCache.set_object("key", {"answer": 42})
+    redis.store["legacy"] = cloudpickle.dumps({"answer": 42})
+
+    assert await RedisCache.get_object("key") == {"answer": 42}
+    assert await RedisCache.get_object("legacy") is None
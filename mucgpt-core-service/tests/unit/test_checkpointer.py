@@ -0,0 +1,299 @@
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from redis.exceptions import WatchError
+
+from agent.checkpointer import (
+    AgentCheckpointer,
+    RedisCheckpointSaver,
+    conversation_thread_id,
+)
+from agent.deep_agent import _ConfiguredLangChainDeepAgentGraph
+from config.model_provider import ModelRegistry
+from config.settings import AgentCheckpointerType
+from core.auth_models import AuthenticationResult
+from core.cache import CircuitBreaker, RedisCache
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis"):
+        self.redis = redis
+        self.commands: list[tuple[str, tuple]] = []
+        self.watched: dict[str, int] = {}
+        self.buffered = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def watch(self, *keys: str) -> None:
+        self.watched = {key: self.redis.versions.get(key, 0) for key in keys}
+        self.buffered = False
+
+    def multi(self) -> None:
+        self.buffered = True
+
+    def __getattr__(self, name: str):
+        if not self.buffered:
+            return getattr(self.redis, name)
+        return lambda *args: self.commands.append((name, args))
+
+    async def execute(self):
+        if any(self.redis.versions.get(k, 0) != v for k, v in self.watched.items()):
+            raise WatchError("Watched variable changed.")
+        return [await getattr(self.redis, name)(*args) for name, args in self.commands]
+
+
+class _FakeRedis:
+    """Minimal async Redis hash client."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+        self.versions: dict[str, int] = {}
+
+    @staticmethod
+    def _bytes(value) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+    def _touch(self, key) -> None:
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    async def hset(self, key, field, value):
+        self._touch(key)
+        self.hashes.setdefault(key, {})[self._bytes(field)] = self._bytes(value)
+
+    async def hsetnx(self, key, field, value):
+        self._touch(key)
+        self.hashes.setdefault(key, {}).setdefault(
+            self._bytes(field), self._bytes(value)
+        )
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(self._bytes(field))
+
+    async def hkeys(self, key):
+        return list(self.hashes.get(key, {}))
+
+    async def hmget(self, key, fields):
+        return [self.hashes.get(key, {}).get(self._bytes(f)) for f in fields]
+
+    async def delete(self, key):
+        self._touch(key)
+        self.hashes.pop(key, None)
+
+    async def expire(self, key, seconds):
+        return True
+
+    def pipeline(self, transaction: bool = True):
+        return _FakePipeline(self)
+
+
+class _ToolFreeModel(FakeMessagesListChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+@pytest.fixture
+def user_info() -> AuthenticationResult:
+    return AuthenticationResult(token="token", user_id="user-id", department="dep")
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> _FakeRedis:
+    redis = _FakeRedis()
+
+    monkeypatch.setattr(RedisCache, "_redis_client", redis)
+    monkeypatch.setattr(RedisCache, "_breaker", CircuitBreaker(2, reset_seconds=10))
+    return redis
+
+
+def _graph(monkeypatch: pytest.MonkeyPatch, checkpointer, responses: list[str]):
+    model = _ToolFreeModel(responses=[AIMessage(content=r) for r in responses])
+    monkeypatch.setattr(ModelRegistry, "get_model", lambda _name=None: model)
+    return _ConfiguredLangChainDeepAgentGraph(
+        llm=model, tools=[], logger=MagicMock(), checkpointer=checkpointer
+    )
+
+
+def _config(user_info: AuthenticationResult, conversation_id: str = "conv-1"):
+    return {
+        "configurable": {"user_info": user_info, "conversation_id": conversation_id}
+    }
+
+
+def test_thread_id_is_scoped_per_user():
+    assert conversation_thread_id("alice", "c") != conversation_thread_id("bob", "c")
+    assert "alice" not in conversation_thread_id("alice", "c")
+
+
+@pytest.mark.asyncio
+async def test_follow_up_turn_only_sends_new_messages(
+    monkeypatch: pytest.MonkeyPatch, user_info: AuthenticationResult
+):
+    graph = _graph(monkeypatch, InMemorySaver(), ["first", "second"])
+
+    await graph.ainvoke(
+        {"messages": [HumanMessage(content="hi")]}, config=_config(user_info)
+    )
+    result = await graph.ainvoke(
+        {
+            "messages": [
+                HumanMessage(content="hi"),
+                AIMessage(content="first"),
+                HumanMessage(content="again"),
+            ]
+        },
+        config=_config(user_info),
+    )
+
+    assert [m.content for m in result["messages"]] == [
+        "hi",
+        "first",
+        "again",
+        "second",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_diverged_history_resets_thread(
+    monkeypatch: pytest.MonkeyPatch, user_info: AuthenticationResult
+):
+    graph = _graph(monkeypatch, InMemorySaver(), ["first", "second"])
+
+    await graph.ainvoke(
+        {"messages": [HumanMessage(content="hi")]}, config=_config(user_info)
+    )
+    result = await graph.ainvoke(
+        {
+            "messages": [
+                HumanMessage(content="edited"),
+                AIMessage(content="first"),
+                HumanMessage(content="again"),
+            ]
+        },
+        config=_config(user_info),
+    )
+
+    assert [m.content for m in result["messages"]] == [
+        "edited",
+        "first",
+        "again",
+        "second",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_checkpointer_requires_conversation_id(
+    monkeypatch: pytest.MonkeyPatch, user_info: AuthenticationResult
+):
+    graph = _graph(monkeypatch, InMemorySaver(), ["first"])
+
+    with pytest.raises(ValueError, match="conversation_id"):
+        await graph.ainvoke(
+            {"messages": [HumanMessage(content="hi")]},
+            config={"configurable": {"user_info": user_info}},
+        )
+
+
+@pytest.mark.asyncio
+async def test_redis_saver_compacts_thread_to_single_checkpoint(
+    monkeypatch: pytest.MonkeyPatch,
+    user_info: AuthenticationResult,
+    fake_redis: _FakeRedis,
+):
+    saver = RedisCheckpointSaver(ttl_seconds=60)
+    graph = _graph(monkeypatch, saver, ["first", "second"])
+
+    await graph.ainvoke(
+        {"messages": [HumanMessage(content="hi")]}, config=_config(user_info)
+    )
+    result = await graph.ainvoke(
+        {
+            "messages": [
+                HumanMessage(content="hi"),
+                AIMessage(content="first"),
+                HumanMessage(content="again"),
+            ]
+        },
+        config=_config(user_info),
+    )
+
+    assert [m.content for m in result["messages"]] == [
+        "hi",
+        "first",
+        "again",
+        "second",
+    ]
+    thread_id = conversation_thread_id(user_info.user_id, "conv-1")
+    fields = fake_redis.hashes[RedisCheckpointSaver._key(thread_id)]
+    assert len([f for f in fields if f.startswith(b"checkpoint:")]) == 1
+    assert not [f for f in fields if f.startswith(b"write:")]
+
+    state = await graph.agent.aget_state({"configurable": {"thread_id": thread_id}})
+    assert [m.content for m in state.values["messages"]] == [
+        "hi",
+        "first",
+        "again",
+        "second",
+    ]
+
+
+def _checkpoint(checkpoint_id: str) -> dict:
+    return {
+        "v": 1,
+        "id": checkpoint_id,
+        "ts": "",
+        "channel_values": {},
+        "channel_versions": {},
+        "versions_seen": {},
+    }
+
+
+@pytest.mark.asyncio
+async def test_compaction_skips_thread_written_concurrently(
+    monkeypatch: pytest.MonkeyPatch, fake_redis: _FakeRedis
+):
+    saver = RedisCheckpointSaver(ttl_seconds=60)
+    config = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+    await saver.aput(config, _checkpoint("1"), {}, {})
+    load_tuple = saver._load_tuple
+
+    async def load_during_next_turn(*args):
+        loaded = await load_tuple(*args)
+        await saver.aput(config, _checkpoint("2"), {}, {})
+        return loaded
+
+    monkeypatch.setattr(saver, "_load_tuple", load_during_next_turn)
+    await saver.acompact(config, {})
+
+    fields = fake_redis.hashes[RedisCheckpointSaver._key("t")]
+    assert {b"checkpoint::1", b"checkpoint::2"} <= fields.keys()
+    assert (await saver.aget_tuple(config)).checkpoint["id"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_redis_saver_deletes_thread(fake_redis: _FakeRedis):
+    saver = RedisCheckpointSaver(ttl_seconds=60)
+    config = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+    await saver.aput(config, _checkpoint("1"), {}, {})
+
+    assert await saver.aget_tuple(config) is not None
+    await saver.adelete_thread("t")
+    assert await saver.aget_tuple(config) is None
+
+
+def test_agent_checkpointer_is_disabled_by_default(monkeypatch: pytest.MonkeyPatch):
+    settings = MagicMock(AGENT_CHECKPOINTER=AgentCheckpointerType.NONE)
+    monkeypatch.setattr("agent.checkpointer.get_settings", lambda: settings)
+    AgentCheckpointer.reset()
+
+    assert AgentCheckpointer.get() is None
+
+    settings.AGENT_CHECKPOINTER = AgentCheckpointerType.MEMORY
+    assert isinstance(AgentCheckpointer.get(), InMemorySaver)
+    AgentCheckpointer.reset()
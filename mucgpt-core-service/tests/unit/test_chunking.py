@@ -0,0 +1,55 @@
+from agent.token_budget import TokenCounter
+from parsing.base import PageSpan, ParsedDocument
+from parsing.chunking import chunk_document
+
+
+def _counter() -> TokenCounter:
+    return TokenCounter(chars_per_token=1.0)
+
+
+def test_headings_start_new_chunks_and_are_attached():
+    content = "# Intro\n\nWelcome.\n\n## Details\n\nFirst.\n\nSecond."
+
+    chunks = chunk_document(ParsedDocument(content), max_tokens=100, counter=_counter())
+
+    assert [chunk.heading for chunk in chunks] == ["Intro", "Details"]
+    assert chunks[1].content == "## Details\n\nFirst.\n\nSecond."
+    assert all(content[c.start : c.end] == c.content for c in chunks)
+
+
+def test_paragraphs_are_packed_up_to_the_token_limit():
+    content = "\n\n".join(["a" * 40] * 5)
+
+    chunks = chunk_document(ParsedDocument(content), max_tokens=90, counter=_counter())
+
+    assert [chunk.content.count("a") for chunk in chunks] == [80, 80, 40]
+    assert all(chunk.tokens <= 90 for chunk in chunks)
+
+
+def test_long_paragraphs_are_split_at_sentence_ends():
+    content = " ".join(["Das ist ein Satz."] * 10)
+
+    chunks = chunk_document(ParsedDocument(content), max_tokens=40, counter=_counter())
+
+    assert len(chunks) > 1
+    assert all(chunk.tokens <= 40 for chunk in chunks)
+    assert all(chunk.content.endswith(".") for chunk in chunks)
+
+
+def test_chunks_carry_page_numbers():
+    first, second = "Seite eins.", "Seite zwei."
+    document = ParsedDocument(
+        content=f"{first}\n\n{second}",
+        pages=[
+            PageSpan(page_number=1, start=0, end=len(first)),
+            PageSpan(
+                page_number=2, start=len(first) + 2, end=len(first) + 2 + len(second)
+            ),
+        ],
+    )
+
+    chunks = chunk_document(document, max_tokens=100, counter=_counter())
+
+    assert (chunks[0].page_start, chunks[0].page_end) == (1, 2)
+    small = chunk_document(document, max_tokens=12, counter=_counter())
+    assert [(c.page_start, c.page_end) for c in small] == [(1, 1), (2, 2)]
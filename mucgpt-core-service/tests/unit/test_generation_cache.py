@@ -0,0 +1,164 @@
+from collections.abc import Sequence
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+from api.api_models import ChatCompletionMessage
+from config.settings import get_settings
+from core.auth_models import AuthenticationResult
+from core.generation_cache import GenerationCache
+from core.llm_helpers import (
+    invoke_internal_generation,
+    invoke_internal_structured_generation,
+)
+from core.metrics import Metrics
+from core.prompt_pool import PromptPool
+
+GENERATION_METRIC = "mucgpt_generation_cache_requests_total"
+
+
+class _Verdict(BaseModel):
+    verdict: str
+
+
+class _CountingModel:
+    def __init__(self) -> None:
+        self.calls = 0
+        self._schema: type[BaseModel] | None = None
+
+    def bind(self, **_kwargs: Any) -> "_CountingModel":
+        return self
+
+    def with_structured_output(self, schema: type[BaseModel]) -> "_CountingModel":
+        self._schema = schema
+        return self
+
+    async def ainvoke(self, messages: Sequence[Any], config: Any = None) -> Any:
+        self.calls += 1
+        if self._schema is not None:
+            return self._schema.model_validate({"verdict": "passed"})
+        return AIMessage(content=f"answer {self.calls}")
+
+
+@pytest.fixture
+def user_info() -> AuthenticationResult:
+    return AuthenticationResult(token="t", user_id="user", department="POR/3")
+
+
+@pytest.fixture
+def redis_store(monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+    store: dict[str, Any] = {}
+
+    async def get_object(key: str) -> Any | None:
+        return store.get(key)
+
+    async def set_object(key: str, obj: Any, ttl: int | None = None) -> None:
+        store[key] = obj
+
+    monkeypatch.setattr("core.generation_cache.RedisCache.get_object", get_object)
+    monkeypatch.setattr("core.generation_cache.RedisCache.set_object", set_object)
+    Metrics.reset()
+    return store
+
+
+@pytest.fixture
+def model(monkeypatch: pytest.MonkeyPatch) -> _CountingModel:
+    counting_model = _CountingModel()
+    monkeypatch.setattr(
+        "core.llm_helpers.ModelRegistry.get_model", lambda _name: counting_model
+    )
+    return counting_model
+
+
+def _messages(question: str) -> list[ChatCompletionMessage]:
+    return [
+        ChatCompletionMessage(role="system", content="Erzeuge einen Titel."),
+        ChatCompletionMessage(role="user", content=question),
+    ]
+
+
+async def _generate(
+    user_info: AuthenticationResult, question: str, **kwargs: Any
+) -> str:
+    return await invoke_internal_generation(
+        model_name="mucgpt-test-model",
+        messages=_messages(question),
+        user_info=user_info,
+        trace_tags=["chat-title"],
+        run_name="chat-title-generation",
+        **{"temperature": 0.0, **kwargs},
+    )
+
+
+@pytest.mark.asyncio
+async def test_deterministic_generation_is_served_from_cache(
+    redis_store, model, user_info
+):
+    first = await _generate(user_info, "Wie geht das?")
+    second = await _generate(user_info, "  Wie geht das?\r\n")
+
+    assert first == second == "answer 1"
+    assert model.calls == 1
+    assert len(redis_store) == 1
+    task = "chat-title-generation"
+    assert Metrics.value(GENERATION_METRIC, result="miss", task=task) == 1
+    assert Metrics.value(GENERATION_METRIC, result="hit", task=task) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kwargs", [{"temperature": 0.5}, {"cache": False}])
+async def test_cache_is_bypassed_for_sampling_or_opt_out(
+    redis_store, model, user_info, kwargs
+):
+    await _generate(user_info, "Wie geht das?", **kwargs)
+    await _generate(user_info, "Wie geht das?", **kwargs)
+
+    assert model.calls == 2
+    assert redis_store == {}
+
+
+@pytest.mark.asyncio
+async def test_structured_generation_round_trips_through_cache(
+    redis_store, model, user_info
+):
+    for _ in range(2):
+        result = await invoke_internal_structured_generation(
+            model_name="mucgpt-test-model",
+            temperature=0.0,
+            messages=_messages("Prompt"),
+            user_info=user_info,
+            trace_tags=["assistant-compliance"],
+            run_name="assistant-compliance-education",
+            schema=_Verdict,
+        )
+        assert result == _Verdict(verdict="passed")
+
+    assert model.calls == 1
+    assert list(redis_store.values()) == [{"verdict": "passed"}]
+
+
+@pytest.mark.asyncio
+async def test_oversized_entries_are_not_stored(
+    redis_store, model, user_info, monkeypatch
+):
+    monkeypatch.setattr(get_settings(), "GENERATION_CACHE_MAX_ENTRY_BYTES", 4)
+
+    await _generate(user_info, "Wie geht das?")
+
+    assert redis_store == {}
+
+
+def test_key_depends_on_model_schema_and_prompt_version(monkeypatch):
+    messages = _messages("Prompt")
+    key = GenerationCache.build_key(model_name="a", messages=messages)
+
+    assert key == GenerationCache.build_key(model_name="a", messages=messages)
+    assert key != GenerationCache.build_key(model_name="b", messages=messages)
+    assert key != GenerationCache.build_key(
+        model_name="a", messages=messages, schema=_Verdict
+    )
+
+    monkeypatch.setattr(PromptPool, "_version", "other-version")
+    assert key != GenerationCache.build_key(model_name="a", messages=messages)
@@ -1,3 +1,6 @@
+import subprocess
+import sys
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -9,6 +12,10 @@ from agent.tools.tools import ToolCollection
 from core.auth_models import AuthenticationResult
 from init_app import ModelOptions, init_agent
 
+APP_DIR = Path(__file__).resolve().parents[2] / "app"
+# Loaded in warmup_app, importing the app must not pull them in.
+DEFERRED_PACKAGES = ("deepagents", "langchain_mcp_adapters", "langchain_openai")
+
 
 class TestInitApp:
     """Tests for the init_app module functions."""
@@ -58,3 +65,19 @@ class TestInitApp:
         # Act & Assert
         with pytest.raises(ValueError, match="Temperature must be between 0 and 1"):
             ModelOptions(temperature=-0.1)
+
+
+def test_importing_the_backend_defers_the_agent_stack():
+    script = (
+        "import sys, backend; "
+        f"print(sorted(set({DEFERRED_PACKAGES!r}) & sys.modules.keys()))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,79 @@
+import contextvars
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from config.langfuse_provider import LangfuseProvider, sample_trace
+from config.settings import TraceSamplingKey
+from core.auth import authenticate_user
+from core.auth_models import AuthenticationResult
+
+
+@pytest.fixture
+def provider(monkeypatch: pytest.MonkeyPatch) -> type[LangfuseProvider]:
+    monkeypatch.setattr(LangfuseProvider, "_langfuse_callback", MagicMock())
+    monkeypatch.setattr(LangfuseProvider, "_sample_rate", 0.5)
+    monkeypatch.setattr(LangfuseProvider, "_sample_by", TraceSamplingKey.REQUEST)
+    return LangfuseProvider
+
+
+def _in_new_request(func, *args):
+    return contextvars.copy_context().run(func, *args)
+
+
+def test_unsampled_request_skips_callback_and_export(provider, monkeypatch):
+    monkeypatch.setattr(provider, "_sample_rate", 0.0)
+
+    def request():
+        sampled = provider.sample("user")
+        return sampled, provider.get_callback_handler(), provider.is_sampled()
+
+    assert _in_new_request(request) == (False, None, False)
+
+
+def test_decision_is_taken_once_per_request(provider, monkeypatch):
+    def request():
+        first = provider.sample()
+        monkeypatch.setattr(provider, "_sample_rate", 1.0 - first)
+        return first, provider.sample()
+
+    first, second = _in_new_request(request)
+
+    assert first == second
+
+
+def test_requests_without_decision_are_traced(provider):
+    assert _in_new_request(provider.is_sampled)
+    assert _in_new_request(provider.get_callback_handler) is not None
+
+
+def test_user_sampling_is_stable_per_user(provider, monkeypatch):
+    monkeypatch.setattr(provider, "_sample_by", TraceSamplingKey.USER)
+    users = [f"user-{index}" for index in range(2000)]
+
+    first = [_in_new_request(provider.sample, user) for user in users]
+    second = [_in_new_request(provider.sample, user) for user in users]
+
+    assert first == second
+    assert 0.45 < sum(first) / len(users) < 0.55
+
+
+def test_dependency_decision_reaches_the_endpoint(provider, monkeypatch):
+    monkeypatch.setattr(provider, "_sample_rate", 0.0)
+    router = APIRouter(dependencies=[Depends(sample_trace)])
+
+    @router.get("/traced")
+    async def traced() -> bool:
+        return provider.get_callback_handler() is not None
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[authenticate_user] = lambda: AuthenticationResult(
+        token="token", user_id="user", department="ITM"
+    )
+
+    response = TestClient(app).get("/traced")
+
+    assert response.json() is False
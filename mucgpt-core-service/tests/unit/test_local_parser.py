@@ -0,0 +1,109 @@
+import io
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from config.settings import ParserBackendType
+from parsing.base import UnsupportedFileTypeError
+from parsing.factory import get_parser
+from parsing.local import LocalBackend, detect_mime_type, html_to_text
+from parsing.routing import RoutingBackend
+
+
+def _upload(content: bytes, filename: str, content_type: str | None = None):
+    headers = Headers({"content-type": content_type}) if content_type else None
+    return UploadFile(
+        io.BytesIO(content), filename=filename, size=len(content), headers=headers
+    )
+
+
+@pytest.fixture
+def local(monkeypatch: pytest.MonkeyPatch) -> LocalBackend:
+    settings = MagicMock(PARSER_LOCAL_MAX_BYTES=1024, PARSER_LOCAL_WORKERS=1)
+    monkeypatch.setattr("parsing.local.get_settings", lambda: settings)
+    return LocalBackend()
+
+
+def test_mime_type_is_guessed_from_filename_for_generic_uploads():
+    assert detect_mime_type(_upload(b"", "notes.md")) == "text/markdown"
+    assert (
+        detect_mime_type(_upload(b"", "data.csv", "application/octet-stream"))
+        == "text/csv"
+    )
+    assert detect_mime_type(_upload(b"", "x.bin", "text/plain; charset=utf-8")) == (
+        "text/plain"
+    )
+
+
+def test_html_to_text_keeps_blocks_and_drops_scripts():
+    html = (
+        "<html><head><title>t</title><style>p{}</style></head><body>"
+        "<h1>Titel</h1><p>Erster&nbsp;Absatz</p><script>x()</script>"
+        "<ul><li>eins</li><li>zwei</li></ul></body></html>"
+    )
+
+    assert html_to_text(html) == "Titel\n\nErster Absatz\n\neins\n\nzwei"
+
+
+@pytest.mark.asyncio
+async def test_local_backend_parses_csv_and_eml(local: LocalBackend):
+    csv = "Straße;Nr\nMarienplatz;8\n".encode("cp1252")
+    eml = (
+        b"From: a@example.org\r\nTo: b@example.org\r\nSubject: Termin\r\n"
+        b"Content-Type: text/plain; charset=utf-8\r\n\r\nBis morgen.\r\n"
+    )
+
+    assert await local.parse(_upload(csv, "export.csv")) == "Straße;Nr\nMarienplatz;8"
+    assert await local.parse(_upload(eml, "mail.eml")) == (
+        "From: a@example.org\nTo: b@example.org\nSubject: Termin\n\nBis morgen."
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_backend_rejects_unsupported_types(local: LocalBackend):
+    with pytest.raises(UnsupportedFileTypeError):
+        await local.parse(_upload(b"%PDF", "doc.pdf", "application/pdf"))
+
+
+@pytest.mark.asyncio
+async def test_routing_backend_sends_only_routed_types_to_local(local: LocalBackend):
+    fallback = MagicMock(name="xberg")
+    fallback.name = "xberg"
+    fallback.parse = AsyncMock(return_value="from xberg")
+    fallback.parse_batch = AsyncMock(return_value=["from xberg"])
+    router = RoutingBackend(
+        local=local, fallback=fallback, local_mime_types={"text/plain"}
+    )
+
+    assert await router.parse(_upload(b"hello", "a.txt")) == "hello"
+    assert await router.parse(_upload(b"<p>x</p>", "a.html")) == "from xberg"
+    assert await router.parse(_upload(b"x" * 2048, "big.txt")) == "from xberg"
+    assert await router.parse_batch(
+        [_upload(b"hello", "a.txt"), _upload(b"%PDF", "b.pdf")]
+    ) == ["hello", "from xberg"]
+    assert router.name == "local+xberg"
+
+
+def test_factory_routes_configured_mime_types_locally(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    settings = MagicMock(
+        PARSER_BACKEND=ParserBackendType.XBERG,
+        PARSER_ROUTES={
+            "text/plain": ParserBackendType.LOCAL,
+            "text/html": ParserBackendType.XBERG,
+        },
+        PARSER_LOCAL_MAX_BYTES=1024,
+        PARSER_LOCAL_WORKERS=1,
+        XBERG_URL="http://xberg",
+    )
+    for module in ("parsing.factory", "parsing.local", "parsing.xberg"):
+        monkeypatch.setattr(f"{module}.get_settings", lambda: settings)
+
+    parser = get_parser()
+
+    assert isinstance(parser, RoutingBackend)
+    assert parser.route(_upload(b"", "a.txt")) is parser._local
+    assert parser.route(_upload(b"", "a.html")) is parser._fallback
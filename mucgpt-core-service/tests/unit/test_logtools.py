@@ -0,0 +1,88 @@
+import io
+import json
+import logging
+import logging.config
+import threading
+
+from core.logtools import SamplingFilter
+
+
+def _configure(stream: io.StringIO, name: str) -> logging.Handler:
+    logging.config.dictConfig(
+        {
+            "version": 1,
+            "disable_existing_loggers": False,
+            "formatters": {"json": {"class": "core.logtools.JsonFormatter"}},
+            "handlers": {
+                "console": {
+                    "class": "logging.StreamHandler",
+                    "formatter": "json",
+                    "stream": stream,
+                },
+                "queue": {
+                    "class": "core.logtools.BackgroundQueueHandler",
+                    "handlers": ["console"],
+                },
+            },
+            "loggers": {name: {"level": "INFO", "handlers": ["queue"]}},
+        }
+    )
+    return logging.getHandlerByName("queue")
+
+
+def test_queue_handler_formats_records_on_listener_thread():
+    stream = io.StringIO()
+    handler = _configure(stream, "test-queue-logging")
+    formatting_threads: list[str] = []
+    console = handler.listener.handlers[0]
+    original_format = console.format
+
+    def format(record: logging.LogRecord) -> str:
+        formatting_threads.append(threading.current_thread().name)
+        return original_format(record)
+
+    console.format = format
+    logger = logging.getLogger("test-queue-logging")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Failed for %s", "user-1")
+    handler.close()
+
+    record = json.loads(stream.getvalue())
+    assert record["message"] == "Failed for user-1"
+    assert record["exception"] == "boom"
+    assert "ValueError" in record["traceback"]
+    assert formatting_threads
+    assert threading.current_thread().name not in formatting_threads
+
+
+def test_queue_handler_merges_arguments_in_the_calling_thread():
+    handler = _configure(io.StringIO(), "test-queue-prepare")
+    tools = ["search"]
+    record = logging.LogRecord(
+        "test-queue-prepare", logging.INFO, __file__, 1, "Tools: %s", (tools,), None
+    )
+
+    prepared = handler.prepare(record)
+    tools.append("calculator")
+    handler.close()
+
+    assert prepared.getMessage() == "Tools: ['search']"
+    assert prepared.args is None
+    assert record.args == (tools,)
+
+
+def test_sampling_filter_keeps_every_nth_record_per_message():
+    sampling = SamplingFilter(every="3")
+
+    def record(msg: str, level: int = logging.INFO) -> logging.LogRecord:
+        return logging.LogRecord("hot", level, __file__, 1, msg, (), None)
+
+    kept = [sampling.filter(record("selected Tools: %s")) for _ in range(6)]
+
+    assert kept == [True, False, False, True, False, False]
+    assert sampling.filter(record("Policy decision: %s"))
+    assert all(
+        sampling.filter(record("selected Tools: %s", logging.WARNING)) for _ in range(3)
+    )
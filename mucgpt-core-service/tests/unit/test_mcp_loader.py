@@ -2,7 +2,6 @@ from collections.abc import AsyncIterator, Callable, Iterator
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from unittest.mock import AsyncMock, patch
 
-import cloudpickle
 import pytest
 from mcp.types import ListToolsResult
 from mcp.types import Tool as MCPTool
@@ -10,12 +9,22 @@ from mcp.types import Tool as MCPTool
 from agent.tools.mcp import McpBearerAuthProvider, McpLoader
 from config.settings import MCPConfig, MCPSourceConfig, MCPTransport
 from core.auth_models import AuthenticationResult
+from core.cache import CacheUnavailableError
+from core.cache_codec import encode
+from core.tiered_cache import TieredCache
 
 SECRET_HEADER_VALUE = "supersecretheadervalue123"
 SECRET_OVERRIDE_VALUE = "supersecretoverridevalue456"
 FORWARDED_TOKEN_VALUE = "supersecretforwardedtoken789"
 
 
+@pytest.fixture(autouse=True)
+def reset_local_cache() -> Iterator[None]:
+    TieredCache.reset()
+    yield
+    TieredCache.reset()
+
+
 class FakeSession:
     def __init__(self, pages: list[list[MCPTool]]) -> None:
         self._pages = pages
@@ -236,9 +245,9 @@ class TestLoadMcpTools:
         cached_obj = mock_set_object.call_args.kwargs["obj"]
 
         assert isinstance(cached_obj, dict)
-        assert isinstance(cached_obj["src"][0], MCPTool)
+        assert cached_obj["src"][0]["name"] == "a"
 
-        dumped = cloudpickle.dumps(cached_obj)
+        dumped = encode(cached_obj, compression_min_bytes=2**31)
         assert SECRET_HEADER_VALUE.encode() not in dumped
         assert SECRET_OVERRIDE_VALUE.encode() not in dumped
         # The forwarded user bearer token is a secret too, not just static config
@@ -347,7 +356,7 @@ class TestLoadMcpTools:
             "_mcp_settings",
             MCPConfig(SOURCES={"src": source_cfg}, CACHE_TTL=100),
         )
-        cached_raw = {"src": [MCPTool(name="a", inputSchema={"type": "object"})]}
+        cached_raw = {"src": [{"name": "a", "inputSchema": {"type": "object"}}]}
 
         create_session_mock = AsyncMock(side_effect=AssertionError("should not connect"))
         # Spy on the real _build_connection rather than stubbing it out, so we can
@@ -381,7 +390,7 @@ class TestLoadMcpTools:
             MCPConfig(SOURCES={}, CACHE_TTL=100),
         )
         cached_raw = {
-            "removed_source": [MCPTool(name="a", inputSchema={"type": "object"})]
+            "removed_source": [{"name": "a", "inputSchema": {"type": "object"}}]
         }
 
         with patch(
@@ -422,3 +431,28 @@ class TestLoadMcpTools:
 
         assert len(tools) == 1
         assert tools[0].name == "a"
+
+    @pytest.mark.asyncio
+    async def test_unavailable_redis_falls_back_to_uncached_load(self, monkeypatch):
+        source_cfg = make_source("http://mcp.example/sse")
+        monkeypatch.setattr(
+            McpLoader,
+            "_mcp_settings",
+            MCPConfig(SOURCES={"src": source_cfg}, CACHE_TTL=100),
+        )
+        fake_session = FakeSession(
+            pages=[[MCPTool(name="a", inputSchema={"type": "object"})]]
+        )
+        fake_create_session = make_fake_create_session(
+            {"http://mcp.example/sse": fake_session}
+        )
+        unavailable = AsyncMock(side_effect=CacheUnavailableError("open"))
+
+        with (
+            patch("agent.tools.mcp.create_session", fake_create_session),
+            patch("agent.tools.mcp.RedisCache.get_redis", unavailable),
+            patch("agent.tools.mcp.RedisCache.get_object", unavailable),
+        ):
+            tools = await McpLoader.load_mcp_tools(make_user(), force_reload=False)
+
+        assert [tool.name for tool in tools] == ["a"]
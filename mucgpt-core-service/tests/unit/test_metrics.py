@@ -0,0 +1,32 @@
+from core.metrics import Metrics
+
+
+def setup_function():
+    Metrics.reset()
+
+
+def test_counters_are_tracked_per_label_set():
+    Metrics.inc("requests_total", result="hit")
+    Metrics.inc("requests_total", result="hit")
+    Metrics.inc("requests_total", 3, result="miss")
+
+    assert Metrics.value("requests_total", result="hit") == 2
+    assert Metrics.value("requests_total", result="miss") == 3
+    assert Metrics.value("requests_total", result="other") == 0
+
+
+def test_render_uses_prometheus_text_format():
+    Metrics.inc("requests_total", result='a"b')
+    Metrics.observe("duration_seconds", 0.2, buckets=(0.1, 1.0), route="/x")
+    Metrics.observe("duration_seconds", 5.0, buckets=(0.1, 1.0), route="/x")
+
+    rendered = Metrics.render()
+
+    assert "# TYPE requests_total counter" in rendered
+    assert 'requests_total{result="a\\"b"} 1.0' in rendered
+    assert "# TYPE duration_seconds histogram" in rendered
+    assert 'duration_seconds_bucket{route="/x",le="0.1"} 0' in rendered
+    assert 'duration_seconds_bucket{route="/x",le="1.0"} 1' in rendered
+    assert 'duration_seconds_bucket{route="/x",le="+Inf"} 2' in rendered
+    assert 'duration_seconds_count{route="/x"} 2' in rendered
+    assert Metrics.value("duration_seconds", route="/x") == 2
@@ -0,0 +1,190 @@
+import asyncio
+import json
+
+import pytest
+
+import config.model_metadata as model_metadata
+from config.model_metadata import ModelMetadataLoader, endpoint_key, load_snapshot
+from config.settings import ModelsConfig
+
+INFO_ENTRY = {
+    "model_name": "gpt-4o-mini",
+    "model_info": {
+        "max_output_tokens": 16384,
+        "max_input_tokens": 128000,
+        "description": "Small model",
+    },
+    "litellm_params": {
+        "model": "azure/gpt-4o-mini",
+        "api_base": "https://internal.example",
+        "input_cost_per_token": "1e-07",
+    },
+}
+
+
+def _model(name: str = "gpt-4o-mini", endpoint: str = "https://proxy/v1/"):
+    return ModelsConfig(
+        type="OPENAI", llm_name=name, endpoint=endpoint, api_key="proxy-key"
+    )
+
+
+class FakeInfoEndpoint:
+    def __init__(self, payloads: dict[str, list] | None = None, fail: bool = False):
+        self.payloads = payloads or {}
+        self.fail = fail
+        self.calls: list[str] = []
+
+    async def __call__(self, client, endpoint, api_key):
+        url = endpoint.unicode_string()
+        self.calls.append(url)
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError(f"Request to {url} timed out")
+        return self.payloads.get(url, [INFO_ENTRY])
+
+
+@pytest.fixture
+def info_endpoint(monkeypatch: pytest.MonkeyPatch) -> FakeInfoEndpoint:
+    endpoint = FakeInfoEndpoint()
+    monkeypatch.setattr(model_metadata, "aload_model_info", endpoint)
+    return endpoint
+
+
+@pytest.mark.asyncio
+async def test_models_on_one_endpoint_share_a_single_request(info_endpoint, tmp_path):
+    small_model = _model()
+    other_small_model = _model(name="azure/gpt-4o-mini")
+    remote_model = _model(endpoint="https://other-proxy/v1/")
+
+    await ModelMetadataLoader.initialize(
+        [small_model, other_small_model, remote_model], tmp_path / "info.json"
+    )
+
+    assert sorted(info_endpoint.calls) == [
+        "https://other-proxy/v1/",
+        "https://proxy/v1/",
+    ]
+    assert small_model.max_input_tokens == 128000
+    assert other_small_model.description == "Small model"
+    assert remote_model.max_output_tokens == 16384
+
+
+@pytest.mark.asyncio
+async def test_snapshot_keeps_only_enrichment_fields(info_endpoint, tmp_path):
+    snapshot_path = tmp_path / "info.json"
+    model = _model()
+
+    await ModelMetadataLoader.initialize([model], snapshot_path)
+
+    stored = load_snapshot(snapshot_path)[endpoint_key(model)][0]
+    assert stored["model_info"] == INFO_ENTRY["model_info"]
+    assert stored["litellm_params"] == {
+        "model": "azure/gpt-4o-mini",
+        "input_cost_per_token": "1e-07",
+    }
+    assert "proxy-key" not in snapshot_path.read_text()
+
+
+@pytest.mark.asyncio
+async def test_startup_uses_snapshot_and_refreshes_in_background(
+    info_endpoint, tmp_path
+):
+    snapshot_path = tmp_path / "info.json"
+    await ModelMetadataLoader.initialize([_model()], snapshot_path)
+    info_endpoint.calls.clear()
+    refreshed_entry = {
+        **INFO_ENTRY,
+        "model_info": {**INFO_ENTRY["model_info"], "max_input_tokens": 200000},
+    }
+    info_endpoint.payloads = {"https://proxy/v1/": [refreshed_entry]}
+    model = _model()
+    configured_model = _model(name="azure/gpt-4o-mini")
+    configured_model.model_info.max_output_tokens = 1000
+
+    await ModelMetadataLoader.initialize([model, configured_model], snapshot_path)
+
+    assert model.max_input_tokens == 128000
+    assert info_endpoint.calls == []
+    await ModelMetadataLoader._refresh_task
+    assert info_endpoint.calls == ["https://proxy/v1/"]
+    stored = load_snapshot(snapshot_path)[endpoint_key(model)][0]
+    assert stored["model_info"]["max_input_tokens"] == 200000
+    assert model.max_input_tokens == 200000
+    assert configured_model.max_input_tokens == 200000
+    assert configured_model.max_output_tokens == 1000
+    await ModelMetadataLoader.stop_refresh()
+
+
+@pytest.mark.asyncio
+async def test_workers_use_the_snapshot_written_by_preload(info_endpoint, tmp_path):
+    snapshot_path = tmp_path / "info.json"
+    await ModelMetadataLoader.preload([_model()], snapshot_path)
+    info_endpoint.calls.clear()
+    model = _model()
+
+    await ModelMetadataLoader.initialize([model], snapshot_path, refresh=False)
+
+    assert model.max_input_tokens == 128000
+    assert info_endpoint.calls == []
+    assert ModelMetadataLoader._refresh_task is None
+
+
+@pytest.mark.asyncio
+async def test_preload_keeps_snapshot_when_endpoint_is_unreachable(
+    info_endpoint, monkeypatch: pytest.MonkeyPatch, tmp_path
+):
+    snapshot_path = tmp_path / "info.json"
+    await ModelMetadataLoader.preload([_model()], snapshot_path)
+    monkeypatch.setattr(model_metadata, "aload_model_info", FakeInfoEndpoint(fail=True))
+
+    await ModelMetadataLoader.preload([_model()], snapshot_path)
+
+    assert endpoint_key(_model()) in load_snapshot(snapshot_path)
+
+
+@pytest.mark.asyncio
+async def test_outdated_snapshot_falls_back_to_endpoint(info_endpoint, tmp_path):
+    snapshot_path = tmp_path / "info.json"
+    model = _model()
+    snapshot_path.write_text(
+        json.dumps(
+            {
+                "version": model_metadata.SNAPSHOT_VERSION,
+                "endpoints": {endpoint_key(model): [{"model_name": "retired-model"}]},
+            }
+        )
+    )
+
+    await ModelMetadataLoader.initialize([model], snapshot_path)
+
+    assert info_endpoint.calls == ["https://proxy/v1/"]
+    assert model.max_input_tokens == 128000
+
+
+@pytest.mark.asyncio
+async def test_unreachable_endpoint_without_snapshot_raises(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+):
+    monkeypatch.setattr(model_metadata, "aload_model_info", FakeInfoEndpoint(fail=True))
+
+    with pytest.raises(ValueError, match="is reachable"):
+        await ModelMetadataLoader.initialize([_model()], tmp_path / "info.json")
+
+
+@pytest.mark.asyncio
+async def test_models_with_complete_metadata_skip_the_endpoint(info_endpoint):
+    model = ModelsConfig(
+        type="OPENAI",
+        llm_name="manual",
+        endpoint="https://proxy/v1/",
+        api_key="proxy-key",
+        model_info={
+            "max_output_tokens": 100,
+            "max_input_tokens": 200,
+            "description": "Manual",
+        },
+    )
+
+    await ModelMetadataLoader.initialize([model], None)
+
+    assert info_endpoint.calls == []
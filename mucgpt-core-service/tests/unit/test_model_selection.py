@@ -7,7 +7,9 @@ from langchain_core.tools import tool
 from langchain_openai import ChatOpenAI
 from langgraph.runtime import Runtime
 
+import agent.middleware as middleware
 from agent.middleware import ContextMiddleware, RequestContext
+from api.api_models import ChatCompletionRequest
 from config.model_provider import ModelRegistry, ModelsConfigurationException
 from config.settings import ModelsConfig
 
@@ -153,6 +155,92 @@ def test_wrap_model_call_omits_unsupported_temperature(
     assert configured_request.model_settings["stream"] is True
 
 
+def _models_config(max_output_tokens: int) -> ModelsConfig:
+    return ModelsConfig(
+        type="OPENAI",
+        llm_name="selected-model",
+        endpoint="https://example.test",
+        api_key="test",
+        model_info={
+            "auto_enrich_from_model_info_endpoint": False,
+            "max_output_tokens": max_output_tokens,
+            "max_input_tokens": 128_000,
+            "description": "Selected test model",
+        },
+    )
+
+
+def test_clamp_max_tokens_respects_model_output_limit() -> None:
+    config = _models_config(max_output_tokens=1000)
+
+    assert config.clamp_max_tokens(4096) == 1000
+    assert config.clamp_max_tokens(200) == 200
+    assert config.clamp_max_tokens(None) == 1000
+
+
+def test_wrap_model_call_applies_clamped_max_tokens_and_stop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        ModelRegistry,
+        "get_model",
+        lambda _name=None: FakeListChatModel(responses=["selected"]),
+    )
+    monkeypatch.setattr(
+        middleware,
+        "get_model_config",
+        lambda _name: _models_config(max_output_tokens=1000),
+    )
+    handler = MagicMock(return_value=ModelResponse(result=[]))
+
+    ContextMiddleware().wrap_model_call(
+        _model_request(
+            RequestContext(model_name="selected-model", max_tokens=4096, stop=["END"])
+        ),
+        handler,
+    )
+
+    model_settings = handler.call_args.args[0].model_settings
+    assert model_settings["max_tokens"] == 1000
+    assert model_settings["stop"] == ["END"]
+
+
+def test_request_without_max_tokens_uses_model_output_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        ModelRegistry,
+        "get_model",
+        lambda _name=None: FakeListChatModel(responses=["selected"]),
+    )
+    monkeypatch.setattr(
+        middleware,
+        "get_model_config",
+        lambda _name: _models_config(max_output_tokens=16_000),
+    )
+    handler = MagicMock(return_value=ModelResponse(result=[]))
+    request = ChatCompletionRequest(messages=[{"role": "user", "content": "hi"}])
+
+    ContextMiddleware().wrap_model_call(
+        _model_request(
+            RequestContext(model_name="selected-model", max_tokens=request.max_tokens)
+        ),
+        handler,
+    )
+
+    assert handler.call_args.args[0].model_settings["max_tokens"] == 16_000
+
+
+def test_normalize_model_settings_drops_stop_for_reasoning_models() -> None:
+    model = ChatOpenAI(model="gpt-5", api_key="test")
+
+    settings = ModelRegistry.normalize_model_settings(
+        model, {"stop": ["END"], "max_tokens": 100}
+    )
+
+    assert settings == {"max_tokens": 100}
+
+
 def test_normalize_model_settings_preserves_unknown_model_temperature() -> None:
     model = ChatOpenAI(model="custom-proxy-model", api_key="test")
 
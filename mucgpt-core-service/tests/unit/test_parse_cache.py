@@ -0,0 +1,81 @@
+import io
+from typing import Any
+
+import pytest
+from fastapi import UploadFile
+
+from core.metrics import Metrics
+from parsing.cache import ParseCache
+
+REQUESTS_METRIC = "mucgpt_parse_cache_requests_total"
+
+
+@pytest.fixture
+def redis_store(monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+    store: dict[str, Any] = {}
+
+    async def get_object(key: str) -> Any | None:
+        return store.get(key)
+
+    async def set_object(key: str, obj: Any, ttl: int | None = None) -> None:
+        store[key] = obj
+
+    monkeypatch.setattr("parsing.cache.RedisCache.get_object", get_object)
+    monkeypatch.setattr("parsing.cache.RedisCache.set_object", set_object)
+    Metrics.reset()
+    return store
+
+
+def _upload(content: bytes, filename: str = "doc.pdf") -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename=filename, size=len(content))
+
+
+@pytest.mark.asyncio
+async def test_key_depends_on_content_type_and_backend_only():
+    upload = _upload(b"same bytes", filename="a.pdf")
+
+    key = await ParseCache.build_key(upload, backend="xberg")
+
+    assert key == await ParseCache.build_key(
+        _upload(b"same bytes", filename="b.pdf"), backend="xberg"
+    )
+    assert key != await ParseCache.build_key(
+        _upload(b"same bytes", filename="a.txt"), backend="xberg"
+    )
+    assert key != await ParseCache.build_key(_upload(b"other"), backend="xberg")
+    assert key != await ParseCache.build_key(_upload(b"same bytes"), backend="other")
+    assert await upload.read() == b"same bytes"
+
+
+@pytest.mark.asyncio
+async def test_hit_returns_text_and_counts_saved_bytes(redis_store: dict[str, Any]):
+    key = await ParseCache.build_key(_upload(b"pdf"), backend="xberg")
+
+    assert await ParseCache.get(key, upload_bytes=3) is None
+    await ParseCache.set(key, "extracted")
+
+    assert await ParseCache.get(key, upload_bytes=3) == "extracted"
+    assert Metrics.value(REQUESTS_METRIC, result="miss") == 1
+    assert Metrics.value(REQUESTS_METRIC, result="hit") == 1
+    assert Metrics.value("mucgpt_parse_cache_bytes_saved_total") == 3
+
+
+@pytest.mark.asyncio
+async def test_large_texts_are_stored_compressed(redis_store: dict[str, Any]):
+    text = "Absatz über Verwaltungsvorschriften. " * 1000
+
+    await ParseCache.set("key", text)
+
+    assert redis_store["key"]["compressed"] is True
+    assert len(redis_store["key"]["data"]) < len(text)
+    assert await ParseCache.get("key") == text
+
+
+@pytest.mark.asyncio
+async def test_lookup_failure_is_a_miss(monkeypatch: pytest.MonkeyPatch):
+    async def failing_get_object(key: str) -> Any:
+        raise RuntimeError("Redis client not initialized")
+
+    monkeypatch.setattr("parsing.cache.RedisCache.get_object", failing_get_object)
+
+    assert await ParseCache.get("key") is None
@@ -0,0 +1,72 @@
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from core.prompt_pool import PROMPT_POOL_DIR, PromptPool
+
+
+@pytest.fixture
+def prompt_dir(tmp_path: Path):
+    (tmp_path / "generation_prompts").mkdir()
+    (tmp_path / "generation_prompts" / "prompt_for_title.md").write_text(
+        "Titel", encoding="utf-8"
+    )
+    (tmp_path / "default_instructions.md").write_text("Default", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    PromptPool.load(tmp_path)
+    yield tmp_path
+    PromptPool.load(PROMPT_POOL_DIR)
+
+
+def test_load_indexes_markdown_files_by_relative_path(prompt_dir: Path):
+    assert PromptPool.get("generation_prompts/prompt_for_title.md") == "Titel"
+    assert PromptPool.get("default_instructions.md") == "Default"
+    with pytest.raises(KeyError):
+        PromptPool.get("notes.txt")
+
+
+def test_get_does_not_touch_disk_after_load(prompt_dir: Path):
+    (prompt_dir / "default_instructions.md").unlink()
+
+    assert PromptPool.get("default_instructions.md") == "Default"
+
+
+def test_version_changes_only_with_content(prompt_dir: Path):
+    version = PromptPool.version()
+    PromptPool.load()
+    assert PromptPool.version() == version
+
+    (prompt_dir / "default_instructions.md").write_text("Changed", encoding="utf-8")
+    PromptPool.load()
+    assert PromptPool.version() != version
+
+
+@pytest.mark.asyncio
+async def test_watch_reloads_changed_files(prompt_dir: Path):
+    PromptPool.start_watching(interval=0.01)
+    try:
+        target = prompt_dir / "default_instructions.md"
+        target.write_text("Reloaded", encoding="utf-8")
+        stat = target.stat()
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        for _ in range(100):
+            if PromptPool.get("default_instructions.md") == "Reloaded":
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await PromptPool.stop_watching()
+
+    assert PromptPool.get("default_instructions.md") == "Reloaded"
+
+
+def test_shipped_pool_contains_all_prompt_groups():
+    PromptPool.load(PROMPT_POOL_DIR)
+
+    assert PromptPool.get("default_instructions.md")
+    assert PromptPool.get("tool_instructions.md")
+    assert PromptPool.get("generation_prompts/prompt_for_systemprompt.md")
+    assert PromptPool.get("compliance_prompts/prompt_for_compliance_education.md")
@@ -6,6 +6,7 @@ from langchain_core.language_models.fake_chat_models import FakeListChatModel
 from agent.deep_agent import _ConfiguredLangChainDeepAgentGraph
 from agent.state_models.default_state import DefaultAgentState
 from core.auth_models import AuthenticationResult
+from core.prompt_pool import PROMPT_POOL_DIR, PromptPool
 
 
 @pytest.fixture
@@ -106,3 +107,37 @@ async def test_astream_reuses_compiled_agent_for_tool_changes(
         ]
         == DefaultAgentState.__name__
     )
+
+
+@pytest.mark.asyncio
+async def test_prompt_pool_reload_reaches_the_system_prompt(
+    monkeypatch: pytest.MonkeyPatch,
+    user_info: AuthenticationResult,
+    tmp_path,
+) -> None:
+    compiled_agent = MagicMock()
+    compiled_agent.ainvoke = AsyncMock(return_value={"messages": []})
+    create_agent = MagicMock(return_value=compiled_agent)
+    monkeypatch.setattr("agent.deep_agent.create_deep_agent", create_agent)
+    instructions = tmp_path / "default_instructions.md"
+    instructions.write_text("Before", encoding="utf-8")
+    PromptPool.load(tmp_path)
+    try:
+        graph = _ConfiguredLangChainDeepAgentGraph(
+            llm=FakeListChatModel(responses=["response"]),
+            tools=[],
+            logger=MagicMock(),
+        )
+        instructions.write_text("After", encoding="utf-8")
+        PromptPool.load()
+        for _ in range(2):
+            await graph.ainvoke(
+                {"messages": []}, config={"configurable": {"user_info": user_info}}
+            )
+    finally:
+        PromptPool.load(PROMPT_POOL_DIR)
+
+    assert [call.kwargs["system_prompt"] for call in create_agent.call_args_list] == [
+        "Before",
+        "After",
+    ]
@@ -0,0 +1,95 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+import core.cache as cache
+from agent.checkpointer import RedisCheckpointSaver
+from core.cache import CacheUnavailableError, CircuitBreaker, RedisCache
+from core.cache_codec import encode
+from core.tiered_cache import TieredCache
+from parsing.cache import ParseCache
+
+
+class FlakyRedis:
+    def __init__(self):
+        self.healthy = False
+        self.calls = 0
+
+    async def get(self, name: str) -> bytes:
+        self.calls += 1
+        if not self.healthy:
+            raise RedisConnectionError("connection refused")
+        return encode({"name": name}, 1024)
+
+    async def expire(self, name: str, time: int) -> bool:
+        self.calls += 1
+        raise RedisConnectionError("connection refused")
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> FlakyRedis:
+    fake = FlakyRedis()
+    monkeypatch.setattr(RedisCache, "_redis_client", fake)
+    monkeypatch.setattr(RedisCache, "_breaker", CircuitBreaker(2, reset_seconds=10))
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_consecutive_failures(redis: FlakyRedis):
+    for _ in range(2):
+        with pytest.raises(RedisConnectionError):
+            await RedisCache.get_object("key")
+
+    with pytest.raises(CacheUnavailableError):
+        await RedisCache.get_object("key")
+    with pytest.raises(CacheUnavailableError):
+        await RedisCache.get_redis()
+    assert redis.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_breaker_closes_after_successful_probe(
+    redis: FlakyRedis, monkeypatch: pytest.MonkeyPatch
+):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    for _ in range(2):
+        with pytest.raises(RedisConnectionError):
+            await RedisCache.get_object("key")
+
+    now[0] += 11
+    with pytest.raises(RedisConnectionError):
+        await RedisCache.get_object("key")
+    with pytest.raises(CacheUnavailableError):
+        await RedisCache.get_object("key")
+
+    now[0] += 11
+    redis.healthy = True
+    assert await RedisCache.get_object("key") == {"name": "key"}
+    assert not RedisCache._breaker.is_open
+    assert redis.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_breaker_covers_callers_outside_get_object(
+    redis: FlakyRedis, monkeypatch: pytest.MonkeyPatch
+):
+    async def cached_entry(key: str) -> dict:
+        return {"compressed": False, "data": b"text"}
+
+    monkeypatch.setattr(RedisCache, "get_object", cached_entry)
+    # The TTL refresh of a parse cache hit fails and is swallowed.
+    for _ in range(2):
+        assert await ParseCache.get("key") == "text"
+
+    with pytest.raises(CacheUnavailableError):
+        await TieredCache.invalidate("key")
+    with pytest.raises(CacheUnavailableError):
+        await RedisCheckpointSaver(ttl_seconds=60).aget_tuple(
+            {"configurable": {"thread_id": "t"}}
+        )
+    assert redis.calls == 2
+
+
+def test_sentinel_addresses_default_to_sentinel_port():
+    assert cache._parse_sentinel("sentinel-0:26380") == ("sentinel-0", 26380)
+    assert cache._parse_sentinel("sentinel-1") == ("sentinel-1", 26379)
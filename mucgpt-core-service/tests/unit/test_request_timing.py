@@ -0,0 +1,70 @@
+import asyncio
+import logging
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from core.metrics import Metrics
+from core.request_timing import (
+    DURATION_METRIC,
+    FIRST_BYTE_METRIC,
+    RESPONSE_START_METRIC,
+    RequestTimingMiddleware,
+)
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int) -> dict:
+        return {"id": item_id}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            yield b"data: first\n\n"
+            await asyncio.sleep(0.05)
+            yield b"data: last\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    app.add_middleware(
+        RequestTimingMiddleware, logger=logging.getLogger("request-timing-test")
+    )
+    return TestClient(app)
+
+
+def setup_function():
+    Metrics.reset()
+
+
+def test_requests_are_recorded_per_route_template():
+    client = _client()
+
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/unknown")
+
+    labels = {"method": "GET", "route": "/items/{item_id}"}
+    assert Metrics.value(RESPONSE_START_METRIC, **labels) == 2
+    assert Metrics.value(FIRST_BYTE_METRIC, **labels) == 2
+    assert Metrics.value(DURATION_METRIC, status="200", **labels) == 2
+    assert (
+        Metrics.value(DURATION_METRIC, method="GET", route="unmatched", status="404")
+        == 1
+    )
+
+
+def test_streamed_responses_are_timed_until_the_last_chunk():
+    client = _client()
+
+    response = client.get("/stream")
+
+    assert response.text == "data: first\n\ndata: last\n\n"
+    histograms = Metrics._histograms
+    labels = (("method", "GET"), ("route", "/stream"))
+    first_byte = histograms[FIRST_BYTE_METRIC][labels].sum
+    duration = histograms[DURATION_METRIC][labels + (("status", "200"),)].sum
+    assert duration - first_byte >= 0.05
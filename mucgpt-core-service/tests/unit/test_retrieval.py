@@ -0,0 +1,167 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from langchain.agents.middleware import ModelRequest, ModelResponse
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.runtime import Runtime
+
+import agent.middleware as middleware
+from agent.middleware import ContextMiddleware, RequestContext
+from agent.retrieval import (
+    RetrievalIndexCache,
+    aselect_relevant_chunks,
+    build_index,
+    select_relevant_chunks,
+)
+from agent.token_budget import TokenCounter
+from config.model_provider import ModelRegistry
+from config.settings import DataSourceRetrievalConfig
+from core.metrics import Metrics
+
+CONFIG = DataSourceRetrievalConfig(
+    ENABLED=True, MIN_TOTAL_TOKENS=100, TOP_K=2, CHUNK_MAX_TOKENS=120
+)
+
+HANDBOOK = "\n\n".join(
+    [
+        "# Travel",
+        "Travel expenses are reimbursed within thirty days of submission.",
+        "# Holidays",
+        "Employees receive thirty holidays per year plus public holidays.",
+        "# Parking",
+        "Parking permits for the city garage are issued by facility management.",
+    ]
+)
+
+
+def _counter() -> TokenCounter:
+    return TokenCounter(chars_per_token=1.0)
+
+
+@pytest.fixture(autouse=True)
+def reset_index_cache():
+    RetrievalIndexCache.reset()
+    yield
+    RetrievalIndexCache.reset()
+
+
+def test_search_ranks_matching_chunk_first():
+    index = build_index(
+        [{"title": "handbook.md", "content": HANDBOOK}], 120, _counter()
+    )
+
+    hits = index.search("How many holidays do I get?", top_k=3)
+
+    assert hits[0][1].chunk.heading == "Holidays"
+    assert all(score > 0 for score, _ in hits)
+
+
+def test_select_returns_relevant_chunks_with_provenance():
+    sources = [
+        {"title": "handbook.md", "content": HANDBOOK, "metadata": {"owner": "HR"}}
+    ]
+
+    selected = select_relevant_chunks(sources, "parking permits", CONFIG, _counter())
+
+    assert selected is not None
+    assert selected[0]["title"] == "handbook.md"
+    assert "Parking permits" in selected[0]["content"]
+    assert "Travel expenses" not in selected[0]["content"]
+    metadata = selected[0]["metadata"]
+    assert metadata["owner"] == "HR"
+    assert metadata["section"] == "Parking"
+    assert metadata["excerpt"] == "part 3 of 3"
+    start, end = map(int, metadata["characters"].split("-"))
+    assert HANDBOOK[start:end] == selected[0]["content"]
+
+
+def test_select_keeps_chunks_in_document_order():
+    selected = select_relevant_chunks([HANDBOOK], "parking travel", CONFIG, _counter())
+
+    assert selected is not None
+    assert [s["metadata"]["section"] for s in selected] == ["Travel", "Parking"]
+
+
+@pytest.mark.parametrize(
+    ("sources", "query", "config"),
+    [
+        ([HANDBOOK], "parking", CONFIG.model_copy(update={"ENABLED": False})),
+        (["short note about parking"], "parking", CONFIG),
+        ([HANDBOOK], "   ", CONFIG),
+        ([HANDBOOK], "quantum chromodynamics", CONFIG),
+    ],
+)
+def test_select_falls_back_to_full_sources(sources, query, config):
+    assert select_relevant_chunks(sources, query, config, _counter()) is None
+
+
+def test_index_is_cached_by_content(monkeypatch: pytest.MonkeyPatch):
+    built = MagicMock(wraps=build_index)
+    monkeypatch.setattr("agent.retrieval.build_index", built)
+
+    select_relevant_chunks([HANDBOOK], "parking", CONFIG, _counter())
+    select_relevant_chunks([HANDBOOK], "holidays", CONFIG, _counter())
+    select_relevant_chunks([HANDBOOK + " Updated."], "holidays", CONFIG, _counter())
+
+    assert built.call_count == 2
+
+
+def test_index_cache_evicts_least_recently_used():
+    config = CONFIG.model_copy(update={"INDEX_CACHE_SIZE": 1})
+
+    RetrievalIndexCache.get_or_build(["first " * 50], config, _counter())
+    RetrievalIndexCache.get_or_build(["second " * 50], config, _counter())
+
+    assert len(RetrievalIndexCache._indexes) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_select_builds_index_off_the_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    build_threads: list[threading.Thread] = []
+
+    def build(*args):
+        build_threads.append(threading.current_thread())
+        return build_index(*args)
+
+    monkeypatch.setattr("agent.retrieval.build_index", build)
+
+    first = await aselect_relevant_chunks([HANDBOOK], "parking", CONFIG, _counter())
+    second = await aselect_relevant_chunks([HANDBOOK], "parking", CONFIG, _counter())
+
+    assert first == second
+    assert "facility management" in first[0]["content"]
+    assert len(build_threads) == 1
+    assert build_threads[0] is not threading.current_thread()
+
+
+def test_context_middleware_injects_only_relevant_chunks(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(
+        ModelRegistry,
+        "get_model",
+        lambda _name=None: FakeListChatModel(responses=["selected"]),
+    )
+    monkeypatch.setattr(middleware, "get_token_counter", _counter)
+    monkeypatch.setattr(middleware, "get_retrieval_settings", lambda: CONFIG)
+    Metrics.reset()
+    request = ModelRequest(
+        model=FakeListChatModel(responses=["bootstrap"]),
+        messages=[HumanMessage(content="Who issues parking permits?")],
+        system_message=SystemMessage(content="system"),
+        tools=[],
+        state={"data_sources": [{"title": "handbook.md", "content": HANDBOOK}]},
+        runtime=Runtime(context=RequestContext(assistant_id="assistant-1")),
+    )
+    handler = MagicMock(return_value=ModelResponse(result=[]))
+
+    ContextMiddleware().wrap_model_call(request, handler)
+
+    injected = handler.call_args.args[0].messages[0].content
+    assert "facility management" in injected
+    assert "Travel expenses" not in injected
+    assert Metrics.value("mucgpt_data_source_retrieval_total", mode="retrieval") == 1
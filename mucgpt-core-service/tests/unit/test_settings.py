@@ -682,6 +682,32 @@ XBERG_TIMEOUT: 30.0
         get_settings.cache_clear()
 
 
+class TestConversationStoreSettings:
+    """Test cases for the server-side conversation store."""
+
+    def test_conversation_store_disabled_by_default(self):
+        """CONVERSATION_STORE_ENABLED defaults to False."""
+        with patch.dict(os.environ, {}, clear=True):
+            settings = Settings()
+            assert settings.CONVERSATION_STORE_ENABLED is False
+
+    def teardown_method(self):
+        get_settings.cache_clear()
+
+
+class TestDataSourceRetrievalSettings:
+    """Test cases for retrieval over uploaded data sources."""
+
+    def test_data_source_retrieval_disabled_by_default(self):
+        """DATA_SOURCE_RETRIEVAL.ENABLED defaults to False."""
+        with patch.dict(os.environ, {}, clear=True):
+            settings = Settings()
+            assert settings.DATA_SOURCE_RETRIEVAL.ENABLED is False
+
+    def teardown_method(self):
+        get_settings.cache_clear()
+
+
 class TestTranscriptionSettings:
     """Test cases for browser transcription feature flag configuration."""
 
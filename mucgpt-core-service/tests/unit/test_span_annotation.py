@@ -0,0 +1,109 @@
+import contextvars
+import json
+from typing import Any
+
+import langfuse
+import pytest
+
+from agent.middleware import _annotate_span_with_policy_state, _summarize_state_value
+from agent.state_models.default_state import DefaultAgentState
+from agent.tools.policies import DefaultScopePolicy
+from config.langfuse_provider import LangfuseProvider
+
+
+class FakeLangfuseClient:
+    def __init__(self, observation_id: str | None = "span-1"):
+        self.observation_id = observation_id
+        self.updates: list[dict[str, Any]] = []
+
+    def get_current_observation_id(self) -> str | None:
+        return self.observation_id
+
+    def update_current_span(self, **kwargs: Any) -> None:
+        self.updates.append(kwargs)
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> FakeLangfuseClient:
+    fake = FakeLangfuseClient()
+    monkeypatch.setattr(langfuse, "get_client", lambda: fake)
+    return fake
+
+
+def _state(document_chars: int) -> dict[str, Any]:
+    return {
+        "messages": ["..."],
+        "current_scope": "general",
+        "data_sources": [
+            {"title": "handbook.pdf", "content": "x" * document_chars},
+            {"title": "notes.txt", "content": "y" * 100},
+        ],
+    }
+
+
+def _annotate(state: dict[str, Any]) -> None:
+    _annotate_span_with_policy_state(DefaultScopePolicy(), state, DefaultAgentState)
+
+
+def test_large_fields_are_summarized(client: FakeLangfuseClient):
+    _annotate(_state(1_000_000))
+
+    agent_state = client.updates[0]["metadata"]["agent_state"]
+    assert agent_state["current_scope"] == "general"
+    assert agent_state["data_sources"]["count"] == 2
+    assert "messages" not in agent_state
+    assert len(json.dumps(agent_state)) < 200
+
+
+def test_fingerprint_tracks_the_documents():
+    first = _summarize_state_value(_state(1000)["data_sources"])
+    same = _summarize_state_value(_state(1000)["data_sources"])
+    edited = _summarize_state_value(_state(1001)["data_sources"])
+
+    assert first == same
+    assert first["fingerprint"] != edited["fingerprint"]
+
+
+def test_nothing_is_built_without_active_span(client: FakeLangfuseClient):
+    client.observation_id = None
+
+    _annotate(_state(1000))
+
+    assert client.updates == []
+
+
+def test_sampled_out_requests_are_not_annotated(
+    client: FakeLangfuseClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(LangfuseProvider, "_sample_rate", 0.0)
+
+    def request() -> None:
+        LangfuseProvider.sample()
+        _annotate(_state(1000))
+
+    contextvars.copy_context().run(request)
+
+    assert client.updates == []
+
+
+class UnreadableContent:
+    """Document content that only reveals its size."""
+
+    def __len__(self) -> int:
+        return 20_000_000
+
+    def __str__(self) -> str:
+        raise AssertionError("content was rendered")
+
+    def __iter__(self):
+        raise AssertionError("content was iterated")
+
+
+def test_document_content_is_never_read(client: FakeLangfuseClient):
+    state = _state(0)
+    state["data_sources"][0]["content"] = UnreadableContent()
+
+    _annotate(state)
+
+    summary = client.updates[0]["metadata"]["agent_state"]["data_sources"]
+    assert summary["count"] == 2
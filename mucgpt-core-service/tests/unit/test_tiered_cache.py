@@ -0,0 +1,215 @@
+import asyncio
+from typing import Any
+
+import pytest
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+import core.tiered_cache as tiered_cache
+from config.settings import RedisConfig
+from core.cache import CacheUnavailableError
+from core.metrics import Metrics
+from core.tiered_cache import INVALIDATION_CHANNEL, TieredCache
+
+METRIC = "mucgpt_tiered_cache_requests_total"
+
+
+class FakePubSub:
+    def __init__(self, messages: asyncio.Queue, socket_timeout: float):
+        self.messages = messages
+        self.socket_timeout = socket_timeout
+        self.channels: list[str] = []
+
+    async def subscribe(self, channel: str) -> None:
+        self.channels.append(channel)
+
+    async def listen(self):
+        # Like redis-py, a blocking read is bounded by the socket timeout.
+        while True:
+            try:
+                yield await asyncio.wait_for(self.messages.get(), self.socket_timeout)
+            except TimeoutError as exc:
+                raise RedisTimeoutError("Timeout reading from redis") from exc
+
+    async def get_message(
+        self, ignore_subscribe_messages: bool = False, timeout: float | None = 0.0
+    ):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except TimeoutError:
+            return None
+
+    async def aclose(self) -> None:
+        pass
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store: dict[str, Any] = {}
+        self.published: list[tuple[str, str]] = []
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.reads = 0
+        self.socket_timeout = 0.02
+        self.subscriptions = 0
+
+    async def publish(self, channel: str, message: str) -> None:
+        self.published.append((channel, message))
+
+    async def delete(self, key: str) -> None:
+        self.store.pop(key, None)
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> FakePubSub:
+        self.subscriptions += 1
+        return FakePubSub(self.messages, self.socket_timeout)
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    fake = FakeRedis()
+
+    async def get_object(key: str) -> Any:
+        fake.reads += 1
+        return fake.store.get(key)
+
+    async def set_object(key: str, obj: Any, ttl: int | None = None) -> None:
+        fake.store[key] = obj
+
+    async def get_redis() -> FakeRedis:
+        return fake
+
+    async def init_redis() -> None:
+        pass
+
+    monkeypatch.setattr(tiered_cache.RedisCache, "get_object", get_object)
+    monkeypatch.setattr(tiered_cache.RedisCache, "set_object", set_object)
+    monkeypatch.setattr(tiered_cache.RedisCache, "get_redis", get_redis)
+    monkeypatch.setattr(tiered_cache.RedisCache, "init_redis", init_redis)
+    monkeypatch.setattr(
+        TieredCache,
+        "_redis_settings",
+        RedisConfig(LOCAL_CACHE_MAX_ENTRIES=2, LOCAL_CACHE_TTL_SECONDS=30),
+    )
+    TieredCache.reset()
+    Metrics.reset()
+    yield fake
+    TieredCache.reset()
+
+
+@pytest.mark.asyncio
+async def test_second_read_is_served_from_l1(redis: FakeRedis):
+    redis.store["tree"] = {"data": [1, 2, 3]}
+
+    first = await TieredCache.get("tree", namespace="directory")
+    second = await TieredCache.get("tree", namespace="directory")
+    missing = await TieredCache.get("unknown", namespace="directory")
+
+    assert first == second == {"data": [1, 2, 3]}
+    assert missing is None
+    assert redis.reads == 2
+    assert Metrics.value(METRIC, namespace="directory", tier="l2") == 1
+    assert Metrics.value(METRIC, namespace="directory", tier="l1") == 1
+    assert Metrics.value(METRIC, namespace="directory", tier="miss") == 1
+
+
+@pytest.mark.asyncio
+async def test_l1_entries_expire(redis: FakeRedis, monkeypatch: pytest.MonkeyPatch):
+    now = [1000.0]
+    monkeypatch.setattr(tiered_cache.time, "monotonic", lambda: now[0])
+    redis.store["key"] = "value"
+
+    await TieredCache.get("key", namespace="test", local_ttl=5)
+    now[0] += 6
+    await TieredCache.get("key", namespace="test")
+
+    assert redis.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_l1_evicts_least_recently_used(redis: FakeRedis):
+    redis.store.update({"a": 1, "b": 2, "c": 3})
+
+    for key in ("a", "b", "a", "c"):
+        await TieredCache.get(key, namespace="test")
+
+    assert list(TieredCache._entries) == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_set_writes_both_tiers_and_publishes(redis: FakeRedis):
+    await TieredCache.set("key", {"v": 1}, ttl=60)
+
+    assert redis.store["key"] == {"v": 1}
+    assert await TieredCache.get("key", namespace="test") == {"v": 1}
+    assert redis.reads == 0
+    assert redis.published == [
+        (INVALIDATION_CHANNEL, f"{TieredCache._instance_id} key")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_zero_local_ttl_skips_l1(redis: FakeRedis):
+    await TieredCache.set("key", "value", ttl=60, local_ttl=0)
+
+    assert "key" not in TieredCache._entries
+
+
+@pytest.mark.asyncio
+async def test_invalidate_removes_key_everywhere(redis: FakeRedis):
+    await TieredCache.set("key", "value")
+
+    await TieredCache.invalidate("key")
+
+    assert "key" not in redis.store
+    assert await TieredCache.get("key", namespace="test") is None
+    assert len(redis.published) == 2
+
+
+@pytest.mark.asyncio
+async def test_listener_drops_keys_changed_by_other_replicas(redis: FakeRedis):
+    TieredCache.start_listener()
+    await asyncio.sleep(0)
+    redis.store.update({"own": 1, "foreign": 2})
+    await TieredCache.get("own", namespace="test")
+    await TieredCache.get("foreign", namespace="test")
+
+    await redis.messages.put(
+        {"type": "message", "data": f"{TieredCache._instance_id} own".encode()}
+    )
+    await redis.messages.put({"type": "message", "data": b"other-replica foreign"})
+    await asyncio.sleep(0.01)
+    await TieredCache.stop_listener()
+
+    assert list(TieredCache._entries) == ["own"]
+
+
+@pytest.mark.asyncio
+async def test_idle_channel_keeps_subscription_and_l1(
+    redis: FakeRedis, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(tiered_cache, "_POLL_SECONDS", redis.socket_timeout / 2)
+    TieredCache.start_listener()
+    await asyncio.sleep(0)
+    redis.store["key"] = "value"
+    await TieredCache.get("key", namespace="test")
+
+    await asyncio.sleep(redis.socket_timeout * 5)
+    await TieredCache.stop_listener()
+
+    assert redis.subscriptions == 1
+    assert list(TieredCache._entries) == ["key"]
+
+
+@pytest.mark.asyncio
+async def test_unavailable_redis_degrades_to_l1(
+    redis: FakeRedis, monkeypatch: pytest.MonkeyPatch
+):
+    async def unavailable(*args: Any, **kwargs: Any) -> None:
+        raise CacheUnavailableError("open")
+
+    monkeypatch.setattr(tiered_cache.RedisCache, "get_object", unavailable)
+    monkeypatch.setattr(tiered_cache.RedisCache, "set_object", unavailable)
+
+    assert await TieredCache.get("key", namespace="test") is None
+    await TieredCache.set("key", "value", ttl=60)
+
+    assert await TieredCache.get("key", namespace="test") == "value"
+    assert Metrics.value(METRIC, namespace="test", tier="miss") == 1
@@ -0,0 +1,249 @@
+from unittest.mock import MagicMock
+
+import pytest
+from langchain.agents.middleware import ModelRequest, ModelResponse
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langgraph.runtime import Runtime
+
+import agent.middleware as middleware
+from agent.middleware import DATA_SOURCES_SENTINEL, ContextMiddleware, RequestContext
+from agent.token_budget import (
+    TRUNCATION_MARKER,
+    TokenCounter,
+    fit_to_budget,
+    reserved_output_tokens,
+)
+from config.model_provider import ModelRegistry
+from config.settings import ModelInfo, TokenBudgetConfig
+from core.metrics import Metrics
+
+BUDGET = TokenBudgetConfig(SAFETY_MARGIN_TOKENS=0, CHARS_PER_TOKEN=1.0)
+
+
+def _counter() -> TokenCounter:
+    return TokenCounter(chars_per_token=1.0)
+
+
+def _history(turns: int, size: int = 100) -> list:
+    messages = []
+    for index in range(turns):
+        messages.append(HumanMessage(content="q" * size, id=f"h{index}"))
+        messages.append(AIMessage(content="a" * size, id=f"a{index}"))
+    messages.append(HumanMessage(content="latest question", id="latest"))
+    return messages
+
+
+def test_counter_caches_message_counts_by_id():
+    counter = _counter()
+    message = HumanMessage(content="x" * 10, id="m1")
+
+    assert counter.count_message(message) == 14
+    message.content = "changed"
+    assert counter.count_message(message) == 14
+
+
+def test_counter_falls_back_to_estimate_for_unknown_encoding():
+    counter = TokenCounter(chars_per_token=4.0, encoding_name="does-not-exist")
+
+    assert counter.count_text("x" * 10) == 3
+
+
+def test_reserved_output_tokens_is_capped_by_model_output_limit():
+    assert reserved_output_tokens(ModelInfo(max_output_tokens=1000), BUDGET) == 1000
+    assert reserved_output_tokens(ModelInfo(), BUDGET) == 4096
+
+
+def test_reserved_output_tokens_uses_the_requested_max_tokens():
+    assert reserved_output_tokens(ModelInfo(), BUDGET, max_tokens=16_000) == 16_000
+
+
+def test_fit_to_budget_keeps_requests_that_fit_unchanged():
+    messages = _history(2)
+    sources = [{"title": "a.pdf", "content": "x" * 100}]
+
+    result = fit_to_budget(
+        messages=messages,
+        data_sources=sources,
+        fixed_tokens=0,
+        max_input_tokens=10_000,
+        reserved_tokens=1000,
+        budget_config=BUDGET,
+        counter=_counter(),
+    )
+
+    assert result.messages is messages
+    assert result.data_sources is sources
+    assert result.trimmed_messages == 0
+    assert result.truncated_sources == []
+
+
+def test_fit_to_budget_truncates_large_sources_and_keeps_small_ones():
+    sources = [
+        {"title": "small.pdf", "content": "s" * 100},
+        {"title": "large.pdf", "content": "l" * 5000},
+    ]
+
+    result = fit_to_budget(
+        messages=[HumanMessage(content="question", id="q")],
+        data_sources=sources,
+        fixed_tokens=0,
+        max_input_tokens=2000,
+        reserved_tokens=500,
+        budget_config=BUDGET,
+        counter=_counter(),
+    )
+
+    assert result.fits
+    assert result.data_sources[0] is sources[0]
+    assert result.truncated_sources == ["large.pdf"]
+    truncated = result.data_sources[1]["content"]
+    assert truncated.startswith("l" * 100)
+    assert "truncated: showing the first" in truncated
+    assert truncated.endswith(
+        TRUNCATION_MARKER.format(shown=truncated.index("\n\n"), total=5000)
+    )
+
+
+def test_fit_to_budget_drops_oldest_turns_but_keeps_latest():
+    messages = _history(5)
+
+    result = fit_to_budget(
+        messages=messages,
+        data_sources=[],
+        fixed_tokens=200,
+        max_input_tokens=1000,
+        reserved_tokens=300,
+        budget_config=BUDGET,
+        counter=_counter(),
+    )
+
+    assert result.fits
+    assert result.trimmed_messages == 6
+    assert [message.id for message in result.messages] == [
+        "h3",
+        "a3",
+        "h4",
+        "a4",
+        "latest",
+    ]
+
+
+def test_fit_to_budget_never_drops_latest_turn():
+    messages = [HumanMessage(content="x" * 5000, id="latest")]
+
+    result = fit_to_budget(
+        messages=messages,
+        data_sources=[],
+        fixed_tokens=0,
+        max_input_tokens=1000,
+        reserved_tokens=100,
+        budget_config=BUDGET,
+        counter=_counter(),
+    )
+
+    assert not result.fits
+    assert result.messages == messages
+
+
+def test_fit_to_budget_keeps_system_messages_in_history():
+    messages = [
+        SystemMessage(content="assistant instructions", id="system"),
+        HumanMessage(content="q" * 3000, id="h0"),
+        AIMessage(content="a" * 3000, id="a0"),
+        HumanMessage(content="latest", id="latest"),
+    ]
+
+    result = fit_to_budget(
+        messages=messages,
+        data_sources=[],
+        fixed_tokens=0,
+        max_input_tokens=2000,
+        reserved_tokens=500,
+        budget_config=BUDGET,
+        counter=_counter(),
+    )
+
+    assert result.fits
+    assert result.trimmed_messages == 2
+    assert [message.id for message in result.messages] == ["system", "latest"]
+
+
+def test_context_middleware_applies_budget_before_injecting_sources(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(
+        ModelRegistry,
+        "get_model",
+        lambda _name=None: FakeListChatModel(responses=["selected"]),
+    )
+    monkeypatch.setattr(
+        middleware,
+        "_get_model_info",
+        lambda _name: ModelInfo(max_input_tokens=3000, max_output_tokens=500),
+    )
+    monkeypatch.setattr(middleware, "get_token_counter", _counter)
+    monkeypatch.setattr(middleware, "get_token_budget_settings", lambda: BUDGET)
+    Metrics.reset()
+    request = ModelRequest(
+        model=FakeListChatModel(responses=["bootstrap"]),
+        messages=_history(10),
+        system_message=SystemMessage(content="system"),
+        tools=[],
+        state={"data_sources": [{"title": "big.pdf", "content": "d" * 10_000}]},
+        runtime=Runtime(context=RequestContext(assistant_id="assistant-1")),
+    )
+    handler = MagicMock(return_value=ModelResponse(result=[]))
+
+    ContextMiddleware().wrap_model_call(request, handler)
+
+    configured = handler.call_args.args[0]
+    injected = configured.messages[0].content
+    assert DATA_SOURCES_SENTINEL in injected
+    assert "truncated: showing the first" in injected
+    assert configured.messages[-1].id == "latest"
+    assert len(configured.messages) < len(request.messages) + 1
+    assert (
+        Metrics.value(
+            "mucgpt_token_budget_adjustments_total", action="truncate_sources"
+        )
+        == 1
+    )
+
+
+def test_prompt_and_sent_max_tokens_fit_the_context_window(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    model_info = ModelInfo(max_input_tokens=20_000, max_output_tokens=16_000)
+    monkeypatch.setattr(
+        ModelRegistry,
+        "get_model",
+        lambda _name=None: FakeListChatModel(responses=["selected"]),
+    )
+    monkeypatch.setattr(middleware, "_get_model_info", lambda _name: model_info)
+    monkeypatch.setattr(
+        middleware,
+        "get_model_config",
+        lambda _name: MagicMock(clamp_max_tokens=model_info.clamp_max_tokens),
+    )
+    monkeypatch.setattr(middleware, "get_token_counter", _counter)
+    monkeypatch.setattr(middleware, "get_token_budget_settings", lambda: BUDGET)
+    request = ModelRequest(
+        model=FakeListChatModel(responses=["bootstrap"]),
+        messages=_history(10, size=500),
+        system_message=None,
+        tools=[],
+        state={},
+        runtime=Runtime(
+            context=RequestContext(model_name="selected-model", max_tokens=None)
+        ),
+    )
+    handler = MagicMock(return_value=ModelResponse(result=[]))
+
+    ContextMiddleware().wrap_model_call(request, handler)
+
+    configured = handler.call_args.args[0]
+    sent_max_tokens = configured.model_settings["max_tokens"]
+    prompt_tokens = sum(_counter().count_message(m) for m in configured.messages)
+    assert sent_max_tokens == 16_000
+    assert prompt_tokens + sent_max_tokens <= model_info.max_input_tokens
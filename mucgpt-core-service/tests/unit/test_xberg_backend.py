@@ -0,0 +1,151 @@
+import io
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from parsing.base import UploadTooLargeError
+from parsing.xberg import XbergBackend
+
+
+@pytest.fixture
+def backend(monkeypatch: pytest.MonkeyPatch) -> XbergBackend:
+    settings = MagicMock(
+        XBERG_URL="http://xberg",
+        XBERG_TIMEOUT=5.0,
+        XBERG_MAX_UPLOAD_BYTES=1024,
+        XBERG_MAX_CONNECTIONS=2,
+    )
+    monkeypatch.setattr("parsing.xberg.get_settings", lambda: settings)
+    return XbergBackend()
+
+
+def _mock_client(monkeypatch: pytest.MonkeyPatch, handler) -> None:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(XbergBackend, "_client", client)
+
+
+@pytest.mark.asyncio
+async def test_parse_streams_upload_with_shared_client(
+    monkeypatch: pytest.MonkeyPatch, backend: XbergBackend
+):
+    bodies: list[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.read())
+        return httpx.Response(200, json={"results": [{"content": "text"}]})
+
+    _mock_client(monkeypatch, handler)
+    client = XbergBackend.init_client()
+
+    for _ in range(2):
+        upload = UploadFile(io.BytesIO(b"file bytes"), filename="a.txt")
+        assert await backend.parse(upload) == "text"
+
+    assert XbergBackend.init_client() is client
+    assert all(b"file bytes" in body for body in bodies)
+
+
+@pytest.mark.asyncio
+async def test_parse_rejects_oversized_upload_while_streaming(
+    monkeypatch: pytest.MonkeyPatch, backend: XbergBackend
+):
+    _mock_client(monkeypatch, lambda request: httpx.Response(200, json={"results": []}))
+    # size unknown up front, so the limit has to be enforced while reading
+    upload = UploadFile(io.BytesIO(b"x" * 2048), filename="big.pdf")
+
+    with pytest.raises(UploadTooLargeError):
+        await backend.parse(upload)
+
+
+@pytest.mark.asyncio
+async def test_upload_with_known_size_is_not_sent_chunked(
+    monkeypatch: pytest.MonkeyPatch, backend: XbergBackend
+):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"results": []})
+
+    _mock_client(monkeypatch, handler)
+    upload = UploadFile(
+        io.BytesIO(b"file bytes"),
+        size=10,
+        filename='quote".txt',
+        headers=Headers({"content-type": "text/plain"}),
+    )
+
+    await backend.parse(upload)
+
+    (request,) = requests
+    assert "transfer-encoding" not in request.headers
+    assert int(request.headers["content-length"]) == len(request.content)
+    boundary = request.headers["content-type"].split("boundary=")[1]
+    expected = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="files"; filename="quote%22.txt"\r\n'
+        "Content-Type: text/plain\r\n\r\n"
+        "file bytes\r\n"
+        f"--{boundary}--\r\n"
+    )
+    assert request.content == expected.encode()
+
+
+@pytest.mark.asyncio
+async def test_close_client_resets_shared_client(monkeypatch: pytest.MonkeyPatch):
+    _mock_client(monkeypatch, lambda request: httpx.Response(200))
+
+    await XbergBackend.close_client()
+
+    assert XbergBackend._client is None
+
+
+@pytest.mark.asyncio
+async def test_parse_batch_sends_one_request_for_all_files(
+    monkeypatch: pytest.MonkeyPatch, backend: XbergBackend
+):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200, json={"results": [{"content": "first"}, {"content": "second"}]}
+        )
+
+    _mock_client(monkeypatch, handler)
+    uploads = [
+        UploadFile(io.BytesIO(b"1"), filename="a.txt"),
+        UploadFile(io.BytesIO(b"2"), filename="b.txt"),
+    ]
+
+    assert await backend.parse_batch(uploads) == ["first", "second"]
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_parse_document_keeps_page_offsets(
+    monkeypatch: pytest.MonkeyPatch, backend: XbergBackend
+):
+    pages = [
+        {"page_number": 1, "content": "first page"},
+        {"page_number": 2, "content": "second page"},
+    ]
+    _mock_client(
+        monkeypatch,
+        lambda request: httpx.Response(
+            200, json={"results": [{"content": "ignored", "pages": pages}]}
+        ),
+    )
+
+    document = await backend.parse_document(
+        UploadFile(io.BytesIO(b"%PDF"), filename="a.pdf")
+    )
+
+    assert document.content == "first page\n\nsecond page"
+    assert [document.content[page.start : page.end] for page in document.pages] == [
+        "first page",
+        "second page",
+    ]